@@ -0,0 +1,127 @@
+"""Micro-benchmarks of per-update building blocks with stored baseline.
+
+Benchmarks which require database are run only if PostgreSQL DSN is passed, use
+separate database for them: data of benchmark user is seeded there.
+
+Usage:
+    python -m benchmarks [-k filters] [--postgres-dsn DSN] [--update-baseline]
+"""
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+import os
+import pkgutil
+import sys
+from pathlib import Path
+
+from benchmarks.core import BenchmarkResult, registry, run_benchmark
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "-k", "--filter", default="", help="run benchmarks by substring"
+    )
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown relative to baseline, 0.25 means 25%%",
+    )
+    parser.add_argument("--postgres-dsn", default=os.getenv("BENCH_POSTGRES_DSN", ""))
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    return parser.parse_args()
+
+
+def load_benchmarks() -> None:
+    package_path = Path(__file__).parent
+    for module in pkgutil.iter_modules([str(package_path)]):
+        if module.name.startswith("bench_"):
+            importlib.import_module(f"benchmarks.{module.name}")
+
+
+async def run(args: argparse.Namespace) -> list[BenchmarkResult]:
+    benchmarks = [
+        bench for name, bench in sorted(registry.items()) if args.filter in name
+    ]
+    db_kwargs = {}
+    if any(bench.requires_db for bench in benchmarks):
+        if args.postgres_dsn:
+            db_kwargs = await _prepare_database(args.postgres_dsn)
+        else:
+            print("Postgres DSN isn't passed, benchmarks with database are skipped.")
+            benchmarks = [bench for bench in benchmarks if not bench.requires_db]
+
+    results = []
+    for bench in benchmarks:
+        kwargs = db_kwargs if bench.requires_db else {}
+        results.append(await run_benchmark(bench, args.repeat, kwargs))
+    return results
+
+
+async def _prepare_database(dsn: str) -> dict:
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    from benchmarks.seed import seed_database
+
+    engine = create_async_engine(dsn, future=True, echo=False)
+    db_pool = async_sessionmaker(engine, expire_on_commit=True)
+    return {"db_pool": db_pool, "seeded": await seed_database(engine, db_pool)}
+
+
+def compare(
+    results: list[BenchmarkResult], baseline: dict[str, float], threshold: float
+) -> list[str]:
+    """Print results table and return names of benchmarks slower than baseline."""
+    regressions = []
+    print(f"{'benchmark':<55} {'us/op':>10} {'baseline':>10} {'delta':>8}")
+    for result in results:
+        us_per_op = result.seconds_per_op * 1e6
+        base = baseline.get(result.name)
+        if base is None:
+            print(f"{result.name:<55} {us_per_op:>10.2f} {'-':>10} {'new':>8}")
+            continue
+
+        delta = us_per_op / base - 1
+        mark = ""
+        if delta > threshold:
+            regressions.append(result.name)
+            mark = " REGRESSION"
+        print(
+            f"{result.name:<55} {us_per_op:>10.2f} {base:>10.2f} {delta:>+8.1%}{mark}"
+        )
+    return regressions
+
+
+def main() -> None:
+    args = parse_args()
+    # Benchmarks measure code itself, not speed of disk with log files
+    logging.disable(logging.INFO)
+    load_benchmarks()
+    results = asyncio.run(run(args))
+
+    baseline = {}
+    if args.baseline.exists():
+        baseline = json.loads(args.baseline.read_text())
+    regressions = compare(results, baseline, args.threshold)
+
+    if args.update_baseline:
+        baseline.update(
+            {result.name: result.seconds_per_op * 1e6 for result in results}
+        )
+        args.baseline.write_text(json.dumps(baseline, indent=2, sort_keys=True) + "\n")
+        print(f"Baseline is updated: {args.baseline}")
+    elif regressions:
+        print(f"{len(regressions)} benchmark(s) are slower than baseline.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
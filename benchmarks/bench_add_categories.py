@@ -0,0 +1,33 @@
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import bot.database.db_requests as db
+from benchmarks.core import benchmark
+from benchmarks.seed import SeededData
+
+# Onboarding list of categories, names don't exist for benchmark user
+CATEGORY_NAMES = [f"Новая категория {i}" for i in range(20)]
+
+
+@benchmark("add_categories.bulk_20", number=20, requires_db=True)
+async def add_categories_bulk(
+    db_pool: async_sessionmaker[AsyncSession], seeded: SeededData
+):
+    async def run():
+        async with db_pool() as session:
+            await db.add_categories(session, seeded.user_id, CATEGORY_NAMES)
+            await session.rollback()
+
+    return run
+
+
+@benchmark("add_categories.one_by_one_20", number=20, requires_db=True)
+async def add_categories_one_by_one(
+    db_pool: async_sessionmaker[AsyncSession], seeded: SeededData
+):
+    async def run():
+        async with db_pool() as session:
+            for category_name in CATEGORY_NAMES:
+                await db.add_category(session, seeded.user_id, category_name)
+            await session.rollback()
+
+    return run
@@ -0,0 +1,50 @@
+import random
+
+from benchmarks.core import benchmark
+from bot.database.db_models import ExpenseUsage
+from bot.services.autocomplete import PrefixIndex
+
+EXPENSES_NUMBER = 5000
+LETTERS = "абвгдежзийклмнопрстуфхцчшщыэюя"
+
+
+def make_expenses(expenses_number: int) -> list[ExpenseUsage]:
+    rng = random.Random(42)
+    return [
+        ExpenseUsage(
+            " ".join(
+                "".join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9)))
+                for _ in range(rng.randint(1, 3))
+            ).capitalize(),
+            rng.randint(0, 300),
+            float(rng.randint(50, 5000)),
+        )
+        for _ in range(expenses_number)
+    ]
+
+
+EXPENSES = make_expenses(EXPENSES_NUMBER)
+
+
+@benchmark("autocomplete.build_5k", number=5)
+def build_5k():
+    return lambda: PrefixIndex(EXPENSES)
+
+
+@benchmark("autocomplete.search_one_letter_5k", number=1000)
+def search_one_letter_5k():
+    index = PrefixIndex(EXPENSES)
+    return lambda: index.search("к")
+
+
+@benchmark("autocomplete.search_two_letters_5k", number=10000)
+def search_two_letters_5k():
+    index = PrefixIndex(EXPENSES)
+    return lambda: index.search("ко")
+
+
+@benchmark("autocomplete.record_known_5k", number=10000)
+def record_known_5k():
+    index = PrefixIndex(EXPENSES)
+    name = EXPENSES[0].expense_name
+    return lambda: index.record(name, 100.0)
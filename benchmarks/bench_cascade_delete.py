@@ -0,0 +1,78 @@
+from sqlalchemy import func, literal, select
+from sqlalchemy.dialects.postgresql import array
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import bot.database.db_requests as db
+from benchmarks.core import benchmark
+from benchmarks.fixtures import BENCH_TELEGRAM_ID
+from benchmarks.seed import SeededData
+from bot.database.db_models import Category, Expense, Transaction, User
+
+# Separate user, so deletion doesn't change data of other benchmarks
+LARGE_CATEGORY_TELEGRAM_ID = BENCH_TELEGRAM_ID + 1
+LARGE_CATEGORY_EXPENSES = 10
+LARGE_CATEGORY_TRANSACTIONS = 100_000
+
+
+async def seed_large_category(db_pool: async_sessionmaker[AsyncSession]) -> int:
+    """Create user with one category of 100k transactions once, transactions are
+    generated by database.
+
+    Args:
+        db_pool (async_sessionmaker[AsyncSession]): pool of sessions
+
+    Returns:
+        int: category ID
+    """
+    async with db_pool() as session:
+        category_id = await session.scalar(
+            select(Category.category_id)
+            .join(Category.user)
+            .where(User.telegram_id == LARGE_CATEGORY_TELEGRAM_ID)
+        )
+        if category_id is not None:
+            return category_id
+
+        user = User(telegram_id=LARGE_CATEGORY_TELEGRAM_ID, user_name="Benchmark")
+        category = Category(category_name="Большая категория", user=user)
+        expenses = [
+            Expense(expense_name=f"Расход {i}", category=category)
+            for i in range(LARGE_CATEGORY_EXPENSES)
+        ]
+        session.add(user)
+        await session.flush()
+
+        series = func.generate_series(1, LARGE_CATEGORY_TRANSACTIONS).column_valued()
+        expense_ids = array([expense.expense_id for expense in expenses])
+        await session.execute(
+            Transaction.__table__.insert().from_select(
+                ["expense_id", "cost", "created_date", "amount", "comment"],
+                select(
+                    expense_ids[series % len(expenses) + 1],
+                    series % 1000 + 1.0,
+                    func.current_date() - series % 365,
+                    literal(1),
+                    literal("-"),
+                ),
+            )
+        )
+        await session.commit()
+        return category.category_id
+
+
+@benchmark("cascade_delete.category_100k", number=3, requires_db=True)
+async def delete_category_100k(
+    db_pool: async_sessionmaker[AsyncSession], seeded: SeededData
+):
+    category_id = await seed_large_category(db_pool)
+    async with db_pool() as session:
+        user_id = await session.scalar(
+            select(Category.user_id).where(Category.category_id == category_id)
+        )
+
+    async def run():
+        async with db_pool() as session:
+            await db.delete_categories(session, user_id, [category_id])
+            await session.rollback()
+
+    return run
@@ -0,0 +1,25 @@
+from benchmarks.core import benchmark
+from benchmarks.fixtures import make_callback
+from bot.keyboards.cbdata import CategoriesCallbackFactory, CategoryAction
+
+
+def _choose_category() -> CategoriesCallbackFactory:
+    return CategoriesCallbackFactory(action=CategoryAction.CHOOSE, category_id=123456)
+
+
+@benchmark("cbdata.categories.pack", number=10000)
+def categories_pack():
+    return _choose_category().pack
+
+
+@benchmark("cbdata.categories.unpack", number=10000)
+def categories_unpack():
+    packed = _choose_category().pack()
+    return lambda: CategoriesCallbackFactory.unpack(packed)
+
+
+@benchmark("cbdata.categories.filter", number=5000)
+def categories_filter():
+    callback_filter = CategoriesCallbackFactory.filter()
+    callback = make_callback(_choose_category().pack())
+    return lambda: callback_filter(callback)
@@ -0,0 +1,33 @@
+from benchmarks.core import benchmark
+from bot.services.charts import (
+    ChartKey,
+    ChartService,
+    render_bar_chart,
+    render_pie_chart,
+)
+
+CATEGORIES = [f"Категория {i}" for i in range(12)]
+TOTALS = [float(1000 * (12 - i)) for i in range(12)]
+MONTHS = [f"{month:02}.2024" for month in range(1, 13)]
+
+
+# Rendering is measured in the current process: it is the time which worker process
+# takes and which event loop would be blocked for without process pool
+
+
+@benchmark("charts.render_pie", number=5)
+def render_pie():
+    return lambda: render_pie_chart("Расходы", CATEGORIES, TOTALS, "Другие")
+
+
+@benchmark("charts.render_bar", number=5)
+def render_bar():
+    return lambda: render_bar_chart("Расходы", MONTHS, TOTALS)
+
+
+@benchmark("charts.cached_file_id", number=100000)
+def cached_file_id():
+    chart_service = ChartService()
+    key = ChartKey(1, "c", "m:2024-01-01")
+    chart_service.set_file_id(key, 1, "file_id")
+    return lambda: chart_service.get_file_id(key, 1)
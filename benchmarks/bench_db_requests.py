@@ -0,0 +1,91 @@
+from datetime import date
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import bot.database.db_requests as db
+from benchmarks.core import benchmark
+from benchmarks.seed import SeededData
+
+
+def _in_session(db_pool: async_sessionmaker[AsyncSession], request, *args):
+    """Run db request in a new session and roll back all changes made by it."""
+
+    async def run():
+        async with db_pool() as session:
+            await request(session, *args)
+            await session.rollback()
+
+    return run
+
+
+@benchmark("db_requests.add_user.existing", number=100, requires_db=True)
+def add_user(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(db_pool, db.add_user, seeded.telegram_id, "Benchmark")
+
+
+@benchmark("db_requests.get_user_info", number=200, requires_db=True)
+def get_user_info(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(db_pool, db.get_user_info, seeded.telegram_id)
+
+
+@benchmark("db_requests.add_category", number=100, requires_db=True)
+def add_category(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(db_pool, db.add_category, seeded.user_id, "Новая категория")
+
+
+@benchmark("db_requests.get_category_info", number=200, requires_db=True)
+def get_category_info(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(
+        db_pool, db.get_category_info, seeded.user_id, seeded.category_name
+    )
+
+
+@benchmark("db_requests.add_expense", number=100, requires_db=True)
+def add_expense(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(db_pool, db.add_expense, "Новый расход", seeded.category_id)
+
+
+@benchmark("db_requests.get_expense_info", number=200, requires_db=True)
+def get_expense_info(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(
+        db_pool, db.get_expense_info, seeded.expense_name, seeded.category_id
+    )
+
+
+@benchmark("db_requests.get_expense_category_info", number=200, requires_db=True)
+def get_expense_category_info(
+    db_pool: async_sessionmaker[AsyncSession], seeded: SeededData
+):
+    return _in_session(
+        db_pool, db.get_expense_category_info, seeded.expense_name, seeded.user_id
+    )
+
+
+@benchmark("db_requests.add_transaction", number=100, requires_db=True)
+def add_transaction(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    async def run():
+        async with db_pool() as session:
+            await db.add_transaction(
+                session, seeded.user_id, seeded.expense_id, 100, date.today(), 1, "-"
+            )
+            await session.flush()
+            await session.rollback()
+
+    return run
+
+
+@benchmark("db_requests.get_user_categories", number=200, requires_db=True)
+def get_user_categories(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(db_pool, db.get_user_categories, seeded.user_id)
+
+
+@benchmark("db_requests.get_user_category", number=200, requires_db=True)
+def get_user_category(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(
+        db_pool, db.get_user_category, seeded.user_id, seeded.category_id
+    )
+
+
+@benchmark("db_requests.get_expense_budget", number=200, requires_db=True)
+def get_expense_budget(db_pool: async_sessionmaker[AsyncSession], seeded: SeededData):
+    return _in_session(db_pool, db.get_expense_budget, seeded.expense_id, date.today())
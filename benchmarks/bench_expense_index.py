@@ -0,0 +1,45 @@
+import random
+
+from benchmarks.core import benchmark
+from bot.database.db_models import ExpenseCategory
+from bot.services.expense_index import ExpenseIndex
+
+EXPENSES_NUMBER = 5000
+LETTERS = "абвгдежзийклмнопрстуфхцчшщыэюя"
+
+
+def make_expenses(expenses_number: int) -> list[ExpenseCategory]:
+    rng = random.Random(42)
+    return [
+        ExpenseCategory(
+            "".join(
+                rng.choice(LETTERS) for _ in range(rng.randint(4, 14))
+            ).capitalize(),
+            i,
+            f"Категория {i % 20}",
+            i % 20,
+        )
+        for i in range(expenses_number)
+    ]
+
+
+EXPENSES = make_expenses(EXPENSES_NUMBER)
+
+
+@benchmark("expense_index.build_5k", number=5)
+def build_5k():
+    return lambda: ExpenseIndex(EXPENSES)
+
+
+@benchmark("expense_index.closest_typo_5k", number=10000)
+def closest_typo_5k():
+    index = ExpenseIndex(EXPENSES)
+    name = EXPENSES[123].expense_name
+    typo = name[:2] + name[1] + name[2:]
+    return lambda: index.closest(typo)
+
+
+@benchmark("expense_index.closest_unknown_5k", number=10000)
+def closest_unknown_5k():
+    index = ExpenseIndex(EXPENSES)
+    return lambda: index.closest("Qwerty")
@@ -0,0 +1,41 @@
+from benchmarks.core import benchmark
+from benchmarks.fixtures import make_message
+from bot.filters.filters import (
+    IsCorrectAmountFilter,
+    IsCorrectCategoryName,
+    IsCorrectComment,
+    IsCorrectCostFilter,
+    IsCorrectCreatedDateFilter,
+    IsCorrectExpenseNameFilter,
+    IsCorrectTransaction,
+)
+
+FILTER_CASES = {
+    "is_correct_transaction": (IsCorrectTransaction, "Молоко 78", "Молоко"),
+    "is_correct_category_name": (IsCorrectCategoryName, "Продукты", "Продукты!"),
+    "is_correct_expense_name": (IsCorrectExpenseNameFilter, "Молоко", "Молоко!"),
+    "is_correct_cost": (IsCorrectCostFilter, "78,5", "78 руб"),
+    "is_correct_amount": (IsCorrectAmountFilter, "2", "два"),
+    "is_correct_created_date": (IsCorrectCreatedDateFilter, "12.05.2024", "12 мая"),
+    "is_correct_comment": (IsCorrectComment, "с друзьями", "к" * 60),
+}
+
+
+def _register(name: str, filter_class: type, text: str) -> None:
+    @benchmark(name, number=5000)
+    def factory():
+        message_filter = filter_class()
+        message = make_message(text)
+        return lambda: message_filter(message)
+
+
+for case_name, (filter_class, valid_text, invalid_text) in FILTER_CASES.items():
+    _register(f"filters.{case_name}.valid", filter_class, valid_text)
+    _register(f"filters.{case_name}.invalid", filter_class, invalid_text)
+
+
+@benchmark("filters.is_correct_transaction.long_input", number=20)
+def is_correct_transaction_long_input():
+    message_filter = IsCorrectTransaction()
+    message = make_message("1" * 200 + "x")
+    return lambda: message_filter(message)
@@ -0,0 +1,42 @@
+import random
+from datetime import date, timedelta
+
+from benchmarks.core import benchmark
+from bot.database.db_models import TransactionHistory
+from bot.services.insights import InsightsService, compute_insights
+
+TODAY = date(2024, 6, 15)
+TRANSACTIONS_NUMBER = 50000
+CATEGORIES_NUMBER = 20
+UNIX_EPOCH = date(1970, 1, 1)
+
+
+def make_history(transactions_number: int) -> TransactionHistory:
+    """History of heavy user: transactions of the last 12 months ordered by date."""
+    rng = random.Random(42)
+    first_day = (TODAY - timedelta(days=365) - UNIX_EPOCH).days
+    last_day = (TODAY - UNIX_EPOCH).days
+    days = sorted(rng.randint(first_day, last_day) for _ in range(transactions_number))
+    return TransactionHistory(
+        days,
+        [rng.randrange(CATEGORIES_NUMBER) for _ in range(transactions_number)],
+        [f"Расход {rng.randrange(500)}" for _ in range(transactions_number)],
+        [round(rng.lognormvariate(5, 1), 2) for _ in range(transactions_number)],
+    )
+
+
+HISTORY = make_history(TRANSACTIONS_NUMBER)
+CATEGORY_NAMES = {i: f"Категория {i}" for i in range(CATEGORIES_NUMBER)}
+
+
+@benchmark("insights.compute_50k", number=20)
+def compute_50k():
+    return lambda: compute_insights(HISTORY, CATEGORY_NAMES, TODAY)
+
+
+@benchmark("insights.cached", number=100000)
+async def cached():
+    insights_service = InsightsService()
+    await insights_service.compute(1, 1, TODAY, HISTORY, CATEGORY_NAMES)
+    insights_service.shutdown()
+    return lambda: insights_service.get(1, 1, TODAY)
@@ -0,0 +1,74 @@
+from benchmarks.core import benchmark
+from bot.keyboards.kb_cache import CategoriesKeyboardCache
+from bot.keyboards.kb_users import (
+    _build_correct_transaction_keyboard,
+    create_categories_keyboard,
+    create_confirm_transaction_keyboard,
+    create_correct_transaction_keyboard,
+)
+from bot.lexicon.lexicon import catalog
+
+I18N = catalog.get("ru")
+CONFIRM_TEXTS = (
+    I18N["transaction_confirm_button"],
+    I18N["transaction_correct_button"],
+    I18N["transaction_cancel_button"],
+)
+CORRECT_TEXTS = (
+    I18N["transaction_correct_expense_name_button"],
+    I18N["transaction_correct_category_button"],
+    I18N["transaction_correct_cost_button"],
+    I18N["transaction_correct_amount_button"],
+    I18N["transaction_correct_created_date_button"],
+    I18N["transaction_correct_comment_button"],
+)
+ADD_NEW_CATEGORY_TEXT = I18N["transaction_add_new_category_callback"]
+PAGE_TEXTS = (
+    I18N["categories_previous_page"],
+    I18N["categories_next_page"],
+)
+
+
+def _register_categories_keyboard(categories_number: int) -> None:
+    categories = [(i, f"Категория {i}") for i in range(categories_number)]
+
+    @benchmark(f"keyboards.categories.{categories_number}", number=200)
+    def build():
+        return lambda: create_categories_keyboard(
+            categories, ADD_NEW_CATEGORY_TEXT, 0, *PAGE_TEXTS
+        )
+
+    @benchmark(f"keyboards.categories.{categories_number}.cached", number=10000)
+    def cached():
+        cache = CategoriesKeyboardCache()
+        cache.set(1, categories)
+        return lambda: cache.get(1).keyboard(0, ADD_NEW_CATEGORY_TEXT, *PAGE_TEXTS)
+
+
+for categories_number in (5, 30, 500):
+    _register_categories_keyboard(categories_number)
+
+
+@benchmark("keyboards.confirm_transaction", number=2000)
+def confirm_transaction_keyboard():
+    return lambda: create_confirm_transaction_keyboard(*CONFIRM_TEXTS)
+
+
+@benchmark("keyboards.correct_transaction", number=2000)
+def correct_transaction_keyboard():
+    return lambda: create_correct_transaction_keyboard(*CORRECT_TEXTS)
+
+
+# Markup is serialized before each request anyway, these benchmarks show which part of
+# per-update keyboard cost is saved by cache
+@benchmark("keyboards.correct_transaction.build_and_dump", number=2000)
+def correct_transaction_build_and_dump():
+    build = _build_correct_transaction_keyboard.__wrapped__
+    return lambda: build(*CORRECT_TEXTS).model_dump(exclude_none=True)
+
+
+@benchmark("keyboards.correct_transaction.cached_and_dump", number=2000)
+def correct_transaction_cached_and_dump():
+    return lambda: create_correct_transaction_keyboard(*CORRECT_TEXTS).model_dump(
+        exclude_none=True
+    )
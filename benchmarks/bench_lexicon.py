@@ -0,0 +1,29 @@
+from benchmarks.core import benchmark
+from bot.lexicon.lexicon import catalog
+
+TRANSACTION_INFO = {
+    "expense_name": "Молоко",
+    "category_name": "Продукты",
+    "cost": 78.0,
+    "amount": 2,
+    "created_date": "12.05.2024",
+    "comment": "-",
+}
+
+
+@benchmark("lexicon.resolve_locale", number=100000)
+def resolve_locale():
+    catalog.get("ru-RU")
+    return lambda: catalog.get("ru-RU")
+
+
+@benchmark("lexicon.format", number=100000)
+def translator_format():
+    i18n = catalog.get("ru")
+    return lambda: i18n.format("transaction_info", **TRANSACTION_INFO)
+
+
+@benchmark("lexicon.format_str", number=100000)
+def format_str():
+    template = catalog.get("ru")["transaction_info"]
+    return lambda: template.format(**TRANSACTION_INFO)
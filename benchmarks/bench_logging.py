@@ -0,0 +1,42 @@
+import logging
+import queue
+import time
+
+from benchmarks.core import benchmark
+from bot.config_data.logging_services import LoggerQueueHandler, LoggerQueueListener
+
+# Latency of one write to slow disk, the same for both handlers
+DISK_LATENCY = 0.0005
+
+
+class SlowDiskHandler(logging.Handler):
+    def emit(self, record: logging.LogRecord) -> None:
+        self.format(record)
+        time.sleep(DISK_LATENCY)
+
+
+def _make_logger(name: str) -> logging.Logger:
+    logger = logging.getLogger(f"benchmarks.logging.{name}")
+    logger.propagate = False
+    logger.handlers.clear()
+    return logger
+
+
+# Benchmarks are run with INFO logs disabled, so records are logged with WARNING level
+
+
+@benchmark("logging.sync_handler.slow_disk", number=200)
+def sync_handler_slow_disk():
+    logger = _make_logger("sync")
+    logger.addHandler(SlowDiskHandler())
+    return lambda: logger.warning("User %s added transaction %s.", 1, "Молоко")
+
+
+@benchmark("logging.queue_handler.slow_disk", number=200)
+def queue_handler_slow_disk():
+    logger = _make_logger("queue")
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(LoggerQueueHandler(log_queue, logger.name))
+    listener = LoggerQueueListener(log_queue, {logger.name: [SlowDiskHandler()]})
+    listener.start()
+    return lambda: logger.warning("User %s added transaction %s.", 1, "Молоко")
@@ -0,0 +1,35 @@
+from benchmarks.core import benchmark
+from bot.monitoring.metrics import Counter, Histogram, Registry
+from bot.monitoring.sql_profiler import normalize_sql
+
+
+@benchmark("metrics.counter_inc", number=100000)
+def counter_inc():
+    counter = Counter("bench_total", "Benchmark.", ("router", "handler", "state"))
+    return lambda: counter.inc("transactions", "process_add_expense", "state")
+
+
+@benchmark("metrics.histogram_observe", number=100000)
+def histogram_observe():
+    histogram = Histogram("bench_seconds", "Benchmark.", ("handler",))
+    return lambda: histogram.observe(0.0123, "process_add_expense")
+
+
+@benchmark("metrics.render", number=200)
+def render():
+    registry = Registry()
+    histogram = registry.histogram("bench_seconds", "Benchmark.", ("handler",))
+    for handler in range(30):
+        histogram.observe(0.0123, f"handler_{handler}")
+    return registry.render
+
+
+@benchmark("metrics.normalize_sql", number=20000)
+def normalize_sql_uncached():
+    statement = (
+        "SELECT expense_table.expense_id, expense_table.category_id \n"
+        "FROM expense_table JOIN category_table ON category_table.category_id = "
+        "expense_table.category_id \nWHERE expense_table.expense_name = $1::VARCHAR "
+        "AND category_table.user_id = $2::INTEGER AND cost > 10 AND name IN ('a', 'b')"
+    )
+    return lambda: normalize_sql.__wrapped__(statement)
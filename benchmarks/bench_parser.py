@@ -0,0 +1,36 @@
+from benchmarks.core import benchmark
+from bot.filters.parser import parse_cost, parse_date, parse_transaction
+
+LONG_INPUT_LENGTHS = (200, 10000)
+
+
+@benchmark("parser.transaction.valid", number=10000)
+def transaction_valid():
+    return lambda: parse_transaction("Кофе с собой 199,5 руб")
+
+
+@benchmark("parser.transaction.invalid", number=10000)
+def transaction_invalid():
+    return lambda: parse_transaction("Кофе с собой")
+
+
+def _register_long_input(length: int) -> None:
+    @benchmark(f"parser.transaction.long_input.{length}", number=200)
+    def factory():
+        # The worst input for old regex filter: long run of digits without cost
+        text = "1" * length + "x"
+        return lambda: parse_transaction(text)
+
+
+for length in LONG_INPUT_LENGTHS:
+    _register_long_input(length)
+
+
+@benchmark("parser.cost", number=10000)
+def cost():
+    return lambda: parse_cost("1 234,50 ₽")
+
+
+@benchmark("parser.date", number=10000)
+def created_date():
+    return lambda: parse_date("12.05.2024")
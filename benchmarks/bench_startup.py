@@ -0,0 +1,33 @@
+import os
+import subprocess
+import sys
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from benchmarks.core import benchmark
+from benchmarks.seed import SeededData
+from bot.database.db_migrations import ensure_schema
+
+STARTUP_ENV = {
+    "BOT_TOKEN": "1:benchmark",
+    "BOT_FSM_STORAGE": "memory",
+    "POSTGRES_DSN": "postgresql+asyncpg://benchmark@localhost/benchmark",
+    "REDIS_DSN": "",
+}
+
+
+@benchmark("startup.import_main", number=3)
+def import_main():
+    """Cold import of entry point module in a new interpreter (without main() call)."""
+    env = {**os.environ, **STARTUP_ENV}
+    command = [sys.executable, "-c", "import bot.__main__"]
+    return lambda: subprocess.run(command, env=env, check=True)
+
+
+@benchmark("startup.ensure_schema.up_to_date", number=20, requires_db=True)
+async def ensure_schema_up_to_date(
+    db_pool: async_sessionmaker[AsyncSession], seeded: SeededData
+):
+    engine = db_pool.kw["bind"]
+    await ensure_schema(engine)
+    return lambda: ensure_schema(engine)
@@ -0,0 +1,33 @@
+from benchmarks.core import benchmark
+from bot.monitoring.tracing import Span, Trace, current_span, start_span, traced
+
+
+@traced
+async def _traced_request():
+    return None
+
+
+@benchmark("tracing.traced.no_trace", number=20000)
+def traced_no_trace():
+    return _traced_request
+
+
+@benchmark("tracing.start_span", number=20000)
+def start_span_in_trace():
+    root = Span(Trace(), "update")
+
+    def run():
+        token = current_span.set(root)
+        with start_span("fsm.get_state"):
+            pass
+        current_span.reset(token)
+        root.trace.spans.clear()
+
+    return run
+
+
+@benchmark("tracing.otlp_serialize", number=2000)
+def otlp_serialize():
+    root = Span(Trace(), "update", attributes={"telegram.update_id": 1})
+    spans = [root.child(f"db.request_{number}") for number in range(10)]
+    return lambda: [span.to_otlp() for span in spans]
@@ -0,0 +1,86 @@
+import inspect
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Optional
+
+BenchmarkFactory = Callable[..., Any]
+
+
+@dataclass(slots=True, frozen=True)
+class Benchmark:
+    name: str
+    factory: BenchmarkFactory
+    number: int
+    requires_db: bool
+
+
+@dataclass(slots=True, frozen=True)
+class BenchmarkResult:
+    name: str
+    seconds_per_op: float
+
+    @property
+    def ops_per_second(self) -> float:
+        return 1 / self.seconds_per_op if self.seconds_per_op else float("inf")
+
+
+registry: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, number: int = 1000, requires_db: bool = False):
+    """Register benchmark factory. Factory (sync or async) prepares all required data
+    and returns callable to measure, callable can return awaitable.
+
+    Args:
+        name (str): unique name of benchmark, used as key in baseline file
+        number (int): number of calls of measured callable in one round
+        requires_db (bool): factory gets async_sessionmaker with seeded database
+    """
+
+    def decorator(factory: BenchmarkFactory) -> BenchmarkFactory:
+        if name in registry:
+            raise ValueError(f"Benchmark {name} is already registered.")
+        registry[name] = Benchmark(name, factory, number, requires_db)
+        return factory
+
+    return decorator
+
+
+async def measure(
+    func: Callable[[], Optional[Awaitable[Any]]], number: int, repeat: int
+) -> float:
+    """Measure callable and return the best time of one call among all rounds.
+
+    Args:
+        func (Callable): measured callable, can return awaitable
+        number (int): number of calls in one round
+        repeat (int): number of rounds
+
+    Returns:
+        float: seconds per one call
+    """
+    is_async = inspect.isawaitable(first_result := func())
+    if is_async:
+        await first_result
+
+    best = float("inf")
+    for _ in range(repeat):
+        if is_async:
+            started = time.perf_counter()
+            for _ in range(number):
+                await func()
+        else:
+            started = time.perf_counter()
+            for _ in range(number):
+                func()
+        best = min(best, (time.perf_counter() - started) / number)
+    return best
+
+
+async def run_benchmark(
+    bench: Benchmark, repeat: int, factory_kwargs: dict[str, Any]
+) -> BenchmarkResult:
+    func = bench.factory(**factory_kwargs)
+    if inspect.isawaitable(func):
+        func = await func
+    return BenchmarkResult(bench.name, await measure(func, bench.number, repeat))
@@ -0,0 +1,34 @@
+from datetime import datetime
+
+from aiogram.types import CallbackQuery, Chat, Message, User
+
+BENCH_TELEGRAM_ID = 999_000_000_001
+
+
+def make_user(telegram_id: int = BENCH_TELEGRAM_ID, language_code: str = "ru") -> User:
+    return User(
+        id=telegram_id,
+        is_bot=False,
+        first_name="Benchmark",
+        language_code=language_code,
+    )
+
+
+def make_message(text: str, telegram_id: int = BENCH_TELEGRAM_ID) -> Message:
+    return Message(
+        message_id=1,
+        date=datetime.now(),
+        chat=Chat(id=telegram_id, type="private"),
+        from_user=make_user(telegram_id),
+        text=text,
+    )
+
+
+def make_callback(data: str, telegram_id: int = BENCH_TELEGRAM_ID) -> CallbackQuery:
+    return CallbackQuery(
+        id="1",
+        from_user=make_user(telegram_id),
+        chat_instance="1",
+        message=make_message("callback", telegram_id),
+        data=data,
+    )
@@ -0,0 +1,154 @@
+"""Fuzzing of user input parsers: random and generated inputs must never raise, results
+must satisfy parser invariants, known ambiguous inputs must be parsed as expected and
+parsing time must grow linearly with input length.
+
+Usage:
+    python -m benchmarks.fuzz_parser [--iterations 100000] [--seed 0]
+"""
+
+import argparse
+import math
+import random
+import time
+from datetime import date
+
+from bot.filters.parser import (
+    MAX_NAME_LENGTH,
+    parse_amount,
+    parse_comment,
+    parse_cost,
+    parse_date,
+    parse_name,
+    parse_transaction,
+)
+
+ALPHABET = "0123456789.,-/ '_ ₽$руб кофеAbcxх@#+!\n\t"
+TODAY = date(2024, 5, 12)
+PARSERS = (parse_name, parse_cost, parse_amount, parse_date, parse_comment)
+# Inputs which were parsed wrong before and their expected name, cost and whether
+# cost is ambiguous, None means that input is rejected
+TRANSACTION_EXAMPLES = (
+    ("Бензин 95 600", ("Бензин 95", 600.0, True)),
+    ("Кофе 1 500", ("Кофе 1", 500.0, True)),
+    ("Кофе 1 500,50 руб", ("Кофе 1", 500.5, True)),
+    ("Кофе 1\u00a0500₽", ("Кофе 1", 500.0, True)),
+    ("Пицца 4 сыра 500", ("Пицца 4 сыра", 500.0, False)),
+    ("Кофе 2 50", ("Кофе 2", 50.0, False)),
+    ("Кофе 1500", ("Кофе", 1500.0, False)),
+    ("1 500", None),
+    ("Машина 1 200 000", None),
+    ("Кофе 1,234", None),
+    ("Кофе 1.234", None),
+    ("Кофе 0", None),
+    ("Кофе 0,00", None),
+)
+COST_EXAMPLES = (
+    ("1 500", 1500.0),
+    ("1,234,567", 1234567.0),
+    ("1.234,5", 1234.5),
+    ("1,234", None),
+    ("1,2345", None),
+    ("78,50", 78.5),
+)
+
+
+def random_text(rnd: random.Random, max_length: int = 40) -> str:
+    return "".join(rnd.choice(ALPHABET) for _ in range(rnd.randint(0, max_length)))
+
+
+def check_random_input(rnd: random.Random) -> None:
+    text = random_text(rnd)
+    for parser in PARSERS:
+        parser(text)
+
+    transaction = parse_transaction(text, TODAY)
+    if transaction:
+        assert math.isfinite(transaction.cost) and transaction.cost > 0, text
+        assert transaction.amount >= 1, text
+        assert 0 < len(transaction.expense_name) < MAX_NAME_LENGTH, text
+        assert parse_name(transaction.expense_name) == transaction.expense_name, text
+
+
+def check_generated_transaction(rnd: random.Random) -> None:
+    name_words = rnd.randint(1, 3)
+    name = " ".join(
+        "".join(rnd.choice("абвгдеёжзклмн") for _ in range(rnd.randint(1, 8)))
+        for _ in range(name_words)
+    )
+    integer_part = rnd.randint(1, 10**7)
+    fraction = rnd.choice(["", "5", "25"])
+    cost_text = f"{integer_part:,}".replace(",", rnd.choice(["'", "_", ""]))
+    if fraction:
+        cost_text += rnd.choice(".,") + fraction
+    cost_text += rnd.choice(["", "₽", " руб"])
+
+    modifiers = []
+    amount = rnd.choice([None, rnd.randint(1, 99)])
+    if amount:
+        modifiers.append(f"{rnd.choice('xх*')}{amount}")
+    created_date = rnd.choice(
+        [None, date(2024, rnd.randint(1, 12), rnd.randint(1, 28))]
+    )
+    if created_date:
+        modifiers.append("@" + created_date.strftime(rnd.choice(["%d.%m", "%d-%m-%Y"])))
+    rnd.shuffle(modifiers)
+    comment = rnd.choice([None, "с друзьями", "#1"])
+    if comment:
+        modifiers.append(f"#{comment}")
+
+    text = " ".join([name, cost_text, *modifiers])
+    transaction = parse_transaction(text, TODAY)
+    assert transaction is not None, text
+    assert transaction.expense_name == name.capitalize(), text
+    assert transaction.cost == float(f"{integer_part}.{fraction or 0}"), text
+    assert transaction.amount == (amount or 1), text
+    assert transaction.created_date == created_date, text
+    assert transaction.comment == comment, text
+    assert not transaction.ambiguous_cost, text
+
+
+def check_examples() -> None:
+    for text, expected in TRANSACTION_EXAMPLES:
+        transaction = parse_transaction(text, TODAY)
+        result = transaction and (
+            transaction.expense_name,
+            transaction.cost,
+            transaction.ambiguous_cost,
+        )
+        assert result == expected, (text, result)
+    for text, expected in COST_EXAMPLES:
+        assert parse_cost(text) == expected, (text, parse_cost(text))
+
+
+def check_linear_time() -> None:
+    timings = []
+    for length in (10**4, 10**5):
+        text = "1 " * length + "x"
+        started = time.perf_counter()
+        for parser in (*PARSERS, parse_transaction):
+            parser(text)
+        timings.append(time.perf_counter() - started)
+    # Input is 10 times longer, quadratic parser would be 100 times slower
+    assert timings[1] < timings[0] * 30, timings
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--iterations", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    check_examples()
+    rnd = random.Random(args.seed)
+    for _ in range(args.iterations):
+        check_random_input(rnd)
+        check_generated_transaction(rnd)
+    check_linear_time()
+    print(
+        f"{len(TRANSACTION_EXAMPLES) + len(COST_EXAMPLES)} examples, "
+        f"{args.iterations} random and generated inputs were parsed correctly."
+    )
+
+
+if __name__ == "__main__":
+    main()
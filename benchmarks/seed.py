@@ -0,0 +1,89 @@
+import random
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker
+
+from benchmarks.fixtures import BENCH_TELEGRAM_ID
+from bot.database.db_migrations import ensure_schema
+from bot.database.db_models import Category, Expense, Transaction, User
+
+CATEGORIES_NUMBER = 30
+EXPENSES_PER_CATEGORY = 10
+TRANSACTIONS_NUMBER = 10000
+
+
+@dataclass(slots=True, frozen=True)
+class SeededData:
+    telegram_id: int
+    user_id: int
+    category_name: str
+    category_id: int
+    expense_name: str
+    expense_id: int
+
+
+async def seed_database(
+    engine: AsyncEngine, db_pool: async_sessionmaker[AsyncSession]
+) -> SeededData:
+    """Create or upgrade tables and fill database with data of benchmark user. Data is
+    created only once and reused by the next runs.
+
+    Args:
+        engine (AsyncEngine): engine connected to database for benchmarks
+        db_pool (async_sessionmaker[AsyncSession]): pool of sessions for this engine
+
+    Returns:
+        SeededData: identifiers of seeded objects used by benchmarks
+    """
+    await ensure_schema(engine)
+
+    async with db_pool() as session:
+        user = await session.scalar(
+            select(User).where(User.telegram_id == BENCH_TELEGRAM_ID)
+        )
+        if not user:
+            user = await _seed_user(session)
+
+        category = await session.scalar(
+            select(Category)
+            .where(Category.user_id == user.user_id)
+            .order_by(Category.category_id)
+            .limit(1)
+        )
+        expense = await session.scalar(
+            select(Expense).where(Expense.category_id == category.category_id).limit(1)
+        )
+        return SeededData(
+            BENCH_TELEGRAM_ID,
+            user.user_id,
+            category.category_name,
+            category.category_id,
+            expense.expense_name,
+            expense.expense_id,
+        )
+
+
+async def _seed_user(session: AsyncSession) -> User:
+    rnd = random.Random(0)
+    user = User(telegram_id=BENCH_TELEGRAM_ID, user_name="Benchmark")
+    expenses = []
+    for i in range(CATEGORIES_NUMBER):
+        category = Category(category_name=f"Категория {i}", user=user)
+        for j in range(EXPENSES_PER_CATEGORY):
+            expenses.append(Expense(expense_name=f"Расход {i}-{j}", category=category))
+
+    first_date = date.today() - timedelta(days=365)
+    for _ in range(TRANSACTIONS_NUMBER):
+        Transaction(
+            expense=rnd.choice(expenses),
+            cost=rnd.randint(10, 5000),
+            created_date=first_date + timedelta(days=rnd.randint(0, 365)),
+            amount=1,
+            comment="-",
+        )
+
+    session.add(user)
+    await session.commit()
+    return user
@@ -1,62 +1,182 @@
 import asyncio
 import logging
-import logging.config
+import signal
+from pathlib import Path
 
 from aiogram import Bot, Dispatcher, F
 from aiogram.client.bot import DefaultBotProperties
+from aiogram.client.telegram import TelegramAPIServer
 from aiogram.fsm.storage.memory import MemoryStorage
-from aiogram.fsm.storage.redis import RedisStorage
 from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 
 from bot.config_data.configreader import config
-from bot.database.db_models import Base
+from bot.config_data.logging_services import setup_logging
+from bot.database.db_migrations import ensure_schema
+from bot.handlers.budget_handlers import router as budget_router
+from bot.handlers.category_handlers import router as category_router
 from bot.handlers.change_transaction_handlers import router as change_transaction_router
 from bot.handlers.command_handlers import router as default_commands_router
 from bot.handlers.ignore_handlers import router as ignore_router
 from bot.handlers.transactions_handlers import router as transactions_router
+from bot.keyboards.kb_cache import warm_up_keyboards
 from bot.keyboards.set_menu import set_main_menu
-from bot.lexicon.lexicon import translations
-from bot.middlewares.outer_middlewares import DbSessionMiddleware, TranslatorMiddleware
+from bot.lexicon.lexicon import catalog
+from bot.middlewares.inner_middlewares import ContextMiddleware
+from bot.monitoring.instrumentation import (
+    InstrumentedSession,
+    InstrumentedStorage,
+    MetricsMiddleware,
+    instrument_engine,
+    monitor_event_loop_lag,
+)
+from bot.monitoring.profiler import (
+    DEFAULT_PROFILE_SECONDS,
+    ProfilerMiddleware,
+    SamplingProfiler,
+)
+from bot.monitoring.sql_profiler import QueryProfilerMiddleware, SQLProfiler
+from bot.monitoring.tracing import (
+    HandlerTracingMiddleware,
+    TracingMiddleware,
+    install_log_record_factory,
+    trace_engine,
+)
 
 logger = logging.getLogger("bot")
 
 
 async def main():
     engine = create_async_engine(config.postgres_dsn, future=True, echo=False)
+    instrument_engine(engine)
+    sql_profiler = SQLProfiler(config.slow_query_threshold, config.n_plus_one_threshold)
+    sql_profiler.instrument(engine)
+    trace_engine(engine)
+    install_log_record_factory()
     db_pool = async_sessionmaker(engine, expire_on_commit=True)
-    async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
+    await ensure_schema(engine, force=not config.fast_start)
+
+    session = InstrumentedSession()
+    if config.bot_api_server:
+        session = InstrumentedSession(
+            api=TelegramAPIServer.from_base(config.bot_api_server)
+        )
 
     bot = Bot(
         token=config.bot_token,
+        session=session,
         default=DefaultBotProperties(parse_mode="HTML"),
     )
 
     if config.bot_fsm_storage == "redis":
-        dp = Dispatcher(
-            storage=RedisStorage.from_url(config.redis_dsn),
-            _translations=translations,
-        )
+        # Modules which are not required by every deployment are imported on demand
+        from bot.config_data.fsm_storage import create_redis_storage
+
+        storage = create_redis_storage(config.redis_dsn)
     else:
-        dp = Dispatcher(storage=MemoryStorage(), _translations=translations)
+        storage = MemoryStorage()
+    # Feature routers and their services (NumPy, process pool of charts) are
+    # imported by main(), so importing entry point stays cheap
+    from bot.handlers.digest_handlers import router as digest_router
+    from bot.handlers.inline_handlers import router as inline_router
+    from bot.handlers.recurring_handlers import router as recurring_router
+    from bot.handlers.search_handlers import router as search_router
+    from bot.handlers.statistic_handlers import router as statistic_router
+    from bot.services.charts import ChartService
+    from bot.services.digests import DigestScheduler
+    from bot.services.insights import InsightsService
+    from bot.services.recurring import RecurringScheduler
+
+    profiler = SamplingProfiler(Path(__file__).parent.parent / "Logs")
+    chart_service = ChartService(config.chart_workers)
+    insights_service = InsightsService()
+    recurring_scheduler = RecurringScheduler(db_pool, config.recurring_batch_size)
+    dp = Dispatcher(
+        storage=InstrumentedStorage(storage),
+        profiler=profiler,
+        chart_service=chart_service,
+        insights_service=insights_service,
+        recurring_scheduler=recurring_scheduler,
+    )
 
     dp.message.filter(F.chat.type == "private")
 
-    dp.message.outer_middleware(DbSessionMiddleware(db_pool))
-    dp.message.outer_middleware(TranslatorMiddleware())
-    dp.callback_query.outer_middleware(DbSessionMiddleware(db_pool))
-    dp.callback_query.outer_middleware(TranslatorMiddleware())
+    # Trace has to be started before FSM middleware reads user state
+    dp.update.outer_middleware.unregister(dp.fsm)
+    dp.update.outer_middleware(TracingMiddleware(config.trace_sample_rate))
+    dp.update.outer_middleware(dp.fsm)
+    dp.update.outer_middleware(ProfilerMiddleware(profiler))
+
+    dp.message.middleware(MetricsMiddleware("message"))
+    dp.callback_query.middleware(MetricsMiddleware("callback_query"))
+    dp.inline_query.middleware(MetricsMiddleware("inline_query"))
+    handler_tracing_middleware = HandlerTracingMiddleware()
+    dp.message.middleware(handler_tracing_middleware)
+    dp.callback_query.middleware(handler_tracing_middleware)
+    query_profiler_middleware = QueryProfilerMiddleware(sql_profiler)
+    dp.message.middleware(query_profiler_middleware)
+    dp.callback_query.middleware(query_profiler_middleware)
+    context_middleware = ContextMiddleware(catalog, db_pool)
+    dp.message.middleware(context_middleware)
+    dp.callback_query.middleware(context_middleware)
+    dp.inline_query.middleware(context_middleware)
 
+    if config.admin_ids:
+        from bot.handlers.admin_handlers import router as admin_router
+
+        dp.include_router(admin_router)
     dp.include_router(default_commands_router)
     dp.include_router(transactions_router)
     dp.include_router(change_transaction_router)
+    dp.include_router(category_router)
+    dp.include_router(statistic_router)
+    dp.include_router(budget_router)
+    dp.include_router(digest_router)
+    dp.include_router(recurring_router)
+    dp.include_router(search_router)
+    dp.include_router(inline_router)
     dp.include_router(ignore_router)
 
-    await set_main_menu(bot)
+    warm_up_keyboards(catalog.get(None))
+    await set_main_menu(bot, db_pool, force=not config.fast_start)
+
+    metrics_runner = None
+    if config.metrics_port:
+        from bot.monitoring.server import start_metrics_server
+
+        metrics_runner = await start_metrics_server(
+            config.metrics_host, config.metrics_port
+        )
+    loop_lag_task = asyncio.create_task(monitor_event_loop_lag())
+    digest_scheduler = DigestScheduler(
+        bot,
+        db_pool,
+        catalog.get(None),
+        digest_hour=config.digest_hour,
+        rate=config.digest_rate,
+        batch_size=config.digest_batch_size,
+    )
+    digest_task = asyncio.create_task(digest_scheduler.run())
+    recurring_task = asyncio.create_task(recurring_scheduler.run())
+    if hasattr(signal, "SIGUSR1"):
+        # kill -USR1 <pid> profiles running bot for DEFAULT_PROFILE_SECONDS
+        asyncio.get_running_loop().add_signal_handler(
+            signal.SIGUSR1, profiler.start, 0, DEFAULT_PROFILE_SECONDS
+        )
 
     print("Bot started.")
-    await dp.start_polling(bot)
+    try:
+        await dp.start_polling(bot)
+    finally:
+        loop_lag_task.cancel()
+        digest_task.cancel()
+        recurring_task.cancel()
+        chart_service.shutdown()
+        insights_service.shutdown()
+        if metrics_runner:
+            await metrics_runner.cleanup()
     print("Bot finished.")
 
 
-asyncio.run(main())
+if __name__ == "__main__":
+    setup_logging()
+    asyncio.run(main())
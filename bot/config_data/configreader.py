@@ -7,6 +7,19 @@ class Config(BaseSettings):
     bot_fsm_storage: str
     postgres_dsn: str
     redis_dsn: str
+    bot_api_server: str = ""
+    metrics_host: str = "127.0.0.1"
+    metrics_port: int = 0
+    slow_query_threshold: float = 0.1
+    n_plus_one_threshold: int = 5
+    trace_sample_rate: float = 1.0
+    admin_ids: list[int] = []
+    fast_start: bool = True
+    chart_workers: int = 2
+    digest_hour: int = 9
+    digest_rate: float = 25
+    digest_batch_size: int = 1000
+    recurring_batch_size: int = 1000
 
     @field_validator("bot_fsm_storage")
     @classmethod
@@ -0,0 +1,31 @@
+from typing import Literal
+
+from aiogram.fsm.storage.base import DEFAULT_DESTINY, StorageKey
+from aiogram.fsm.storage.redis import DefaultKeyBuilder, RedisStorage
+
+
+class DestinyKeyBuilder(DefaultKeyBuilder):
+    """Key builder which adds destiny only to keys of non-default destiny: keys of
+    user states are the same as keys of DefaultKeyBuilder, so states saved before
+    aren't lost, and data of other destinies (e.g. search queries) is kept apart."""
+
+    def __init__(self):
+        super().__init__()
+        self._destiny_builder = DefaultKeyBuilder(with_destiny=True)
+
+    def build(self, key: StorageKey, part: Literal["data", "state", "lock"]) -> str:
+        if key.destiny == DEFAULT_DESTINY:
+            return super().build(key, part)
+        return self._destiny_builder.build(key, part)
+
+
+def create_redis_storage(redis_dsn: str) -> RedisStorage:
+    """Create Redis FSM storage which supports non-default destinies.
+
+    Args:
+        redis_dsn (str): DSN of Redis
+
+    Returns:
+        RedisStorage: FSM storage
+    """
+    return RedisStorage.from_url(redis_dsn, key_builder=DestinyKeyBuilder())
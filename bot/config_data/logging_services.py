@@ -1,9 +1,31 @@
+import atexit
+import copy
+import gzip
+import json
+import logging
+import logging.config
 import os
+import queue
+import random
 import re
 import shutil
-from logging import Filter, LogRecord
-from logging.handlers import TimedRotatingFileHandler
-from pathlib import Path
+import sys
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from logging import Filter, Formatter, Handler, LogRecord
+from logging.handlers import QueueHandler, QueueListener, TimedRotatingFileHandler
+from typing import Optional
+
+import yaml
+
+# Attributes of LogRecord, other attributes are passed by "extra" argument
+RECORD_ATTRIBUTES = frozenset(vars(LogRecord("", 0, "", 0, "", (), None))) | {
+    "message",
+    "asctime",
+    "queue_owner",
+}
 
 
 class InfoLogFilter(Filter):
@@ -15,9 +37,149 @@ class InfoLogFilter(Filter):
         return record.levelname == "INFO"
 
 
+class InfoSamplingFilter(Filter):
+    """A class used to represent Filter for sampling of high-volume INFO logs. Records
+    of other levels are always passed.
+    """
+
+    def __init__(self, rate: float = 1.0):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record: LogRecord):
+        return (
+            record.levelno != logging.INFO
+            or self.rate >= 1
+            or random.random() < self.rate
+        )
+
+
+class JsonFormatter(Formatter):
+    """A class used to represent Formatter of logs to one line JSON objects. Fields
+    passed by "extra" argument are added to object.
+    """
+
+    def format(self, record: LogRecord) -> str:
+        log = {
+            "time": datetime.fromtimestamp(record.created).isoformat(
+                timespec="milliseconds"
+            ),
+            "level": record.levelname,
+            "logger": record.name,
+            "location": f"{record.filename}:{record.lineno}",
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            log["exception"] = record.exc_text
+        if record.stack_info:
+            log["stack"] = record.stack_info
+        for key, value in vars(record).items():
+            if key not in RECORD_ATTRIBUTES:
+                log[key] = value
+        return json.dumps(log, ensure_ascii=False, default=str)
+
+
+class LoggerQueueHandler(QueueHandler):
+    """A class used to represent Handler which puts logs of one logger to queue instead
+    of handlers of this logger, so logging call doesn't wait for I/O. Record is
+    prepared to be pickle-free and thread-safe: message is formatted, exception is
+    converted to text.
+    """
+
+    _formatter = Formatter()
+
+    def __init__(self, log_queue: queue.SimpleQueue, owner: str):
+        super().__init__(log_queue)
+        self.owner = owner
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = record.exc_text or self._formatter.formatException(
+                record.exc_info
+            )
+            record.exc_info = None
+        record.queue_owner = self.owner
+        return record
+
+
+class LoggerQueueListener(QueueListener):
+    """A class used to represent Listener which writes logs from queue on background
+    thread with original handlers of logger which put log to queue.
+    """
+
+    def __init__(
+        self, log_queue: queue.SimpleQueue, handlers: dict[str, list[Handler]]
+    ):
+        super().__init__(log_queue, respect_handler_level=True)
+        self.logger_handlers = handlers
+
+    def handle(self, record: LogRecord) -> None:
+        for handler in self.logger_handlers.get(record.queue_owner, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+
+
+def setup_logging(
+    config_path: str = os.path.join(os.path.dirname(__file__), "logging_config.yaml"),
+    logs_path: str = "Logs",
+) -> None:
+    """Configure loggers from YAML file and move their handlers to background thread.
+    It is called by entry point, so importing bot modules doesn't touch files.
+
+    Args:
+        config_path (str): path to logging config
+        logs_path (str): directory of log files used in config
+    """
+    os.makedirs(logs_path, exist_ok=True)
+    with open(config_path, "rt") as f:
+        logging_config = yaml.safe_load(f)
+    logging.config.dictConfig(logging_config)
+
+    queue_listener = start_queue_logging()
+    if queue_listener:
+        atexit.register(queue_listener.stop)
+
+
+def start_queue_logging() -> Optional[LoggerQueueListener]:
+    """Move handlers of configured loggers to background thread: loggers get handlers
+    which only put records to queue, listener thread passes records to original
+    handlers. Listener has to be stopped on exit to flush queue.
+
+    Returns:
+        Optional[LoggerQueueListener]: started listener or None if loggers don't have
+            handlers
+    """
+    log_queue = queue.SimpleQueue()
+    loggers = [logging.getLogger()] + [
+        logger
+        for logger in logging.Logger.manager.loggerDict.values()
+        if isinstance(logger, logging.Logger)
+    ]
+    handlers = {}
+    for logger in loggers:
+        if not logger.handlers:
+            continue
+        handlers[logger.name] = logger.handlers
+        logger.handlers = [LoggerQueueHandler(log_queue, logger.name)]
+    if not handlers:
+        return None
+
+    listener = LoggerQueueListener(log_queue, handlers)
+    listener.start()
+    return listener
+
+
 class LogRotatiingFileHandler(TimedRotatingFileHandler):
     """A class used to represent Handler for handling logs to file which changes name
-    each day."""
+    each day. Log file is rotated by atomic rename to "<name>.<date>.<ext>", so
+    rotation takes constant time. Rotated files are compressed by gzip and old files
+    are deleted by retention rules on worker thread.
+    """
 
     def __init__(
         self,
@@ -30,32 +192,111 @@ class LogRotatiingFileHandler(TimedRotatingFileHandler):
         utc=False,
         atTime=None,
         errors=None,
+        compress=True,
+        max_age_days=0,
+        max_total_size=0,
     ):
+        # Rotated files are deleted by worker, so backupCount isn't passed to parent
         super().__init__(
-            filename, when, interval, backupCount, encoding, delay, utc, atTime, errors
+            filename, when, interval, 0, encoding, delay, utc, atTime, errors
         )
 
         self.suffix = "%Y-%m-%d"
-        # self.suffix = "%Y-%m-%d_%H-%M-%S"
         self.namer = self._get_filename
         self.rotator = self._rotator_func
-        # Regular expression should match suffix!
-        self.extMatch = re.compile(r"\d{4}-\d{2}-\d{2}_\d{2}-\d{2}-\d{2}")
-
-    def _get_filename(self, filename: Path):
-        log_directory = os.path.split(filename)[0]
-        old_filename = filename.split("\\")[-1]
-        old_name_arr = old_filename.split(".")
-        new_filename = os.path.join(
-            log_directory,
-            old_name_arr[0] + "." + old_name_arr[2] + "." + old_name_arr[1],
+        self.compress = compress
+        self.max_backups = backupCount
+        self.max_age_days = max_age_days
+        self.max_total_size = max_total_size
+
+        log_directory, log_filename = os.path.split(self.baseFilename)
+        stem, ext = os.path.splitext(log_filename)
+        self.log_directory = log_directory
+        # Regular expression should match names of rotated files!
+        self.extMatch = re.compile(
+            rf"^{re.escape(stem)}\.\d{{4}}-\d{{2}}-\d{{2}}(\.\d+)?"
+            rf"{re.escape(ext)}(\.gz)?$"
+        )
+        self._worker = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix=f"log-rotation-{stem}"
         )
 
-        if not os.path.exists(new_filename):
-            return new_filename
+    def _get_filename(self, filename: str) -> str:
+        """Convert default name of rotated file "<name>.<ext>.<date>" to
+        "<name>.<date>.<ext>". Number is added to name if file of this date exists.
+        """
+        log_directory, old_filename = os.path.split(filename)
+        stem_ext, date_suffix = old_filename.rsplit(".", 1)
+        stem, ext = os.path.splitext(stem_ext)
+
+        new_filename = os.path.join(log_directory, f"{stem}.{date_suffix}{ext}")
+        number = 0
+        while os.path.exists(new_filename) or os.path.exists(new_filename + ".gz"):
+            number += 1
+            new_filename = os.path.join(
+                log_directory, f"{stem}.{date_suffix}.{number}{ext}"
+            )
+        return new_filename
+
+    def _rotator_func(self, source: str, dest: str) -> None:
+        os.replace(source, dest)
+        self._worker.submit(self._process_rotated_file, dest)
+
+    def _process_rotated_file(self, path: str) -> None:
+        try:
+            if self.compress:
+                compress_file(path)
+            self._apply_retention()
+        except Exception:
+            # Logging can't be used there, it would be handled by this handler
+            traceback.print_exc(file=sys.stderr)
+
+    def _apply_retention(self) -> None:
+        rotated_files = []
+        with os.scandir(self.log_directory) as entries:
+            for entry in entries:
+                if self.extMatch.match(entry.name):
+                    stat = entry.stat()
+                    rotated_files.append((stat.st_mtime, stat.st_size, entry.path))
+        # The newest files first
+        rotated_files.sort(reverse=True)
 
-    def _rotator_func(self, source: Path, dest: Path):
-        shutil.copy(source, dest)
+        oldest_mtime = time.time() - self.max_age_days * 86400
+        total_size = 0
+        for number, (mtime, size, path) in enumerate(rotated_files, start=1):
+            total_size += size
+            if (
+                (self.max_backups and number > self.max_backups)
+                or (self.max_age_days and mtime < oldest_mtime)
+                or (self.max_total_size and total_size > self.max_total_size)
+            ):
+                os.remove(path)
 
-        with open(source, "w", encoding="utf-8"):
-            pass
+    def getFilesToDelete(self) -> list[str]:
+        return []
+
+    def close(self) -> None:
+        super().close()
+        self._worker.shutdown(wait=True)
+
+
+def compress_file(path: str) -> str:
+    """Compress file by gzip to "<path>.gz" and remove source file. Compressed file
+    appears atomically, so partially written archive is never left under final name.
+
+    Args:
+        path (str): path to file
+
+    Returns:
+        str: path to compressed file
+    """
+    compressed_path = path + ".gz"
+    tmp_path = compressed_path + ".tmp"
+    with open(path, "rb") as source, gzip.open(tmp_path, "wb") as dest:
+        shutil.copyfileobj(source, dest, length=1024 * 1024)
+    # Age of logs is checked by modification time, so it is kept from source file
+    stat = os.stat(path)
+    os.utime(tmp_path, (stat.st_atime, stat.st_mtime))
+    os.replace(tmp_path, compressed_path)
+    os.remove(path)
+    return compressed_path
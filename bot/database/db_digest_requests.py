@@ -0,0 +1,216 @@
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import Date, case, cast, delete, func, literal_column, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.db_models import (
+    Category,
+    Digest,
+    DigestOutbox,
+    Expense,
+    Transaction,
+    User,
+)
+from bot.monitoring.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+PERIOD_INTERVALS = {"day": "1 day", "week": "1 week", "month": "1 month"}
+
+
+def _period_interval(period):
+    """SQL expression of interval of digest period stored in column."""
+    return case(
+        *(
+            (period == name, literal_column(f"interval '{interval}'"))
+            for name, interval in PERIOD_INTERVALS.items()
+        )
+    )
+
+
+@traced
+async def set_digest_period(
+    async_session: AsyncSession,
+    user_id: int,
+    period: Optional[str],
+    next_date: Optional[date],
+) -> None:
+    """
+    Subscribe user to digests or unsubscribe.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        period (Optional[str]): period of digest (day, week, month), None unsubscribes
+        next_date (Optional[date]): day since which the first digest is due
+    """
+    await async_session.execute(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(digest_period=period, digest_next_date=next_date)
+    )
+    logger.info("Digest period of user #%s was set to %s.", user_id, period)
+
+
+@traced
+async def claim_due_digests(
+    async_session: AsyncSession, today: date, batch_size: int
+) -> int:
+    """
+    Move digests of users which are due to outbox in one statement: next date of
+    users is moved to the next period and outbox rows are added together. Users
+    locked by another scheduler are skipped.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        today (date): current date
+        batch_size (int): maximum number of claimed users
+
+    Returns:
+        int: number of claimed digests
+    """
+    due = (
+        select(User.user_id, User.digest_period, User.digest_next_date)
+        .where(User.digest_next_date <= today)
+        .where(User.digest_period.in_(PERIOD_INTERVALS))
+        .order_by(User.digest_next_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+        .cte("due")
+    )
+    claimed = (
+        update(User)
+        .where(User.user_id == due.c.user_id)
+        .values(
+            digest_next_date=cast(
+                due.c.digest_next_date + _period_interval(due.c.digest_period), Date
+            )
+        )
+        .returning(due.c.user_id, due.c.digest_period, due.c.digest_next_date)
+        .cte("claimed")
+    )
+    req = (
+        insert(DigestOutbox)
+        .from_select(
+            ["user_id", "period", "period_start", "period_end"],
+            select(
+                claimed.c.user_id,
+                claimed.c.digest_period,
+                cast(
+                    claimed.c.digest_next_date
+                    - _period_interval(claimed.c.digest_period),
+                    Date,
+                ),
+                claimed.c.digest_next_date,
+            ),
+        )
+        .on_conflict_do_nothing()
+        .add_cte(due)
+        .add_cte(claimed)
+    )
+    result = await async_session.execute(req)
+    logger.info("%s digests were claimed.", result.rowcount)
+    return result.rowcount
+
+
+@traced
+async def get_pending_digests(
+    async_session: AsyncSession, batch_size: int, top_categories: int
+) -> list[Digest]:
+    """
+    Get batch of digests from outbox with totals of their periods. Totals of all
+    digests are calculated by one grouped query. Digests are locked until the end of
+    transaction, locked digests are skipped.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        batch_size (int): maximum number of digests
+        top_categories (int): number of categories with the largest totals in digest
+
+    Returns:
+        list[Digest]: digests ordered by ID
+    """
+    req = (
+        select(
+            DigestOutbox.digest_id,
+            DigestOutbox.user_id,
+            User.telegram_id,
+            DigestOutbox.period,
+            DigestOutbox.period_start,
+            DigestOutbox.period_end,
+        )
+        .join(User, User.user_id == DigestOutbox.user_id)
+        .order_by(DigestOutbox.digest_id)
+        .limit(batch_size)
+        .with_for_update(of=DigestOutbox, skip_locked=True)
+    )
+    digests: dict[int, Digest] = {}
+    for row in (await async_session.execute(req)).all():
+        digest = Digest(*row)
+        digests[digest.digest_id] = digest
+    if not digests:
+        return []
+
+    total = func.sum(Transaction.cost * Transaction.amount)
+    req = (
+        select(
+            DigestOutbox.digest_id,
+            Category.category_name,
+            total,
+            func.count(Transaction.transaction_id),
+        )
+        .join(Category, Category.user_id == DigestOutbox.user_id)
+        .join(Category.expenses)
+        .join(Expense.transactions)
+        .where(DigestOutbox.digest_id.in_(digests))
+        .where(Transaction.created_date >= DigestOutbox.period_start)
+        .where(Transaction.created_date < DigestOutbox.period_end)
+        .group_by(DigestOutbox.digest_id, Category.category_id, Category.category_name)
+        .order_by(DigestOutbox.digest_id, total.desc())
+    )
+    for digest_id, category_name, category_total, transactions_number in (
+        await async_session.execute(req)
+    ).all():
+        digest = digests[digest_id]
+        digest.total += category_total
+        digest.transactions_number += transactions_number
+        if len(digest.categories) < top_categories:
+            digest.categories.append((category_name, category_total))
+
+    logger.info("%s pending digests were got from db.", len(digests))
+    return list(digests.values())
+
+
+@traced
+async def delete_digests(async_session: AsyncSession, digest_ids: list[int]) -> None:
+    """
+    Delete sent digests from outbox.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        digest_ids (list[int]): IDs of sent digests
+    """
+    await async_session.execute(
+        delete(DigestOutbox).where(DigestOutbox.digest_id.in_(digest_ids))
+    )
+    logger.info("%s digests were deleted from outbox.", len(digest_ids))
+
+
+@traced
+async def unsubscribe_users(async_session: AsyncSession, user_ids: list[int]) -> None:
+    """
+    Turn off digests of users who blocked bot.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_ids (list[int]): local user IDs in db
+    """
+    await async_session.execute(
+        update(User)
+        .where(User.user_id.in_(user_ids))
+        .values(digest_period=None, digest_next_date=None)
+    )
+    logger.info("Digests of %s users were turned off.", len(user_ids))
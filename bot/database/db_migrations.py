@@ -0,0 +1,248 @@
+import hashlib
+import logging
+
+from sqlalchemy import MetaData, select, text
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine
+
+from bot.database.db_models import Base, BotMeta
+
+logger = logging.getLogger(__name__)
+
+
+def _cascade_foreign_key(table: str, column: str, target: str) -> str:
+    """Statement which makes foreign key of existing table ON DELETE CASCADE, key
+    is replaced only if it isn't cascading yet."""
+    constraint = f"{table}_{column}_fkey"
+    return f"""
+    DO $$
+    BEGIN
+        IF EXISTS (
+            SELECT 1 FROM pg_constraint
+            WHERE conname = '{constraint}' AND confdeltype <> 'c'
+        ) THEN
+            ALTER TABLE {table}
+            DROP CONSTRAINT {constraint},
+            ADD CONSTRAINT {constraint} FOREIGN KEY ({column})
+                REFERENCES {target} ON DELETE CASCADE;
+        END IF;
+    END
+    $$
+    """
+
+
+# Base.metadata.create_all creates only missing tables, so changes of existing tables
+# are applied by these idempotent statements in order
+MIGRATIONS = (
+    "ALTER TABLE user_table "
+    "ADD COLUMN IF NOT EXISTS auto_confirm BOOLEAN NOT NULL DEFAULT false",
+    "ALTER TABLE user_table "
+    "ADD COLUMN IF NOT EXISTS data_version INTEGER NOT NULL DEFAULT 0",
+    "ALTER TABLE category_table "
+    "ADD COLUMN IF NOT EXISTS monthly_limit DOUBLE PRECISION",
+    # Running totals of categories by month are changed together with transactions
+    """
+    CREATE OR REPLACE FUNCTION update_category_month_total() RETURNS trigger AS $$
+    BEGIN
+        IF TG_OP IN ('UPDATE', 'DELETE') THEN
+            UPDATE category_month_total AS t
+            SET total = t.total - OLD.cost * OLD.amount
+            FROM expense_table AS e
+            WHERE e.expense_id = OLD.expense_id
+                AND t.category_id = e.category_id
+                AND t.month = date_trunc('month', OLD.created_date)::date;
+        END IF;
+        IF TG_OP IN ('INSERT', 'UPDATE') THEN
+            INSERT INTO category_month_total (category_id, month, user_id, total)
+            SELECT c.category_id, date_trunc('month', NEW.created_date)::date,
+                c.user_id, NEW.cost * NEW.amount
+            FROM expense_table AS e
+            JOIN category_table AS c ON c.category_id = e.category_id
+            WHERE e.expense_id = NEW.expense_id
+            ON CONFLICT (category_id, month)
+            DO UPDATE SET total = category_month_total.total + EXCLUDED.total;
+        END IF;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS category_month_total_trigger ON transaction_table",
+    "CREATE TRIGGER category_month_total_trigger "
+    "AFTER INSERT OR UPDATE ON transaction_table "
+    "FOR EACH ROW EXECUTE FUNCTION update_category_month_total()",
+    # Deleted transactions are subtracted once per statement: cascading delete of
+    # category with many transactions doesn't run trigger for each row
+    """
+    CREATE OR REPLACE FUNCTION subtract_category_month_total() RETURNS trigger AS $$
+    BEGIN
+        UPDATE category_month_total AS t
+        SET total = t.total - d.total
+        FROM (
+            SELECT e.category_id, date_trunc('month', o.created_date)::date AS month,
+                sum(o.cost * o.amount) AS total
+            FROM deleted_transactions AS o
+            JOIN expense_table AS e ON e.expense_id = o.expense_id
+            GROUP BY 1, 2
+        ) AS d
+        WHERE t.category_id = d.category_id AND t.month = d.month;
+        RETURN NULL;
+    END;
+    $$ LANGUAGE plpgsql
+    """,
+    "DROP TRIGGER IF EXISTS category_month_total_delete_trigger ON transaction_table",
+    "CREATE TRIGGER category_month_total_delete_trigger "
+    "AFTER DELETE ON transaction_table "
+    "REFERENCING OLD TABLE AS deleted_transactions "
+    "FOR EACH STATEMENT EXECUTE FUNCTION subtract_category_month_total()",
+    # Totals of transactions added before trigger, existing totals are kept
+    """
+    INSERT INTO category_month_total (category_id, month, user_id, total)
+    SELECT c.category_id, date_trunc('month', t.created_date)::date, c.user_id,
+        sum(t.cost * t.amount)
+    FROM transaction_table AS t
+    JOIN expense_table AS e ON e.expense_id = t.expense_id
+    JOIN category_table AS c ON c.category_id = e.category_id
+    GROUP BY c.category_id, date_trunc('month', t.created_date)::date, c.user_id
+    ON CONFLICT (category_id, month) DO NOTHING
+    """,
+    "ALTER TABLE user_table ADD COLUMN IF NOT EXISTS digest_period VARCHAR",
+    "ALTER TABLE user_table ADD COLUMN IF NOT EXISTS digest_next_date DATE",
+    "CREATE INDEX IF NOT EXISTS ix_user_table_digest_next_date "
+    "ON user_table (digest_next_date) WHERE digest_next_date IS NOT NULL",
+    "CREATE INDEX IF NOT EXISTS ix_category_table_user_id ON category_table (user_id)",
+    "CREATE INDEX IF NOT EXISTS ix_expense_table_category_id "
+    "ON expense_table (category_id)",
+    "CREATE INDEX IF NOT EXISTS ix_transaction_table_expense_id_created_date "
+    "ON transaction_table (expense_id, created_date)",
+    # Search of expenses and comments: trigram indexes serve substring ILIKE, text
+    # search indexes serve words in any form. Expressions have to be the same as in
+    # db_search_requests.py, otherwise indexes aren't used
+    "CREATE EXTENSION IF NOT EXISTS pg_trgm",
+    "CREATE INDEX IF NOT EXISTS ix_expense_table_expense_name_trgm "
+    "ON expense_table USING gin (expense_name gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_transaction_table_comment_trgm "
+    "ON transaction_table USING gin (comment gin_trgm_ops)",
+    "CREATE INDEX IF NOT EXISTS ix_expense_table_expense_name_fts "
+    "ON expense_table USING gin (to_tsvector('russian'::regconfig, expense_name))",
+    "CREATE INDEX IF NOT EXISTS ix_transaction_table_comment_fts "
+    "ON transaction_table USING gin (to_tsvector('russian'::regconfig, comment))",
+    # Categories and accounts are deleted by one statement, children are deleted by
+    # database
+    _cascade_foreign_key("category_table", "user_id", "user_table (user_id)"),
+    _cascade_foreign_key(
+        "expense_table", "category_id", "category_table (category_id)"
+    ),
+    _cascade_foreign_key(
+        "transaction_table", "expense_id", "expense_table (expense_id)"
+    ),
+    _cascade_foreign_key("category_month_total", "user_id", "user_table (user_id)"),
+    # Names of categories are unique for user. Index isn't created while old
+    # duplicates exist, merging them would move expenses between categories
+    """
+    DO $$
+    BEGIN
+        IF NOT EXISTS (
+            SELECT 1 FROM category_table
+            GROUP BY user_id, category_name
+            HAVING count(*) > 1
+        ) THEN
+            CREATE UNIQUE INDEX IF NOT EXISTS uq_category_table_user_id_category_name
+            ON category_table (user_id, category_name);
+        ELSE
+            RAISE WARNING 'category_table has duplicate names of categories';
+        END IF;
+    END
+    $$
+    """,
+)
+
+SCHEMA_VERSION_KEY = "schema_version"
+# Replicas started at the same time upgrade schema one by one
+SCHEMA_LOCK_ID = 7_345_001
+
+
+def schema_fingerprint(metadata: MetaData) -> str:
+    """
+    Get version of schema described by models and migrations. Any change of tables,
+    columns, indexes or migrations changes version.
+
+    Args:
+        metadata (MetaData): metadata of models
+
+    Returns:
+        str: hash of schema
+    """
+    schema_hash = hashlib.sha256()
+    for table in metadata.sorted_tables:
+        schema_hash.update(f"table {table.name}\n".encode())
+        for column in table.columns:
+            foreign_keys = ",".join(
+                sorted(
+                    f"{fk.target_fullname} {fk.ondelete}" for fk in column.foreign_keys
+                )
+            )
+            schema_hash.update(
+                f"{column.name} {column.type!r} {column.nullable} "
+                f"{column.primary_key} {column.unique} {foreign_keys}\n".encode()
+            )
+        for index in sorted(table.indexes, key=lambda index: index.name or ""):
+            schema_hash.update(f"index {index.name}\n".encode())
+    for statement in MIGRATIONS:
+        schema_hash.update(f"{statement}\n".encode())
+    return schema_hash.hexdigest()[:16]
+
+
+async def upgrade_schema(conn: AsyncConnection) -> None:
+    """
+    Apply changes of existing tables to database schema.
+
+    Args:
+        conn (AsyncConnection): asynchronous connection with db inside transaction
+    """
+    for statement in MIGRATIONS:
+        await conn.execute(text(statement))
+    logger.info("%s schema migrations were applied.", len(MIGRATIONS))
+
+
+async def ensure_schema(engine: AsyncEngine, force: bool = False) -> bool:
+    """
+    Create missing tables and apply migrations only if schema version stored in
+    database differs from version of models, so usual start costs one query.
+
+    Args:
+        engine (AsyncEngine): engine of bot database
+        force (bool): upgrade schema without version check
+
+    Returns:
+        bool: True if schema was upgraded
+    """
+    fingerprint = schema_fingerprint(Base.metadata)
+    if not force:
+        async with engine.connect() as conn:
+            try:
+                version = await conn.scalar(
+                    select(BotMeta.value).where(BotMeta.key == SCHEMA_VERSION_KEY)
+                )
+            except DBAPIError:
+                # Table of settings doesn't exist yet
+                version = None
+        if version == fingerprint:
+            logger.info("Database schema %s is up to date.", fingerprint)
+            return False
+
+    async with engine.begin() as conn:
+        await conn.execute(
+            text("SELECT pg_advisory_xact_lock(:lock_id)"), {"lock_id": SCHEMA_LOCK_ID}
+        )
+        await conn.run_sync(Base.metadata.create_all)
+        await upgrade_schema(conn)
+        await conn.execute(
+            insert(BotMeta)
+            .values(key=SCHEMA_VERSION_KEY, value=fingerprint)
+            .on_conflict_do_update(
+                index_elements=[BotMeta.key], set_={"value": fingerprint}
+            )
+        )
+    logger.info("Database schema was upgraded to %s.", fingerprint)
+    return True
@@ -1,8 +1,8 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import date, datetime
-from typing import List
+from typing import List, Optional
 
-from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, func, null
+from sqlalchemy import BigInteger, Date, DateTime, ForeignKey, Index, false, func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
 
 
@@ -12,6 +12,14 @@ class Base(DeclarativeBase):
 
 class User(Base):
     __tablename__ = "user_table"
+    __table_args__ = (
+        # Scheduler of digests reads only subscribed users in order of due date
+        Index(
+            "ix_user_table_digest_next_date",
+            "digest_next_date",
+            postgresql_where="digest_next_date IS NOT NULL",
+        ),
+    )
 
     user_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     telegram_id: Mapped[int] = mapped_column(BigInteger, nullable=False, unique=True)
@@ -19,22 +27,44 @@ class User(Base):
     reg_date: Mapped[datetime] = mapped_column(
         DateTime(timezone=False), server_default=func.now()
     )
-
+    auto_confirm: Mapped[bool] = mapped_column(default=False, server_default=false())
+    # Incremented on every change of user transactions, cached results built from
+    # transactions (e.g. charts) are valid only for the same version
+    data_version: Mapped[int] = mapped_column(default=0, server_default="0")
+    # Period of spending digest (day, week, month) and the first day of the next
+    # period, digest for the previous period is due since that day
+    digest_period: Mapped[Optional[str]]
+    digest_next_date: Mapped[Optional[date]] = mapped_column(Date)
+
+    # Children are deleted by ON DELETE CASCADE of database, not loaded by ORM
     categories: Mapped[List["Category"]] = relationship(
-        back_populates="user", cascade="all, delete"
+        back_populates="user", cascade="all, delete", passive_deletes=True
     )
 
 
 class Category(Base):
     __tablename__ = "category_table"
+    __table_args__ = (
+        # Categories are inserted by INSERT ... ON CONFLICT DO NOTHING, so
+        # concurrent adding of the same name can't create duplicate
+        Index(
+            "uq_category_table_user_id_category_name",
+            "user_id",
+            "category_name",
+            unique=True,
+        ),
+    )
 
     category_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     category_name: Mapped[str]
-    user_id: Mapped[int] = mapped_column(ForeignKey("user_table.user_id"))
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user_table.user_id", ondelete="CASCADE"), index=True
+    )
+    monthly_limit: Mapped[Optional[float]]
 
     user: Mapped["User"] = relationship(back_populates="categories")
     expenses: Mapped[List["Expense"]] = relationship(
-        back_populates="category", cascade="all, delete"
+        back_populates="category", cascade="all, delete", passive_deletes=True
     )
 
 
@@ -43,19 +73,29 @@ class Expense(Base):
 
     expense_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     expense_name: Mapped[str]
-    category_id: Mapped[int] = mapped_column(ForeignKey("category_table.category_id"))
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("category_table.category_id", ondelete="CASCADE"), index=True
+    )
 
     category: Mapped["Category"] = relationship(back_populates="expenses")
     transactions: Mapped[List["Transaction"]] = relationship(
-        back_populates="expense", cascade="all, delete"
+        back_populates="expense", cascade="all, delete", passive_deletes=True
     )
 
 
 class Transaction(Base):
     __tablename__ = "transaction_table"
+    # Totals of user transactions for period (statistic, digests) are read by range
+    __table_args__ = (
+        Index(
+            "ix_transaction_table_expense_id_created_date", "expense_id", "created_date"
+        ),
+    )
 
     transaction_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    expense_id: Mapped[int] = mapped_column(ForeignKey("expense_table.expense_id"))
+    expense_id: Mapped[int] = mapped_column(
+        ForeignKey("expense_table.expense_id", ondelete="CASCADE")
+    )
     cost: Mapped[float] = mapped_column(nullable=False)
     created_date: Mapped[date] = mapped_column(Date)
     amount: Mapped[int]
@@ -64,6 +104,138 @@ class Transaction(Base):
     expense: Mapped["Expense"] = relationship(back_populates="transactions")
 
 
+class CategoryMonthTotal(Base):
+    """Running total of category transactions by month. Rows are maintained by trigger
+    of transaction_table (see db_migrations.py), so any insert, edit or delete of
+    transaction changes total in the same database transaction.
+    """
+
+    __tablename__ = "category_month_total"
+
+    category_id: Mapped[int] = mapped_column(
+        ForeignKey("category_table.category_id", ondelete="CASCADE"), primary_key=True
+    )
+    month: Mapped[date] = mapped_column(Date, primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user_table.user_id", ondelete="CASCADE")
+    )
+    total: Mapped[float] = mapped_column(default=0, server_default="0")
+
+
+class DigestOutbox(Base):
+    """Digest which is due but wasn't sent yet. Row is added in the same database
+    transaction which moves digest_next_date of user and is deleted after digest is
+    sent, so restart of bot neither skips nor duplicates digests.
+    """
+
+    __tablename__ = "digest_outbox"
+    # One digest per user and period, claim of digests is idempotent
+    __table_args__ = (
+        Index("uq_digest_outbox_user_period", "user_id", "period_end", unique=True),
+    )
+
+    digest_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user_table.user_id", ondelete="CASCADE")
+    )
+    period: Mapped[str]
+    period_start: Mapped[date] = mapped_column(Date)
+    period_end: Mapped[date] = mapped_column(Date)
+
+
+class RecurringTransaction(Base):
+    """Template of transaction which is posted automatically every period. Templates
+    are read by scheduler in order of next_date, next_date is moved in the same
+    database transaction which posts transactions, so restart of bot neither skips
+    nor duplicates postings.
+    """
+
+    __tablename__ = "recurring_transaction"
+
+    recurring_id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user_table.user_id", ondelete="CASCADE"), index=True
+    )
+    expense_id: Mapped[int] = mapped_column(
+        ForeignKey("expense_table.expense_id", ondelete="CASCADE")
+    )
+    cost: Mapped[float]
+    amount: Mapped[int]
+    comment: Mapped[str]
+    # Period of posting (day, week, month) and day of month of the first posting:
+    # monthly posting on 31st is moved to the last day of shorter months only
+    period: Mapped[str]
+    anchor_day: Mapped[int]
+    next_date: Mapped[date] = mapped_column(Date, index=True)
+
+
+class BotMeta(Base):
+    """Key-value settings of bot deployment, e.g. version of database schema."""
+
+    __tablename__ = "bot_meta"
+
+    key: Mapped[str] = mapped_column(primary_key=True)
+    value: Mapped[str]
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryBudget:
+    category_name: str
+    monthly_limit: float
+    total: float
+
+
+@dataclass(slots=True)
+class Digest:
+    digest_id: int
+    user_id: int
+    telegram_id: int
+    period: str
+    period_start: date
+    period_end: date
+    total: float = 0
+    transactions_number: int = 0
+    categories: list[tuple[str, float]] = field(default_factory=list)
+
+
+@dataclass(slots=True, frozen=True)
+class RecurringInfo:
+    recurring_id: int
+    expense_name: str
+    cost: float
+    amount: int
+    period: str
+    next_date: date
+
+
+@dataclass(slots=True, frozen=True)
+class SearchResult:
+    transaction_id: int
+    created_date: date
+    expense_name: str
+    cost: float
+    amount: int
+    comment: str
+
+
+@dataclass(slots=True)
+class ExpenseUsage:
+    expense_name: str
+    transactions_number: int
+    last_cost: Optional[float]
+
+
+@dataclass(slots=True, frozen=True)
+class TransactionHistory:
+    """Transactions of user in columns, one list per column of query result. Dates
+    are numbers of days since 1970-01-01, they are loaded to arrays without parsing."""
+
+    days: list[int]
+    category_ids: list[int]
+    expense_names: list[str]
+    totals: list[float]
+
+
 @dataclass(slots=True, frozen=True)
 class ExpenseCategory:
     expense_name: str
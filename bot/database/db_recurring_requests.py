@@ -0,0 +1,211 @@
+import logging
+from datetime import date
+from typing import Iterable, Optional
+
+from sqlalchemy import delete, func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.db_models import (
+    Expense,
+    RecurringInfo,
+    RecurringTransaction,
+    Transaction,
+    User,
+)
+from bot.monitoring.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+
+@traced
+async def add_recurring(
+    async_session: AsyncSession,
+    user_id: int,
+    expense_id: int,
+    cost: float,
+    amount: int,
+    comment: str,
+    period: str,
+    first_date: date,
+) -> None:
+    """
+    Add template of recurring transaction, the first transaction is posted on the
+    first date.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        expense_id (int): expense ID in db
+        cost (float): cost of expense
+        amount (int): amount of expense
+        comment (str): comment for expense
+        period (str): period of posting (day, week, month)
+        first_date (date): date of the first transaction
+    """
+    async_session.add(
+        RecurringTransaction(
+            user_id=user_id,
+            expense_id=expense_id,
+            cost=cost,
+            amount=amount,
+            comment=comment,
+            period=period,
+            anchor_day=first_date.day,
+            next_date=first_date,
+        )
+    )
+    logger.info("Recurring transaction for user #%s was added to db.", user_id)
+
+
+@traced
+async def get_user_recurring(
+    async_session: AsyncSession, user_id: int
+) -> list[RecurringInfo]:
+    """
+    Get templates of recurring transactions of user.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+
+    Returns:
+        list[RecurringInfo]: templates ordered by next date
+    """
+    req = (
+        select(
+            RecurringTransaction.recurring_id,
+            Expense.expense_name,
+            RecurringTransaction.cost,
+            RecurringTransaction.amount,
+            RecurringTransaction.period,
+            RecurringTransaction.next_date,
+        )
+        .join(Expense, Expense.expense_id == RecurringTransaction.expense_id)
+        .where(RecurringTransaction.user_id == user_id)
+        .order_by(RecurringTransaction.next_date, RecurringTransaction.recurring_id)
+    )
+    result = await async_session.execute(req)
+    recurring = [RecurringInfo(*row) for row in result.all()]
+    logger.info(
+        "%s recurring transactions of user #%s were got from db.",
+        len(recurring),
+        user_id,
+    )
+    return recurring
+
+
+@traced
+async def delete_recurring(
+    async_session: AsyncSession, user_id: int, recurring_id: int
+) -> bool:
+    """
+    Delete template of recurring transaction if it belongs to user.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        recurring_id (int): ID of template
+
+    Returns:
+        bool: True if template was deleted
+    """
+    result = await async_session.execute(
+        delete(RecurringTransaction)
+        .where(RecurringTransaction.recurring_id == recurring_id)
+        .where(RecurringTransaction.user_id == user_id)
+    )
+    logger.info(
+        "Recurring transaction #%s of user #%s was deleted: %s.",
+        recurring_id,
+        user_id,
+        bool(result.rowcount),
+    )
+    return bool(result.rowcount)
+
+
+@traced
+async def get_next_recurring_date(async_session: AsyncSession) -> Optional[date]:
+    """
+    Get the earliest next date of all templates, it is read from index.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+
+    Returns:
+        Optional[date]: the earliest date of posting or None if there are no templates
+    """
+    result = await async_session.execute(
+        select(func.min(RecurringTransaction.next_date))
+    )
+    return result.scalar_one()
+
+
+@traced
+async def lock_due_recurring(
+    async_session: AsyncSession, today: date, batch_size: int
+) -> list[RecurringTransaction]:
+    """
+    Get batch of templates which are due and lock them until the end of
+    transaction, templates locked by another scheduler are skipped.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        today (date): current date
+        batch_size (int): maximum number of templates
+
+    Returns:
+        list[RecurringTransaction]: due templates ordered by next date
+    """
+    req = (
+        select(RecurringTransaction)
+        .where(RecurringTransaction.next_date <= today)
+        .order_by(RecurringTransaction.next_date)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+    result = await async_session.execute(req)
+    return list(result.scalars())
+
+
+@traced
+async def post_recurring(
+    async_session: AsyncSession,
+    transactions: list[dict],
+    next_dates: list[dict],
+    user_ids: Iterable[int],
+) -> list[int]:
+    """
+    Post transactions of due templates: transactions are added by bulk insert, next
+    dates of templates are moved by one executemany update and data versions of
+    users are incremented by one statement.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        transactions (list[dict]): values of new transactions
+        next_dates (list[dict]): recurring_id and new next_date of templates
+        user_ids (Iterable[int]): local user IDs of posted transactions
+
+    Returns:
+        list[int]: Telegram IDs of users of posted transactions
+    """
+    if transactions:
+        # executemany of insert is sent as multi-row INSERT statements by pages
+        await async_session.execute(insert(Transaction), transactions)
+    if next_dates:
+        await async_session.execute(update(RecurringTransaction), next_dates)
+    user_ids = list(user_ids)
+    telegram_ids = []
+    if user_ids:
+        result = await async_session.execute(
+            update(User)
+            .where(User.user_id.in_(user_ids))
+            .values(data_version=User.data_version + 1)
+            .returning(User.telegram_id)
+        )
+        telegram_ids = list(result.scalars())
+    logger.info(
+        "%s recurring transactions of %s templates were posted.",
+        len(transactions),
+        len(next_dates),
+    )
+    return telegram_ids
@@ -2,15 +2,28 @@ import logging
 from datetime import date
 from typing import Optional
 
-from sqlalchemy import select
+from sqlalchemy import and_, delete, func, select, update
+from sqlalchemy.dialects.postgresql import aggregate_order_by, insert
 from sqlalchemy.exc import IntegrityError, NoResultFound
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from bot.database.db_models import Category, Expense, ExpenseCategory, Transaction, User
+from bot.database.db_models import (
+    BotMeta,
+    Category,
+    CategoryBudget,
+    CategoryMonthTotal,
+    Expense,
+    ExpenseCategory,
+    ExpenseUsage,
+    Transaction,
+    User,
+)
+from bot.monitoring.tracing import traced
 
 logger = logging.getLogger(__name__)
 
 
+@traced
 async def add_user(
     async_session: AsyncSession, telegram_id: int, user_name: str
 ) -> None:
@@ -25,11 +38,12 @@ async def add_user(
     try:
         async with async_session.begin():
             async_session.add(User(telegram_id=telegram_id, user_name=user_name))
-            logger.info(f"User {telegram_id} was added to db.")
+            logger.info("User %s was added to db.", telegram_id)
     except IntegrityError:
-        logger.info(f"Attempt to add an existing user: {telegram_id}.")
+        logger.info("Attempt to add an existing user: %s.", telegram_id)
 
 
+@traced
 async def get_user_info(async_session: AsyncSession, telegram_id: int) -> User:
     """
     Get user information from database.
@@ -45,19 +59,59 @@ async def get_user_info(async_session: AsyncSession, telegram_id: int) -> User:
     result = await async_session.execute(req)
     try:
         user_info = result.scalar_one()
-        logger.info(f"Info for user {telegram_id} was got from db.")
+        logger.info("Info for user %s was got from db.", telegram_id)
         return user_info
     except NoResultFound:
-        logger.info(f"Info for user {telegram_id} wasn't found in db.")
+        logger.info("Info for user %s wasn't found in db.", telegram_id)
 
 
+@traced
+async def set_auto_confirm(
+    async_session: AsyncSession, user_id: int, auto_confirm: bool
+) -> None:
+    """
+    Set user setting to add transactions with known expense without confirmation.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in database
+        auto_confirm (bool): new value of setting
+    """
+    await async_session.execute(
+        update(User).where(User.user_id == user_id).values(auto_confirm=auto_confirm)
+    )
+    logger.info("Auto confirm for user #%s was set to %s.", user_id, auto_confirm)
+
+
+@traced
+async def delete_user(async_session: AsyncSession, telegram_id: int) -> bool:
+    """
+    Delete user with all categories, expenses, transactions and other data by one
+    statement, dependent rows are deleted by ON DELETE CASCADE of database.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        telegram_id (int): user Telegram ID
+
+    Returns:
+        bool: True if user was deleted
+    """
+    result = await async_session.execute(
+        delete(User).where(User.telegram_id == telegram_id)
+    )
+    logger.info("User %s was deleted from db: %s.", telegram_id, bool(result.rowcount))
+    return bool(result.rowcount)
+
+
+@traced
 async def add_category(
     async_session: AsyncSession,
     user_id: int,
     category_name: str,
 ) -> int:
     """
-    Add new category to database.
+    Add new category to database. If user already has category with this name, ID
+    of existing category is returned.
 
     Args:
         async_session (AsyncSession): asynchronous session for connection with db
@@ -67,15 +121,95 @@ async def add_category(
     Returns:
         int: category ID in database
     """
-    async_session.add(Category(category_name=category_name, user_id=user_id))
-    logger.info(f"Category {category_name} for user #{user_id} was added to db.")
-
-    req = select(Category).order_by(Category.category_id.desc()).limit(1)
-    result = await async_session.execute(req)
-    category_info = result.scalar_one()
+    added = await add_categories(async_session, user_id, [category_name])
+    if added:
+        return added[0][0]
+    category_info = await get_category_info(async_session, user_id, category_name)
     return category_info.category_id
 
 
+@traced
+async def add_categories(
+    async_session: AsyncSession, user_id: int, category_names: list[str]
+) -> list[tuple[int, str]]:
+    """
+    Add new categories to database: existing names are filtered by one query, the
+    rest are inserted by one multi-row INSERT. Names added concurrently are skipped
+    by ON CONFLICT.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in database
+        category_names (list[str]): unique names of categories
+
+    Returns:
+        list[tuple[int, str]]: IDs and names of added categories in order of names
+    """
+    if not category_names:
+        return []
+    result = await async_session.execute(
+        select(Category.category_name)
+        .where(Category.user_id == user_id)
+        .where(Category.category_name.in_(category_names))
+    )
+    existing_names = set(result.scalars())
+    new_names = [name for name in category_names if name not in existing_names]
+    if not new_names:
+        return []
+
+    result = await async_session.execute(
+        insert(Category)
+        .values(
+            [
+                {"user_id": user_id, "category_name": category_name}
+                for category_name in new_names
+            ]
+        )
+        .on_conflict_do_nothing()
+        .returning(Category.category_id, Category.category_name)
+    )
+    added_ids = {name: category_id for category_id, name in result.tuples()}
+    logger.info(
+        "%s of %s categories for user #%s were added to db.",
+        len(added_ids),
+        len(category_names),
+        user_id,
+    )
+    return [(added_ids[name], name) for name in new_names if name in added_ids]
+
+
+@traced
+async def delete_categories(
+    async_session: AsyncSession, user_id: int, category_ids: list[int]
+) -> list[str]:
+    """
+    Delete categories of user with their expenses and transactions by one statement,
+    dependent rows are deleted by ON DELETE CASCADE of database.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        category_ids (list[int]): IDs of categories
+
+    Returns:
+        list[str]: names of deleted categories
+    """
+    result = await async_session.execute(
+        delete(Category)
+        .where(Category.user_id == user_id)
+        .where(Category.category_id.in_(category_ids))
+        .returning(Category.category_name)
+    )
+    category_names = list(result.scalars())
+    if category_names:
+        await increment_data_version(async_session, user_id)
+    logger.info(
+        "%s categories of user #%s were deleted from db.", len(category_names), user_id
+    )
+    return category_names
+
+
+@traced
 async def get_category_info(
     async_session: AsyncSession,
     user_id: int,
@@ -102,12 +236,13 @@ async def get_category_info(
     result = await async_session.execute(req)
     try:
         category_info = result.scalar_one()
-        logger.info(f"Info for category {category_name} was got from db.")
+        logger.info("Info for category %s was got from db.", category_name)
         return category_info
     except NoResultFound:
-        logger.info(f"Info for category {category_name} wasn't found in db.")
+        logger.info("Info for category %s wasn't found in db.", category_name)
 
 
+@traced
 async def add_expense(
     async_session: AsyncSession,
     expense_name: str,
@@ -124,15 +259,15 @@ async def add_expense(
     Returns:
         int: new expense ID in database
     """
-    async_session.add(Expense(expense_name=expense_name, category_id=category_id))
-    logger.info(f"Expense {expense_name} was added to db.")
-
-    req = select(Expense).order_by(Expense.category_id.desc()).limit(1)
-    result = await async_session.execute(req)
-    expense_info = result.scalar_one()
-    return expense_info.expense_id
+    expense = Expense(expense_name=expense_name, category_id=category_id)
+    async_session.add(expense)
+    # ID of the new row is returned by INSERT itself
+    await async_session.flush()
+    logger.info("Expense %s was added to db.", expense_name)
+    return expense.expense_id
 
 
+@traced
 async def get_expense_info(
     async_session: AsyncSession, expense_name: str, category_id: int
 ) -> Optional[Expense]:
@@ -155,12 +290,13 @@ async def get_expense_info(
     result = await async_session.execute(req)
     try:
         expense_info = result.scalar_one()
-        logger.info(f"Info for expense {expense_name} was got from db.")
+        logger.info("Info for expense %s was got from db.", expense_name)
         return expense_info
     except NoResultFound:
-        logger.info(f"Info fro expense {expense_name} wasn't found in db.")
+        logger.info("Info fro expense %s wasn't found in db.", expense_name)
 
 
+@traced
 async def get_expense_category_info(
     async_session: AsyncSession, expense_name: str, user_id: int
 ) -> Optional[ExpenseCategory]:
@@ -186,40 +322,133 @@ async def get_expense_category_info(
     result = await async_session.execute(req)
     try:
         expense_id, category_id, category_name = result.all()[0]
-        logger.info(f"Info for expense {expense_name} was got from db.")
+        logger.info("Info for expense %s was got from db.", expense_name)
         return ExpenseCategory(expense_name, expense_id, category_name, category_id)
     except (NoResultFound, ValueError, IndexError):
-        logger.info(f"Info for expense {expense_name} wasn't found in db.")
+        logger.info("Info for expense %s wasn't found in db.", expense_name)
 
 
-async def get_all_user_categories(
+@traced
+async def get_user_expenses(
     async_session: AsyncSession, user_id: int
-) -> Optional[list[str]]:
+) -> list[ExpenseCategory]:
     """
-    Get all categories names for required user from database.
+    Get all expenses of user with their categories.
 
     Args:
         async_session (AsyncSession): asynchronous session for connection with db
         user_id (int): local user ID in db
 
     Returns:
-        list[str]: list of categories names for required user if existed else None
+        list[ExpenseCategory]: expenses ordered by ID
     """
-    req = select(Category).where(Category.user_id == user_id)
+    req = (
+        select(
+            Expense.expense_name,
+            Expense.expense_id,
+            Category.category_name,
+            Category.category_id,
+        )
+        .join(Expense.category)
+        .where(Category.user_id == user_id)
+        .order_by(Expense.expense_id)
+    )
     result = await async_session.execute(req)
+    expenses = [ExpenseCategory(*row) for row in result.all()]
+    logger.info("%s expenses for user #%s were found in db.", len(expenses), user_id)
+    return expenses
 
-    categories_lst = []
-    try:
-        for category_info in result.scalars().all():
-            categories_lst.append(category_info.category_name)
+
+@traced
+async def get_expense_usage(
+    async_session: AsyncSession, telegram_id: int
+) -> list[ExpenseUsage]:
+    """
+    Get expenses of user with number of their transactions and cost of the last
+    one. Expenses with the same name in different categories are joined.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        telegram_id (int): user ID in Telegram
+
+    Returns:
+        list[ExpenseUsage]: expenses with their usage
+    """
+    last_cost = func.array_agg(
+        aggregate_order_by(
+            Transaction.cost,
+            Transaction.created_date.desc(),
+            Transaction.transaction_id.desc(),
+        )
+    )[1]
+    req = (
+        select(Expense.expense_name, func.count(Transaction.transaction_id), last_cost)
+        .join(Expense.category)
+        .join(Category.user)
+        .outerjoin(Expense.transactions)
+        .where(User.telegram_id == telegram_id)
+        .group_by(Expense.expense_name)
+    )
+    result = await async_session.execute(req)
+    expenses = [ExpenseUsage(*row) for row in result.all()]
+    logger.info(
+        "Usage of %s expenses for user %s was got from db.", len(expenses), telegram_id
+    )
+    return expenses
+
+
+@traced
+async def get_user_categories(
+    async_session: AsyncSession, user_id: int
+) -> list[tuple[int, str]]:
+    """
+    Get IDs and names of all categories for required user from database.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+
+    Returns:
+        list[tuple[int, str]]: list of categories IDs and names ordered by ID
+    """
+    req = (
+        select(Category.category_id, Category.category_name)
+        .where(Category.user_id == user_id)
+        .order_by(Category.category_id)
+    )
+    result = await async_session.execute(req)
+    categories = [tuple(row) for row in result.all()]
+    logger.info(
+        "%s categories for user #%s were found in db.", len(categories), user_id
+    )
+    return categories
+
+
+@traced
+async def get_user_category(
+    async_session: AsyncSession, user_id: int, category_id: int
+) -> Optional[Category]:
+    """
+    Get category info by category ID if category belongs to required user.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        category_id (int): category ID in db
+
+    Returns:
+        Optional[Category]: instance of Category table class if category was found
+    """
+    category_info = await async_session.get(Category, category_id)
+    if category_info is None or category_info.user_id != user_id:
         logger.info(
-            f"{len(categories_lst)} categories for user #{user_id} were found in db."
+            "Category #%s for user #%s wasn't found in db.", category_id, user_id
         )
-    except NoResultFound:
-        logger.info(f"Noone category for user #{user_id} wasn't found ib db.")
-    return categories_lst
+        return None
+    return category_info
 
 
+@traced
 async def add_transaction(
     async_session: AsyncSession,
     user_id: int,
@@ -252,4 +481,167 @@ async def add_transaction(
             comment=comment,
         )
     )
-    logger.info(f"Transaction for user #{user_id} was added to db.")
+    await increment_data_version(async_session, user_id)
+    logger.info("Transaction for user #%s was added to db.", user_id)
+
+
+@traced
+async def increment_data_version(async_session: AsyncSession, user_id: int) -> None:
+    """
+    Mark transactions of user as changed, so cached results built from them are
+    invalidated. Version is incremented by database, concurrent changes aren't lost.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+    """
+    await async_session.execute(
+        update(User)
+        .where(User.user_id == user_id)
+        .values(data_version=User.data_version + 1)
+    )
+
+
+@traced
+async def set_category_limit(
+    async_session: AsyncSession,
+    user_id: int,
+    category_name: str,
+    monthly_limit: Optional[float],
+) -> bool:
+    """
+    Set monthly budget of user category.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        category_name (str): name of category
+        monthly_limit (Optional[float]): limit of expenses per month, None removes it
+
+    Returns:
+        bool: True if category was found
+    """
+    result = await async_session.execute(
+        update(Category)
+        .where(Category.user_id == user_id)
+        .where(Category.category_name == category_name)
+        .values(monthly_limit=monthly_limit)
+    )
+    logger.info(
+        "Monthly limit of category %s for user #%s was set to %s.",
+        category_name,
+        user_id,
+        monthly_limit,
+    )
+    return result.rowcount > 0
+
+
+@traced
+async def get_expense_budget(
+    async_session: AsyncSession, expense_id: int, month: date
+) -> Optional[CategoryBudget]:
+    """
+    Get budget of expense category and its running total for month. It is one row
+    read by primary keys, transactions aren't aggregated.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        expense_id (int): expense ID in db
+        month (date): any date of month
+
+    Returns:
+        Optional[CategoryBudget]: budget of category if category has monthly limit
+    """
+    req = (
+        select(
+            Category.category_name,
+            Category.monthly_limit,
+            func.coalesce(CategoryMonthTotal.total, 0),
+        )
+        .select_from(Expense)
+        .join(Expense.category)
+        .outerjoin(
+            CategoryMonthTotal,
+            and_(
+                CategoryMonthTotal.category_id == Category.category_id,
+                CategoryMonthTotal.month == month.replace(day=1),
+            ),
+        )
+        .where(Expense.expense_id == expense_id)
+        .where(Category.monthly_limit.is_not(None))
+    )
+    row = (await async_session.execute(req)).first()
+    if row is None:
+        return None
+    return CategoryBudget(*row)
+
+
+@traced
+async def get_user_budgets(
+    async_session: AsyncSession, user_id: int, month: date
+) -> list[CategoryBudget]:
+    """
+    Get budgets of all user categories with monthly limit and their totals for month.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        month (date): any date of month
+
+    Returns:
+        list[CategoryBudget]: budgets ordered by category name
+    """
+    req = (
+        select(
+            Category.category_name,
+            Category.monthly_limit,
+            func.coalesce(CategoryMonthTotal.total, 0),
+        )
+        .outerjoin(
+            CategoryMonthTotal,
+            and_(
+                CategoryMonthTotal.category_id == Category.category_id,
+                CategoryMonthTotal.month == month.replace(day=1),
+            ),
+        )
+        .where(Category.user_id == user_id)
+        .where(Category.monthly_limit.is_not(None))
+        .order_by(Category.category_name)
+    )
+    result = await async_session.execute(req)
+    budgets = [CategoryBudget(*row) for row in result.all()]
+    logger.info("%s budgets for user #%s were found in db.", len(budgets), user_id)
+    return budgets
+
+
+@traced
+async def get_meta(async_session: AsyncSession, key: str) -> Optional[str]:
+    """
+    Get value of bot deployment setting from database.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        key (str): name of setting
+
+    Returns:
+        Optional[str]: value of setting if it was set else None
+    """
+    return await async_session.scalar(select(BotMeta.value).where(BotMeta.key == key))
+
+
+@traced
+async def set_meta(async_session: AsyncSession, key: str, value: str) -> None:
+    """
+    Set value of bot deployment setting in database.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        key (str): name of setting
+        value (str): new value of setting
+    """
+    await async_session.execute(
+        insert(BotMeta)
+        .values(key=key, value=value)
+        .on_conflict_do_update(index_elements=[BotMeta.key], set_={"value": value})
+    )
+    logger.info("Setting %s was set to %s.", key, value)
@@ -0,0 +1,115 @@
+import logging
+from datetime import date
+from typing import Optional
+
+from sqlalchemy import ColumnElement, func, literal_column, or_, select, tuple_, union
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.db_models import Category, Expense, SearchResult, Transaction
+from bot.monitoring.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Configuration is inlined, expression must match index of db_migrations.py
+SEARCH_CONFIG = literal_column("'russian'::regconfig")
+# Words matched by text search in any form are marked by ts_headline, marks are
+# replaced by HTML tags after text is escaped
+HIGHLIGHT_START = "\x02"
+HIGHLIGHT_STOP = "\x03"
+HEADLINE_OPTIONS = (
+    f"StartSel={HIGHLIGHT_START}, StopSel={HIGHLIGHT_STOP}, HighlightAll=true"
+)
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _text_match(column, query: str) -> ColumnElement[bool]:
+    """Condition which can be served by trigram or text search index of column."""
+    return or_(
+        column.ilike(f"%{_escape_like(query)}%", escape="\\"),
+        func.to_tsvector(SEARCH_CONFIG, column).bool_op("@@")(
+            func.plainto_tsquery(SEARCH_CONFIG, query)
+        ),
+    )
+
+
+def _headline(column, query: str):
+    """Text of column with marked words of query, whole text is returned."""
+    return func.ts_headline(
+        SEARCH_CONFIG,
+        column,
+        func.plainto_tsquery(SEARCH_CONFIG, query),
+        HEADLINE_OPTIONS,
+    )
+
+
+@traced
+async def search_transactions(
+    async_session: AsyncSession,
+    user_id: int,
+    query: str,
+    page_size: int,
+    before: Optional[tuple[date, int]] = None,
+) -> list[SearchResult]:
+    """
+    Search user transactions by expense name and comment. Names and comments are
+    matched by substring and by words in any form, matched transactions are
+    collected by union of two indexed queries instead of OR over joined tables.
+    Pages are read by keyset: transactions before the last shown one. Words found
+    by text search are marked in names and comments of the page by ts_headline.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        query (str): text to search
+        page_size (int): maximum number of transactions
+        before (Optional[tuple[date, int]]): date and ID of the last transaction of
+            the previous page
+
+    Returns:
+        list[SearchResult]: transactions ordered by date and ID descending, names
+            and comments contain HIGHLIGHT_START and HIGHLIGHT_STOP marks
+    """
+    user_expenses = (
+        select(Expense.expense_id)
+        .join(Expense.category)
+        .where(Category.user_id == user_id)
+    )
+    matched = union(
+        select(Transaction.transaction_id).where(
+            Transaction.expense_id.in_(
+                user_expenses.where(_text_match(Expense.expense_name, query))
+            )
+        ),
+        select(Transaction.transaction_id)
+        .where(_text_match(Transaction.comment, query))
+        .where(Transaction.expense_id.in_(user_expenses)),
+    ).subquery("matched")
+
+    req = (
+        select(
+            Transaction.transaction_id,
+            Transaction.created_date,
+            _headline(Expense.expense_name, query),
+            Transaction.cost,
+            Transaction.amount,
+            _headline(Transaction.comment, query),
+        )
+        .join(matched, matched.c.transaction_id == Transaction.transaction_id)
+        .join(Transaction.expense)
+        .order_by(Transaction.created_date.desc(), Transaction.transaction_id.desc())
+        .limit(page_size)
+    )
+    if before is not None:
+        req = req.where(
+            tuple_(Transaction.created_date, Transaction.transaction_id)
+            < tuple_(*before)
+        )
+    result = await async_session.execute(req)
+    transactions = [SearchResult(*row) for row in result.all()]
+    logger.info(
+        "%s transactions of user #%s were found in db.", len(transactions), user_id
+    )
+    return transactions
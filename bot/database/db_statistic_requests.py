@@ -0,0 +1,126 @@
+import logging
+from datetime import date
+
+from sqlalchemy import Integer, func, literal_column, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from bot.database.db_models import (
+    Category,
+    Expense,
+    Transaction,
+    TransactionHistory,
+)
+from bot.monitoring.tracing import traced
+
+logger = logging.getLogger(__name__)
+
+# Total spent on transaction: cost of one item multiplied by amount
+TRANSACTION_TOTAL = Transaction.cost * Transaction.amount
+# Difference of dates in Postgres is number of days
+UNIX_EPOCH = literal_column("DATE '1970-01-01'")
+
+
+@traced
+async def get_category_totals(
+    async_session: AsyncSession, user_id: int, start_date: date
+) -> list[tuple[str, float]]:
+    """
+    Get sums of user transactions by category since required date. Sums are
+    calculated by database in one query.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        start_date (date): first date of period
+
+    Returns:
+        list[tuple[str, float]]: categories names and sums ordered by sum descending
+    """
+    total = func.sum(TRANSACTION_TOTAL).label("total")
+    req = (
+        select(Category.category_name, total)
+        .join(Category.expenses)
+        .join(Expense.transactions)
+        .where(Category.user_id == user_id)
+        .where(Transaction.created_date >= start_date)
+        .group_by(Category.category_id, Category.category_name)
+        .order_by(total.desc())
+    )
+    result = await async_session.execute(req)
+    totals = [(category_name, float(total)) for category_name, total in result.all()]
+    logger.info(
+        "Totals of %s categories for user #%s were got from db.", len(totals), user_id
+    )
+    return totals
+
+
+@traced
+async def get_monthly_totals(
+    async_session: AsyncSession, user_id: int, start_date: date
+) -> list[tuple[date, float]]:
+    """
+    Get sums of user transactions by month since required date. Months without
+    transactions are absent.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        start_date (date): first date of period
+
+    Returns:
+        list[tuple[date, float]]: first days of months and sums ordered by month
+    """
+    month = func.date_trunc("month", Transaction.created_date).label("month")
+    req = (
+        select(month, func.sum(TRANSACTION_TOTAL))
+        .join(Transaction.expense)
+        .join(Expense.category)
+        .where(Category.user_id == user_id)
+        .where(Transaction.created_date >= start_date)
+        .group_by(month)
+        .order_by(month)
+    )
+    result = await async_session.execute(req)
+    totals = [(month.date(), float(total)) for month, total in result.all()]
+    logger.info(
+        "Totals of %s months for user #%s were got from db.", len(totals), user_id
+    )
+    return totals
+
+
+@traced
+async def get_transaction_history(
+    async_session: AsyncSession, user_id: int, start_date: date
+) -> TransactionHistory:
+    """
+    Get user transactions since required date in columns, so they can be loaded to
+    arrays without conversion of rows to objects.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        start_date (date): first date of period
+
+    Returns:
+        TransactionHistory: days, category IDs, expense names and totals of
+            transactions ordered by date
+    """
+    req = (
+        select(
+            type_coerce(Transaction.created_date - UNIX_EPOCH, Integer),
+            Expense.category_id,
+            Expense.expense_name,
+            TRANSACTION_TOTAL,
+        )
+        .join(Transaction.expense)
+        .join(Expense.category)
+        .where(Category.user_id == user_id)
+        .where(Transaction.created_date >= start_date)
+        .order_by(Transaction.created_date)
+    )
+    result = await async_session.execute(req)
+    columns = list(zip(*result.tuples())) or [[], [], [], []]
+    logger.info(
+        "%s transactions of user #%s were got from db.", len(columns[0]), user_id
+    )
+    return TransactionHistory(*(list(column) for column in columns))
@@ -1,72 +1,91 @@
-import re
 from datetime import date
 from typing import Literal
 
 from aiogram.filters import BaseFilter
 from aiogram.types import Message
 
+from bot.filters.parser import (
+    parse_amount,
+    parse_comment,
+    parse_cost,
+    parse_date,
+    parse_name,
+    parse_transaction,
+)
+
 
 class IsCorrectTransaction(BaseFilter):
-    async def __call__(
-        self, message: Message
-    ) -> bool | dict[Literal["expense_name", "cost"], str | float]:
-        transaction_pattern = r"[\w+\s]+?\d+[.,]?\d*?"
-        if re.fullmatch(transaction_pattern, message.text):
-            *expense_name, cost = message.text.split()
-            cost = float(cost.replace(",", "."))
-            transaction = {
-                "expense_name": " ".join(expense_name).capitalize(),
-                "cost": cost,
+    async def __call__(self, message: Message) -> (
+        bool
+        | dict[
+            Literal[
+                "expense_name",
+                "cost",
+                "amount",
+                "created_date",
+                "comment",
+                "ambiguous_cost",
+            ],
+            str | float | int | date | bool | None,
+        ]
+    ):
+        today = date.today()
+        transaction = parse_transaction(message.text or "", today)
+        if transaction:
+            return {
+                "expense_name": transaction.expense_name,
+                "cost": transaction.cost,
+                "amount": transaction.amount,
+                "created_date": transaction.created_date or today,
+                "comment": transaction.comment,
+                "ambiguous_cost": transaction.ambiguous_cost,
             }
-            return transaction
         return False
 
 
 class IsCorrectCategoryName(BaseFilter):
     async def __call__(self, message: Message) -> dict[Literal["category_name"], str]:
-        category_pattern = r"[\w+\s]+"
-        if re.fullmatch(category_pattern, message.text) and len(message.text) < 50:
-            return {"category_name": message.text.strip().capitalize()}
+        category_name = parse_name(message.text or "")
+        if category_name:
+            return {"category_name": category_name}
         return False
 
 
 class IsCorrectExpenseNameFilter(BaseFilter):
     async def __call__(self, message: Message) -> dict[Literal["expense_name"], str]:
-        expense_name_pattern = r"[\w+\s]+"
-        if re.fullmatch(expense_name_pattern, message.text) and len(message.text) < 50:
-            return {"expense_name": message.text.strip().capitalize()}
+        expense_name = parse_name(message.text or "")
+        if expense_name:
+            return {"expense_name": expense_name}
         return False
 
 
 class IsCorrectCostFilter(BaseFilter):
     async def __call__(self, message: Message) -> dict[Literal["cost"], float]:
-        try:
-            cost = float(message.text.replace(",", "."))
+        cost = parse_cost(message.text or "")
+        if cost is not None and cost > 0:
             return {"cost": cost}
-        except:
-            pass
         return False
 
 
 class IsCorrectAmountFilter(BaseFilter):
     async def __call__(self, message: Message) -> dict[Literal["amount"], int]:
-        if message.text.isdigit():
-            return {"amount": int(message.text)}
+        amount = parse_amount(message.text or "")
+        if amount:
+            return {"amount": amount}
         return False
 
 
 class IsCorrectCreatedDateFilter(BaseFilter):
     async def __call__(self, message: Message) -> dict[Literal["created_date"] : date]:
-        try:
-            day, month, year = message.text.replace("-", ".").split(".")
-            return {"created_date": date(int(year), int(month), int(day))}
-        except:
-            pass
+        created_date = parse_date(message.text or "")
+        if created_date:
+            return {"created_date": created_date}
         return False
 
 
 class IsCorrectComment(BaseFilter):
     async def __call__(self, message: Message) -> dict[Literal["comment"] : str]:
-        if len(message.text) < 50:
-            return {"comment": message.text}
+        comment = parse_comment(message.text or "")
+        if comment:
+            return {"comment": comment}
         return False
@@ -0,0 +1,368 @@
+"""Single-pass parsers of user input: names, costs, amounts, dates and transactions.
+
+Every function is linear in length of input and never raises on arbitrary text,
+incorrect input is reported by None.
+"""
+
+import re
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional
+
+MAX_NAME_LENGTH = 50
+MAX_COMMENT_LENGTH = 50
+MAX_AMOUNT_DIGITS = 6
+MAX_COST_LENGTH = 32
+# Cents or kopecks, "1,234" is ambiguous and isn't parsed as 1.234
+MAX_COST_FRACTION_DIGITS = 2
+MAX_NAMES_NUMBER = 50
+
+# Single character class without nested quantifiers can't backtrack
+_NAME_RE = re.compile(r"[\w+\s]+")
+_NAMES_SEPARATOR_RE = re.compile(r"[,;\n]")
+
+DIGITS = frozenset("0123456789")
+DECIMAL_SEPARATORS = frozenset(".,")
+THOUSANDS_SEPARATORS = frozenset(" '_\u00a0\u202f")
+CURRENCY_SYMBOLS = frozenset("₽$€£¥₸₴")
+CURRENCY_WORDS = frozenset(("р", "р.", "руб", "руб.", "rub", "usd", "eur"))
+DATE_SEPARATORS = frozenset(".-/")
+# Latin "x", cyrillic "х" and "*" can be used as amount prefix: "x2"
+AMOUNT_PREFIXES = frozenset("xх*")
+DATE_PREFIX = "@"
+COMMENT_PREFIX = "#"
+# Words of period of recurring transaction
+RECURRING_PERIODS = {
+    "день": "day",
+    "ежедневно": "day",
+    "неделя": "week",
+    "еженедельно": "week",
+    "месяц": "month",
+    "ежемесячно": "month",
+}
+
+
+@dataclass(slots=True, frozen=True)
+class ParsedTransaction:
+    expense_name: str
+    cost: float
+    amount: int = 1
+    created_date: Optional[date] = None
+    comment: Optional[str] = None
+    ambiguous_cost: bool = False
+
+
+def parse_name(text: str) -> Optional[str]:
+    """Parse name of expense or category: letters, digits and spaces, less than 50
+    symbols. Whitespaces are collapsed and the first letter is capitalized.
+
+    Args:
+        text (str): text from user
+
+    Returns:
+        Optional[str]: normalized name if text is correct name else None
+    """
+    if len(text) >= MAX_NAME_LENGTH or not _NAME_RE.fullmatch(text):
+        return None
+    name = " ".join(text.split())
+    return name.capitalize() if name else None
+
+
+def parse_names(text: str) -> Optional[tuple[list[str], list[str]]]:
+    """Parse list of names separated by commas, semicolons or new lines, e.g.
+    "Еда, транспорт\nЖильё". Names are normalized by parse_name, repeated names are
+    kept once in order of input.
+
+    Args:
+        text (str): text from user
+
+    Returns:
+        Optional[tuple[list[str], list[str]]]: correct unique names and incorrect
+            parts of text, None if text is empty or has more than MAX_NAMES_NUMBER
+            names
+    """
+    parts = [part.strip() for part in _NAMES_SEPARATOR_RE.split(text)]
+    parts = [part for part in parts if part]
+    if not parts or len(parts) > MAX_NAMES_NUMBER:
+        return None
+    names: dict[str, None] = {}
+    incorrect = []
+    for part in parts:
+        name = parse_name(part)
+        if name is None:
+            incorrect.append(part)
+        else:
+            names[name] = None
+    return list(names), incorrect
+
+
+def _strip_currency(text: str) -> str:
+    if text[0] in CURRENCY_SYMBOLS:
+        text = text[1:].lstrip()
+    elif text[-1] in CURRENCY_SYMBOLS:
+        text = text[:-1].rstrip()
+    else:
+        head, _, tail = text.rpartition(" ")
+        if head and tail.lower() in CURRENCY_WORDS:
+            text = head.rstrip()
+    return text
+
+
+def parse_cost(text: str) -> Optional[float]:
+    """Parse cost in one pass. Cost can have currency symbol or word, thousands
+    separators (space, apostrophe, underscore or repeated dot/comma between groups of
+    three digits) and one decimal separator (dot or comma) with at most two digits
+    after it. Single separator before three digits ("1,234") is ambiguous and isn't
+    parsed.
+
+    Examples: "199", "78,5", "1 500", "1'500.50", "1.234,5 руб", "₽250".
+
+    Args:
+        text (str): text from user
+
+    Returns:
+        Optional[float]: cost if text is correct cost else None
+    """
+    text = text.strip()
+    if not text or len(text) > MAX_COST_LENGTH:
+        return None
+    if text[0] not in DIGITS or text[-1] not in DIGITS:
+        text = _strip_currency(text)
+        if not text:
+            return None
+    # Fast path for the most common formats: "199" and "78,5"
+    integer, _, fraction = text.replace(",", ".").partition(".")
+    if text.isascii() and integer.isdigit() and (not fraction or fraction.isdigit()):
+        if len(fraction) > MAX_COST_FRACTION_DIGITS:
+            return None
+        return float(integer + "." + (fraction or "0"))
+    if text[0] not in DIGITS or text[-1] not in DIGITS:
+        return None
+
+    groups = []
+    separators = []
+    group_start = 0
+    for i, char in enumerate(text):
+        if char in DIGITS:
+            continue
+        if char not in DECIMAL_SEPARATORS and char not in THOUSANDS_SEPARATORS:
+            return None
+        if i == group_start:
+            return None
+        groups.append(text[group_start:i])
+        separators.append(char)
+        group_start = i + 1
+    groups.append(text[group_start:])
+
+    fraction = ""
+    if separators and separators[-1] in DECIMAL_SEPARATORS:
+        if separators.count(separators[-1]) == 1:
+            fraction = groups.pop()
+            separators.pop()
+            if len(fraction) > MAX_COST_FRACTION_DIGITS:
+                return None
+
+    if separators:
+        if len(set(separators)) != 1 or len(groups[0]) > 3:
+            return None
+        if any(len(group) != 3 for group in groups[1:]):
+            return None
+
+    return float("".join(groups) + "." + (fraction or "0"))
+
+
+def parse_amount(text: str) -> Optional[int]:
+    """Parse amount of expense: positive integer.
+
+    Args:
+        text (str): text from user
+
+    Returns:
+        Optional[int]: amount if text is correct amount else None
+    """
+    text = text.strip()
+    if not text or len(text) > MAX_AMOUNT_DIGITS:
+        return None
+    if not (text.isascii() and text.isdigit()):
+        return None
+    amount = int(text)
+    return amount if amount > 0 else None
+
+
+def parse_date(text: str, default_year: Optional[int] = None) -> Optional[date]:
+    """Parse date in format dd.mm.yyyy, dd-mm-yyyy or dd/mm/yyyy. Year can be omitted if
+    default year is passed and can be passed with two digits.
+
+    Args:
+        text (str): text from user
+        default_year (Optional[int]): year for date without year
+
+    Returns:
+        Optional[date]: date if text is correct date else None
+    """
+    text = text.strip()
+    if not text or len(text) > 10:
+        return None
+
+    parts = []
+    part_start = 0
+    for i, char in enumerate(text):
+        if char in DIGITS:
+            continue
+        if char not in DATE_SEPARATORS:
+            return None
+        parts.append(text[part_start:i])
+        part_start = i + 1
+    parts.append(text[part_start:])
+
+    if len(parts) == 2 and default_year is not None:
+        parts.append(str(default_year))
+    if len(parts) != 3:
+        return None
+
+    day, month, year = parts
+    if not (1 <= len(day) <= 2 and 1 <= len(month) <= 2 and len(year) in (2, 4)):
+        return None
+    try:
+        return date(int(year) + (2000 if len(year) == 2 else 0), int(month), int(day))
+    except ValueError:
+        return None
+
+
+def parse_comment(text: str) -> Optional[str]:
+    """Parse comment for expense: any text less than 50 symbols.
+
+    Args:
+        text (str): text from user
+
+    Returns:
+        Optional[str]: comment if text is correct comment else None
+    """
+    comment = text.strip()
+    if not comment or len(comment) >= MAX_COMMENT_LENGTH:
+        return None
+    return comment
+
+
+def _is_thousands_split(name_token: str, cost_token: str) -> bool:
+    """Whether name ends with number which can be thousands of cost split by space."""
+    if not (len(name_token) <= 3 and name_token.isascii() and name_token.isdigit()):
+        return False
+    # Exactly three digits: "500", "500,50" or "500₽"
+    group = cost_token[:4]
+    return (
+        len(group) >= 3
+        and all(char in DIGITS for char in group[:3])
+        and group[3:] not in DIGITS
+    )
+
+
+def parse_transaction(
+    text: str, today: Optional[date] = None
+) -> Optional[ParsedTransaction]:
+    """Parse transaction in format "<expense name> <cost> [x<amount>] [@<date>]
+    [#<comment>]", e.g. "Молоко 78", "Кофе с собой 199,5 руб" or
+    "Кофе 150 x2 @12.05 #с друзьями". Amount and date can follow cost in any order,
+    comment is everything after "#". Cost has to be positive and is the last number,
+    so "Бензин 95 600" is "Бензин 95" for 600. Name ending with number can be
+    thousands of cost split by space ("Кофе 1 500"), such transaction is marked with
+    ambiguous_cost to be confirmed by user.
+
+    Args:
+        text (str): text from user
+        today (Optional[date]): current date, its year is used for date without year
+
+    Returns:
+        Optional[ParsedTransaction]: transaction data if text is correct transaction
+            else None
+    """
+    text, comment_prefix, comment_text = text.partition(COMMENT_PREFIX)
+    comment = None
+    if comment_prefix:
+        comment = parse_comment(comment_text)
+        if comment is None:
+            return None
+
+    tokens = text.split()
+    amount = None
+    created_date = None
+    while len(tokens) > 2:
+        token = tokens[-1]
+        if token[0] in AMOUNT_PREFIXES and amount is None:
+            amount = parse_amount(token[1:])
+            if amount is None:
+                break
+        elif token[0] == DATE_PREFIX and created_date is None:
+            created_date = parse_date(token[1:], today.year if today else None)
+            if created_date is None:
+                return None
+        else:
+            break
+        tokens.pop()
+
+    if len(tokens) > 2 and (
+        tokens[-1].lower() in CURRENCY_WORDS or tokens[-1] in CURRENCY_SYMBOLS
+    ):
+        tokens.pop()
+    if len(tokens) < 2:
+        return None
+
+    cost = parse_cost(tokens[-1])
+    if cost is None or cost <= 0:
+        return None
+    ambiguous_cost = _is_thousands_split(tokens[-2], tokens[-1])
+    if ambiguous_cost and len(tokens) == 2:
+        # Name can't be told from thousands of cost: "1 500"
+        return None
+    expense_name = parse_name(" ".join(tokens[:-1]))
+    if expense_name is None:
+        return None
+    return ParsedTransaction(
+        expense_name, cost, amount or 1, created_date, comment, ambiguous_cost
+    )
+
+
+def parse_budget(text: str) -> Optional[tuple[str, float]]:
+    """Parse monthly budget of category in format "<category name> <limit>", e.g.
+    "Продукты 15000". Limit 0 means that budget is removed.
+
+    Args:
+        text (str): text from user
+
+    Returns:
+        Optional[tuple[str, float]]: category name and limit if text is correct
+            budget else None
+    """
+    name_text, _, limit_text = text.strip().rpartition(" ")
+    limit = parse_cost(limit_text)
+    if limit is None:
+        return None
+    category_name = parse_name(name_text)
+    if category_name is None:
+        return None
+    return category_name, limit
+
+
+def parse_recurring(
+    text: str, today: Optional[date] = None
+) -> Optional[tuple[str, ParsedTransaction]]:
+    """Parse recurring transaction in format "<period> <transaction>", e.g.
+    "месяц Аренда 30000 @01.11". Date of transaction is the date of the first
+    posting.
+
+    Args:
+        text (str): text from user
+        today (Optional[date]): current date, its year is used for date without year
+
+    Returns:
+        Optional[tuple[str, ParsedTransaction]]: period (day, week, month) and
+            transaction data if text is correct recurring transaction else None
+    """
+    period_text, _, transaction_text = text.strip().partition(" ")
+    period = RECURRING_PERIODS.get(period_text.lower())
+    if period is None:
+        return None
+    transaction = parse_transaction(transaction_text, today)
+    if transaction is None:
+        return None
+    return period, transaction
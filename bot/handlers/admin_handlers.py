@@ -0,0 +1,50 @@
+import logging
+
+from aiogram import F, Router
+from aiogram.filters import Command, CommandObject
+from aiogram.types import Message
+
+from bot.config_data.configreader import config
+from bot.lexicon.catalog import Translator
+from bot.monitoring.profiler import (
+    DEFAULT_PROFILE_SECONDS,
+    DEFAULT_PROFILE_UPDATES,
+    SamplingProfiler,
+)
+
+router = Router(name="admin")
+router.message.filter(F.from_user.id.in_(config.admin_ids))
+logger = logging.getLogger(__name__)
+
+
+@router.message(Command("profile"))
+async def process_profile_command(
+    message: Message,
+    i18n: Translator,
+    command: CommandObject,
+    profiler: SamplingProfiler,
+):
+    """Handler to turn on sampling profiler for next updates. Command format:
+    /profile [number of updates] [seconds].
+
+    Args:
+        message (Message): update with command from admin
+        i18n (Translator): lexicon depends on user language settings
+        command (CommandObject): parsed command with arguments
+        profiler (SamplingProfiler): profiler of event loop thread
+    """
+    args = (command.args or "").split()
+    if len(args) > 2 or not all(arg.isdigit() and int(arg) > 0 for arg in args):
+        await message.answer(text=i18n["profiler_incorrect_args"])
+        return
+
+    max_updates = int(args[0]) if args else DEFAULT_PROFILE_UPDATES
+    max_seconds = int(args[1]) if len(args) > 1 else DEFAULT_PROFILE_SECONDS
+    if not profiler.start(max_updates, max_seconds):
+        await message.answer(text=i18n["profiler_running"])
+        return
+
+    logger.info("Admin %s started profiler.", message.from_user.id)
+    await message.answer(
+        text=i18n.format("profiler_started", updates=max_updates, seconds=max_seconds)
+    )
@@ -0,0 +1,94 @@
+import logging
+from datetime import date
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject, StateFilter
+from aiogram.fsm.state import default_state
+from aiogram.types import Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bot.database.db_requests as db
+from bot.filters.parser import parse_budget
+from bot.lexicon.catalog import Translator
+
+router = Router(name="budget")
+logger = logging.getLogger(__name__)
+
+
+@router.message(Command("set_budget"), StateFilter(default_state))
+async def process_set_budget_command(
+    message: Message,
+    i18n: Translator,
+    command: CommandObject,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to set monthly budget of category. Command format:
+    /set_budget <category name> <limit>, limit 0 removes budget.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        command (CommandObject): parsed command with arguments
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    budget = parse_budget(command.args or "")
+    if budget is None:
+        await message.answer(text=i18n["budget_incorrect_format"])
+        return
+
+    category_name, monthly_limit = budget
+    category_found = await db.set_category_limit(
+        async_session, local_user_id, category_name, monthly_limit or None
+    )
+    if not category_found:
+        await message.answer(
+            text=i18n.format("budget_category_not_found", category_name=category_name)
+        )
+        return
+
+    await async_session.commit()
+    logger.info("User %s set budget of category.", message.from_user.id)
+    if monthly_limit:
+        text = i18n.format(
+            "budget_set", category_name=category_name, monthly_limit=monthly_limit
+        )
+    else:
+        text = i18n.format("budget_removed", category_name=category_name)
+    await message.answer(text=text)
+
+
+@router.message(Command("budgets"))
+async def process_budgets_command(
+    message: Message,
+    i18n: Translator,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to show budgets of user categories and their totals for current month.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    logger.info("User %s sent /budgets command.", message.from_user.id)
+    budgets = await db.get_user_budgets(async_session, local_user_id, date.today())
+    if not budgets:
+        await message.answer(text=i18n["budgets_empty"])
+        return
+
+    lines = [i18n["budgets_header"]]
+    lines.extend(
+        i18n.format(
+            "budgets_item",
+            category_name=budget.category_name,
+            total=round(budget.total, 2),
+            monthly_limit=round(budget.monthly_limit, 2),
+            percent=round(budget.total / budget.monthly_limit * 100),
+        )
+        for budget in budgets
+    )
+    await message.answer(text="\n".join(lines))
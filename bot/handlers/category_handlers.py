@@ -0,0 +1,211 @@
+import html
+import logging
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject, StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import default_state
+from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bot.database.db_requests as db
+from bot.filters.parser import parse_names
+from bot.handlers.transactions_handlers import get_user_categories
+from bot.keyboards.cbdata import DeleteAction, DeleteCallbackFactory
+from bot.keyboards.kb_cache import categories_keyboards
+from bot.keyboards.kb_users import (
+    create_delete_categories_keyboard,
+    create_delete_confirm_keyboard,
+)
+from bot.lexicon.catalog import Translator
+from bot.services.autocomplete import prefix_indexes
+from bot.services.expense_index import expense_indexes
+
+router = Router(name="categories")
+logger = logging.getLogger(__name__)
+
+
+def invalidate_user_caches(local_user_id: int, telegram_id: int) -> None:
+    """Drop cached categories and expenses of user after they were deleted.
+
+    Args:
+        local_user_id (int): local user ID in db
+        telegram_id (int): user Telegram ID
+    """
+    categories_keyboards.invalidate(local_user_id)
+    expense_indexes.invalidate(local_user_id)
+    prefix_indexes.invalidate(telegram_id)
+
+
+@router.message(Command("add_categories"), StateFilter(default_state))
+async def process_add_categories_command(
+    message: Message,
+    i18n: Translator,
+    command: CommandObject,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to add several categories by one message. Command format:
+    /add_categories <name>, <name>, ... Names can be separated by commas, semicolons
+    or new lines, all new categories are added by one statement.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        command (CommandObject): parsed command with arguments
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    parsed = parse_names(command.args or "")
+    if parsed is None:
+        await message.answer(text=i18n["add_categories_incorrect_format"])
+        return
+
+    category_names, incorrect_names = parsed
+    added = await db.add_categories(async_session, local_user_id, category_names)
+    await async_session.commit()
+    if added:
+        categories_keyboards.invalidate(local_user_id)
+    logger.info("User %s added %s categories.", message.from_user.id, len(added))
+
+    added_names = [category_name for _, category_name in added]
+    existing_names = [name for name in category_names if name not in added_names]
+    lines = []
+    if added_names:
+        lines.append(
+            i18n.format("add_categories_added", category_names=", ".join(added_names))
+        )
+    if existing_names:
+        lines.append(
+            i18n.format(
+                "add_categories_existing", category_names=", ".join(existing_names)
+            )
+        )
+    if incorrect_names:
+        lines.append(
+            i18n.format(
+                "add_categories_incorrect",
+                category_names=html.escape(", ".join(incorrect_names)),
+            )
+        )
+    await message.answer(text="\n".join(lines))
+
+
+@router.message(Command("del_categories"), StateFilter(default_state))
+async def process_del_categories_command(
+    message: Message,
+    i18n: Translator,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to show user categories to choose category to delete.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    logger.info("User %s sent /del_categories command.", message.from_user.id)
+    user_categories = await get_user_categories(async_session, local_user_id)
+    if not user_categories.categories:
+        await message.answer(text=i18n["delete_categories_empty"])
+        return
+
+    await message.answer(
+        text=i18n["delete_choose_category"],
+        reply_markup=create_delete_categories_keyboard(
+            user_categories.categories,
+            0,
+            i18n["categories_previous_page"],
+            i18n["categories_next_page"],
+        ),
+    )
+
+
+@router.message(Command("delete_account"), StateFilter(default_state))
+async def process_delete_account_command(message: Message, i18n: Translator):
+    """Handler to ask confirmation of deletion of user account with all data.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+    """
+    logger.info("User %s sent /delete_account command.", message.from_user.id)
+    await message.answer(
+        text=i18n["delete_account_confirm"],
+        reply_markup=create_delete_confirm_keyboard(
+            i18n["delete_confirm_button"], i18n["delete_cancel_button"]
+        ),
+    )
+
+
+@router.callback_query(DeleteCallbackFactory.filter())
+async def process_delete(
+    callback: CallbackQuery,
+    callback_data: DeleteCallbackFactory,
+    i18n: Translator,
+    async_session: AsyncSession,
+    local_user_id: int,
+    state: FSMContext,
+):
+    """Handler of deletion keyboards: switch page of categories, ask confirmation of
+    deletion of chosen category, delete category or account or cancel deletion.
+    Category and account are deleted by one statement with all dependent rows.
+
+    Args:
+        callback (CallbackQuery): update with callback of deletion keyboard
+        callback_data (DeleteCallbackFactory): unpacked callback data
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+        state (FSMContext): Finite State Machine for user
+    """
+    telegram_id = callback.from_user.id
+    await callback.answer()
+    if callback_data.action == DeleteAction.PAGE:
+        user_categories = await get_user_categories(async_session, local_user_id)
+        await callback.message.edit_reply_markup(
+            reply_markup=create_delete_categories_keyboard(
+                user_categories.categories,
+                callback_data.page,
+                i18n["categories_previous_page"],
+                i18n["categories_next_page"],
+            )
+        )
+    elif callback_data.action == DeleteAction.CHOOSE:
+        user_categories = await get_user_categories(async_session, local_user_id)
+        category_name = user_categories.names.get(callback_data.category_id)
+        if category_name is None:
+            await callback.message.edit_text(text=i18n["delete_category_not_found"])
+            return
+        await callback.message.edit_text(
+            text=i18n.format("delete_category_confirm", category_name=category_name),
+            reply_markup=create_delete_confirm_keyboard(
+                i18n["delete_confirm_button"],
+                i18n["delete_cancel_button"],
+                callback_data.category_id,
+            ),
+        )
+    elif callback_data.action == DeleteAction.CONFIRM:
+        category_names = await db.delete_categories(
+            async_session, local_user_id, [callback_data.category_id]
+        )
+        await async_session.commit()
+        invalidate_user_caches(local_user_id, telegram_id)
+        if not category_names:
+            await callback.message.edit_text(text=i18n["delete_category_not_found"])
+            return
+        logger.info("User %s deleted category.", telegram_id)
+        await callback.message.edit_text(
+            text=i18n.format("delete_category_done", category_name=category_names[0])
+        )
+    elif callback_data.action == DeleteAction.ACCOUNT:
+        await db.delete_user(async_session, telegram_id)
+        await async_session.commit()
+        invalidate_user_caches(local_user_id, telegram_id)
+        await state.clear()
+        logger.info("User %s deleted account.", telegram_id)
+        await callback.message.edit_text(text=i18n["delete_account_done"])
+    else:
+        await callback.message.edit_text(text=i18n["delete_cancelled"])
@@ -16,6 +16,7 @@ from bot.filters.filters import (
 )
 from bot.handlers.command_handlers import FSMAddTransaction
 from bot.keyboards.kb_users import create_confirm_transaction_keyboard
+from bot.lexicon.catalog import Translator
 
 
 class FSMChangeTransaction(StatesGroup):
@@ -27,7 +28,7 @@ class FSMChangeTransaction(StatesGroup):
     change_comment = State()
 
 
-router = Router()
+router = Router(name="change_transaction")
 logger = logging.getLogger(__name__)
 
 
@@ -35,19 +36,22 @@ logger = logging.getLogger(__name__)
     StateFilter(FSMChangeTransaction.change_expense_name), IsCorrectExpenseNameFilter()
 )
 async def process_change_expense_name_transaction(
-    message: Message, i18n: dict[str, str], expense_name: str, state: FSMContext
+    message: Message, i18n: Translator, expense_name: str, state: FSMContext
 ):
     await state.update_data(expense_name=expense_name)
     logger.debug("Expense name is corrected.")
     transaction_data = await state.get_data()
     await state.set_state(FSMAddTransaction.confirm_transaction)
     await message.answer(
-        text=i18n["transaction_info"].format(
+        text=i18n.format(
+            "transaction_info",
             expense_name=transaction_data["expense_name"],
             category_name=transaction_data["category_name"],
             cost=transaction_data["cost"],
             amount=transaction_data["amount"],
-            created_date=transaction_data["created_date"],
+            created_date=date.fromisoformat(transaction_data["created_date"]).strftime(
+                "%d.%m.%Y"
+            ),
             comment=(
                 transaction_data["comment"]
                 if transaction_data["comment"]
@@ -64,7 +68,7 @@ async def process_change_expense_name_transaction(
 
 @router.message(StateFilter(FSMChangeTransaction.change_expense_name))
 async def process_change_incorrect_expense_name_transaction(
-    message: Message, i18n: dict[str, str]
+    message: Message, i18n: Translator
 ):
     logger.debug("Expense name has incorrect format.")
     await message.answer(text=i18n["transaction_incorrect_expense_name"])
@@ -72,19 +76,22 @@ async def process_change_incorrect_expense_name_transaction(
 
 @router.message(StateFilter(FSMChangeTransaction.change_cost), IsCorrectCostFilter())
 async def process_change_cost_transaction(
-    message: Message, i18n: dict[str, str], cost: float, state: FSMContext
+    message: Message, i18n: Translator, cost: float, state: FSMContext
 ):
     await state.update_data(cost=cost)
     logger.debug("Cost is corrected.")
     transaction_data = await state.get_data()
     await state.set_state(FSMAddTransaction.confirm_transaction)
     await message.answer(
-        text=i18n["transaction_info"].format(
+        text=i18n.format(
+            "transaction_info",
             expense_name=transaction_data["expense_name"],
             category_name=transaction_data["category_name"],
             cost=transaction_data["cost"],
             amount=transaction_data["amount"],
-            created_date=transaction_data["created_date"],
+            created_date=date.fromisoformat(transaction_data["created_date"]).strftime(
+                "%d.%m.%Y"
+            ),
             comment=(
                 transaction_data["comment"]
                 if transaction_data["comment"]
@@ -100,9 +107,7 @@ async def process_change_cost_transaction(
 
 
 @router.message(StateFilter(FSMChangeTransaction.change_cost))
-async def process_change_incorrect_cost_transaction(
-    message: Message, i18n: dict[str, str]
-):
+async def process_change_incorrect_cost_transaction(message: Message, i18n: Translator):
     logger.debug("Cost has incorrect format.")
     await message.answer(text=i18n["transaction_incorrect_cost"])
 
@@ -111,19 +116,22 @@ async def process_change_incorrect_cost_transaction(
     StateFilter(FSMChangeTransaction.change_amount), IsCorrectAmountFilter()
 )
 async def process_change_amount_transaction(
-    message: Message, i18n: dict[str, str], amount: int, state: FSMContext
+    message: Message, i18n: Translator, amount: int, state: FSMContext
 ):
     await state.update_data(amount=amount)
     logger.debug("Amount is corrected.")
     transaction_data = await state.get_data()
     await state.set_state(FSMAddTransaction.confirm_transaction)
     await message.answer(
-        text=i18n["transaction_info"].format(
+        text=i18n.format(
+            "transaction_info",
             expense_name=transaction_data["expense_name"],
             category_name=transaction_data["category_name"],
             cost=transaction_data["cost"],
             amount=transaction_data["amount"],
-            created_date=transaction_data["created_date"],
+            created_date=date.fromisoformat(transaction_data["created_date"]).strftime(
+                "%d.%m.%Y"
+            ),
             comment=(
                 transaction_data["comment"]
                 if transaction_data["comment"]
@@ -140,7 +148,7 @@ async def process_change_amount_transaction(
 
 @router.message(StateFilter(FSMChangeTransaction.change_amount))
 async def process_change_incorrect_amount_transaction(
-    message: Message, i18n: dict[str, str]
+    message: Message, i18n: Translator
 ):
     logger.debug("Amount has incorrect format.")
     await message.answer(text=i18n["transaction_incorrect_amount"])
@@ -150,19 +158,22 @@ async def process_change_incorrect_amount_transaction(
     StateFilter(FSMChangeTransaction.change_created_date), IsCorrectCreatedDateFilter()
 )
 async def process_change_created_date_transaction(
-    message: Message, i18n: dict[str, str], created_date: date, state: FSMContext
+    message: Message, i18n: Translator, created_date: date, state: FSMContext
 ):
-    await state.update_data(created_date=created_date.strftime("%d.%m.%Y"))
+    await state.update_data(created_date=created_date.isoformat())
     logger.debug("Created date is corrected.")
     transaction_data = await state.get_data()
     await state.set_state(FSMAddTransaction.confirm_transaction)
     await message.answer(
-        text=i18n["transaction_info"].format(
+        text=i18n.format(
+            "transaction_info",
             expense_name=transaction_data["expense_name"],
             category_name=transaction_data["category_name"],
             cost=transaction_data["cost"],
             amount=transaction_data["amount"],
-            created_date=transaction_data["created_date"],
+            created_date=date.fromisoformat(transaction_data["created_date"]).strftime(
+                "%d.%m.%Y"
+            ),
             comment=(
                 transaction_data["comment"]
                 if transaction_data["comment"]
@@ -179,7 +190,7 @@ async def process_change_created_date_transaction(
 
 @router.message(StateFilter(FSMChangeTransaction.change_created_date))
 async def process_change_incorrect_created_date_transaction(
-    message: Message, i18n: dict[str, str]
+    message: Message, i18n: Translator
 ):
     logger.debug("Created date has incorrect format.")
     await message.answer(text=i18n["transaction_incorrect_created_date"])
@@ -187,19 +198,22 @@ async def process_change_incorrect_created_date_transaction(
 
 @router.message(StateFilter(FSMChangeTransaction.change_comment), IsCorrectComment())
 async def process_change_comment_transaction(
-    message: Message, i18n: dict[str, str], comment: str, state: FSMContext
+    message: Message, i18n: Translator, comment: str, state: FSMContext
 ):
     await state.update_data(comment=comment)
     logger.debug("Comment is corrected.")
     transaction_data = await state.get_data()
     await state.set_state(FSMAddTransaction.confirm_transaction)
     await message.answer(
-        text=i18n["transaction_info"].format(
+        text=i18n.format(
+            "transaction_info",
             expense_name=transaction_data["expense_name"],
             category_name=transaction_data["category_name"],
             cost=transaction_data["cost"],
             amount=transaction_data["amount"],
-            created_date=transaction_data["created_date"],
+            created_date=date.fromisoformat(transaction_data["created_date"]).strftime(
+                "%d.%m.%Y"
+            ),
             comment=(
                 transaction_data["comment"]
                 if transaction_data["comment"]
@@ -216,7 +230,7 @@ async def process_change_comment_transaction(
 
 @router.message(StateFilter(FSMChangeTransaction.change_comment))
 async def process_change_incorrect_comment_transaction(
-    message: Message, i18n: dict[str, str]
+    message: Message, i18n: Translator
 ):
     logger.info("Comment has incorrect format.")
     await message.answer(text=i18n["transaction_incorrect_comment"])
@@ -8,8 +8,10 @@ from aiogram.types import Message
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import bot.database.db_requests as db
+from bot.database.db_models import User
+from bot.lexicon.catalog import Translator
 
-router = Router()
+router = Router(name="command")
 logger = logging.getLogger(__name__)
 
 
@@ -24,33 +26,36 @@ class FSMAddTransaction(StatesGroup):
 @router.message(Command("start"), StateFilter(default_state))
 async def process_start_command(
     message: Message,
-    i18n: dict[str, str],
+    i18n: Translator,
     async_session: AsyncSession,
 ):
-    logger.info(f"User {message.from_user.id} sent /start command.")
+    logger.info("User %s sent /start command.", message.from_user.id)
     await db.add_user(async_session, message.from_user.id, message.from_user.first_name)
     await message.answer(text=i18n["/start"])
 
 
 @router.message(Command("help"))
-async def process_help_command(message: Message, i18n: dict[str, str]):
-    logger.info(f"User {message.from_user.id} sent /help command.")
+async def process_help_command(message: Message, i18n: Translator):
+    logger.info("User %s sent /help command.", message.from_user.id)
     await message.answer(text=i18n["/start"])
 
 
 @router.message(Command("cancel"), StateFilter(default_state))
-async def process_cancel_command(message: Message, i18n: dict[str, str]):
-    logger.info(f"User {message.from_user.id} send /cancel command from default state.")
+async def process_cancel_command(message: Message, i18n: Translator):
+    logger.info(
+        "User %s send /cancel command from default state.", message.from_user.id
+    )
     await message.answer(text=i18n["/cancel_disaprove"])
 
 
 @router.message(Command("cancel"), ~StateFilter(default_state))
 async def process_cancel_command_state(
-    message: Message, i18n: dict[str, str], state: FSMContext
+    message: Message, i18n: Translator, state: FSMContext
 ):
     logger.info(
-        f"User {message.from_user.id} sent /cancel command from "
-        f"{await state.get_state()} state."
+        "User %s sent /cancel command from %s state.",
+        message.from_user.id,
+        await state.get_state(),
     )
     await state.clear()
     await message.answer(text=i18n["/cancel_approve"])
@@ -58,8 +63,25 @@ async def process_cancel_command_state(
 
 @router.message(Command("add_transactions"), StateFilter(default_state))
 async def process_add_transaction_command(
-    message: Message, i18n: dict[str, str], state: FSMContext
+    message: Message, i18n: Translator, state: FSMContext
 ):
-    logger.info(f"User {message.from_user.id} was moved to transaction adding mode.")
+    logger.info("User %s was moved to transaction adding mode.", message.from_user.id)
     await state.set_state(FSMAddTransaction().fill_transaction)
     await message.answer(text=i18n["transaction_pattern"])
+
+
+@router.message(Command("auto_confirm"))
+async def process_auto_confirm_command(
+    message: Message, i18n: Translator, async_session: AsyncSession, user_info: User
+):
+    auto_confirm = not user_info.auto_confirm
+    await db.set_auto_confirm(async_session, user_info.user_id, auto_confirm)
+    await async_session.commit()
+    logger.info(
+        "User %s set auto confirm of transactions to %s.",
+        message.from_user.id,
+        auto_confirm,
+    )
+    await message.answer(
+        text=i18n["auto_confirm_on"] if auto_confirm else i18n["auto_confirm_off"]
+    )
@@ -0,0 +1,80 @@
+import logging
+from datetime import date
+
+from aiogram import Router
+from aiogram.filters import Command
+from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bot.database.db_digest_requests as db
+from bot.database.db_models import User
+from bot.keyboards.cbdata import DigestCallbackFactory, DigestPeriod
+from bot.keyboards.kb_users import create_digest_keyboard
+from bot.lexicon.catalog import Translator
+from bot.services.digests import next_digest_date
+
+router = Router(name="digest")
+logger = logging.getLogger(__name__)
+
+
+@router.message(Command("digest"))
+async def process_digest_command(message: Message, i18n: Translator, user_info: User):
+    """Handler to show periods of spending digest.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        user_info (User): local user info
+    """
+    logger.info("User %s sent /digest command.", message.from_user.id)
+    period = user_info.digest_period or DigestPeriod.OFF.value
+    await message.answer(
+        text=i18n.format(
+            "digest_choose_period", current_period=i18n[f"digest_{period}_button"]
+        ),
+        reply_markup=create_digest_keyboard(
+            i18n["digest_day_button"],
+            i18n["digest_week_button"],
+            i18n["digest_month_button"],
+            i18n["digest_off_button"],
+        ),
+    )
+
+
+@router.callback_query(DigestCallbackFactory.filter())
+async def process_digest_period(
+    callback: CallbackQuery,
+    callback_data: DigestCallbackFactory,
+    i18n: Translator,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to subscribe user to digests with chosen period or unsubscribe.
+
+    Args:
+        callback (CallbackQuery): update with chosen period
+        callback_data (DigestCallbackFactory): chosen period
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    if callback_data.period == DigestPeriod.OFF:
+        await db.set_digest_period(async_session, local_user_id, None, None)
+        text = i18n["digest_unsubscribed"]
+    else:
+        period = callback_data.period.value
+        next_date = next_digest_date(period, date.today())
+        await db.set_digest_period(async_session, local_user_id, period, next_date)
+        text = i18n.format(
+            "digest_subscribed",
+            period=i18n[f"digest_{period}_period"],
+            next_date=next_date.strftime("%d.%m.%Y"),
+        )
+    await async_session.commit()
+    logger.info(
+        "User %s chose digest period %s.",
+        callback.from_user.id,
+        callback_data.period.value,
+    )
+    await callback.answer()
+    await callback.message.edit_text(text=text)
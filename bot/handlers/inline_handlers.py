@@ -0,0 +1,67 @@
+import logging
+
+from aiogram import Router
+from aiogram.types import (
+    InlineQuery,
+    InlineQueryResultArticle,
+    InputTextMessageContent,
+)
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bot.database.db_requests as db
+from bot.lexicon.catalog import Translator
+from bot.services.autocomplete import prefix_indexes
+
+router = Router(name="inline")
+logger = logging.getLogger(__name__)
+
+# Suggestions depend on user transactions, Telegram caches them only briefly
+INLINE_CACHE_TIME = 5
+
+
+@router.inline_query()
+async def process_inline_query(
+    inline_query: InlineQuery, i18n: Translator, async_session: AsyncSession
+):
+    """Handler to suggest the most used expenses of user which match typed text.
+    Chosen suggestion sends expense with its last cost, so it is added as usual
+    transaction. Suggestions are served from prefix index of user, database is
+    queried only to build index.
+
+    Args:
+        inline_query (InlineQuery): update with text typed by user
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db,
+            connection is taken from pool only if index has to be built
+    """
+    telegram_id = inline_query.from_user.id
+    index = prefix_indexes.get(telegram_id)
+    if index is None:
+        expenses = await db.get_expense_usage(async_session, telegram_id)
+        index = prefix_indexes.set(telegram_id, expenses)
+        logger.info("Prefix index of user %s was built.", telegram_id)
+
+    results = []
+    for position, expense in enumerate(index.search(inline_query.query)):
+        if expense.last_cost is None:
+            message_text = expense.expense_name
+            description = i18n["inline_expense_unused"]
+        else:
+            cost = round(expense.last_cost, 2)
+            message_text = f"{expense.expense_name} {cost}"
+            description = i18n.format(
+                "inline_expense_description",
+                cost=cost,
+                transactions_number=expense.transactions_number,
+            )
+        results.append(
+            InlineQueryResultArticle(
+                id=str(position),
+                title=expense.expense_name,
+                description=description,
+                input_message_content=InputTextMessageContent(
+                    message_text=message_text
+                ),
+            )
+        )
+    await inline_query.answer(results, cache_time=INLINE_CACHE_TIME, is_personal=True)
@@ -0,0 +1,166 @@
+import logging
+from datetime import date, timedelta
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject, StateFilter
+from aiogram.fsm.state import default_state
+from aiogram.types import CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bot.database.db_recurring_requests as db
+from bot.database.db_requests import get_expense_category_info
+from bot.filters.parser import parse_recurring
+from bot.keyboards.cbdata import RecurringCallbackFactory
+from bot.keyboards.kb_users import create_recurring_keyboard
+from bot.lexicon.catalog import Translator
+from bot.services.recurring import MAX_FIRST_DATE_AGE_DAYS, RecurringScheduler
+
+router = Router(name="recurring")
+logger = logging.getLogger(__name__)
+
+
+@router.message(Command("add_recurring"), StateFilter(default_state))
+async def process_add_recurring_command(
+    message: Message,
+    i18n: Translator,
+    command: CommandObject,
+    async_session: AsyncSession,
+    local_user_id: int,
+    recurring_scheduler: RecurringScheduler,
+):
+    """Handler to add recurring transaction of existing expense. Command format:
+    /add_recurring <period> <expense name> <cost> [x<amount>] [@<first date>]
+    [#<comment>]. First date can't be older than MAX_FIRST_DATE_AGE_DAYS, because
+    all postings before today are added at once.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        command (CommandObject): parsed command with arguments
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+        recurring_scheduler (RecurringScheduler): scheduler of recurring transactions
+    """
+    today = date.today()
+    recurring = parse_recurring(command.args or "", today)
+    if recurring is None:
+        await message.answer(text=i18n["recurring_incorrect_format"])
+        return
+
+    period, transaction = recurring
+    first_date = transaction.created_date or today
+    min_first_date = today - timedelta(days=MAX_FIRST_DATE_AGE_DAYS)
+    if first_date < min_first_date:
+        await message.answer(
+            text=i18n.format(
+                "recurring_first_date_too_old",
+                min_first_date=min_first_date.strftime("%d.%m.%Y"),
+            )
+        )
+        return
+
+    expense_info = await get_expense_category_info(
+        async_session, transaction.expense_name, local_user_id
+    )
+    if expense_info is None:
+        await message.answer(
+            text=i18n.format(
+                "recurring_expense_not_found", expense_name=transaction.expense_name
+            )
+        )
+        return
+
+    await db.add_recurring(
+        async_session,
+        local_user_id,
+        expense_info.expense_id,
+        transaction.cost,
+        transaction.amount,
+        transaction.comment or "-",
+        period,
+        first_date,
+    )
+    await async_session.commit()
+    recurring_scheduler.schedule(first_date)
+    logger.info("User %s added recurring transaction.", message.from_user.id)
+    await message.answer(
+        text=i18n.format(
+            "recurring_added",
+            expense_name=transaction.expense_name,
+            period=i18n[f"recurring_{period}_period"],
+            first_date=first_date.strftime("%d.%m.%Y"),
+        )
+    )
+
+
+@router.message(Command("recurring"))
+async def process_recurring_command(
+    message: Message,
+    i18n: Translator,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to show recurring transactions of user with buttons to delete them.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    logger.info("User %s sent /recurring command.", message.from_user.id)
+    recurring = await db.get_user_recurring(async_session, local_user_id)
+    if not recurring:
+        await message.answer(text=i18n["recurring_empty"])
+        return
+
+    lines = [i18n["recurring_header"]]
+    lines.extend(
+        i18n.format(
+            "recurring_item",
+            expense_name=info.expense_name,
+            total=round(info.cost * info.amount, 2),
+            period=i18n[f"recurring_{info.period}_period"],
+            next_date=info.next_date.strftime("%d.%m.%Y"),
+        )
+        for info in recurring
+    )
+    await message.answer(
+        text="\n".join(lines),
+        reply_markup=create_recurring_keyboard(
+            [(info.recurring_id, info.expense_name) for info in recurring],
+            i18n["recurring_delete_button"],
+        ),
+    )
+
+
+@router.callback_query(RecurringCallbackFactory.filter())
+async def process_delete_recurring(
+    callback: CallbackQuery,
+    callback_data: RecurringCallbackFactory,
+    i18n: Translator,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to delete chosen recurring transaction.
+
+    Args:
+        callback (CallbackQuery): update with chosen template
+        callback_data (RecurringCallbackFactory): ID of template
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    deleted = await db.delete_recurring(
+        async_session, local_user_id, callback_data.recurring_id
+    )
+    await async_session.commit()
+    logger.info(
+        "User %s deleted recurring transaction #%s.",
+        callback.from_user.id,
+        callback_data.recurring_id,
+    )
+    await callback.answer()
+    await callback.message.edit_text(
+        text=i18n["recurring_deleted" if deleted else "recurring_not_found"]
+    )
@@ -0,0 +1,175 @@
+import hashlib
+import html
+import logging
+from dataclasses import replace
+from datetime import date, timedelta
+from typing import Optional
+
+from aiogram import Router
+from aiogram.filters import Command, CommandObject, StateFilter
+from aiogram.fsm.context import FSMContext
+from aiogram.fsm.state import default_state
+from aiogram.types import CallbackQuery, InlineKeyboardMarkup, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bot.database.db_search_requests as db
+from bot.keyboards.cbdata import SearchCallbackFactory
+from bot.keyboards.kb_users import create_search_keyboard
+from bot.lexicon.catalog import Translator
+from bot.services.search import format_search_results, normalize_query
+
+router = Router(name="search")
+logger = logging.getLogger(__name__)
+
+SEARCH_PAGE_SIZE = 10
+UNIX_EPOCH = date(1970, 1, 1)
+# Queries are kept apart from user state, so they aren't cleared by other flows
+SEARCH_DESTINY = "search"
+# Next page buttons of older results messages expire
+SEARCH_QUERIES_LIMIT = 20
+
+
+def get_query_id(query: str) -> str:
+    """Get short ID of search query for callback data.
+
+    Args:
+        query (str): normalized search query
+
+    Returns:
+        str: hex digest of query
+    """
+    return hashlib.blake2b(query.encode(), digest_size=4).hexdigest()
+
+
+def get_search_context(state: FSMContext) -> FSMContext:
+    """Get FSM context of user search queries, its data is a mapping of query IDs to
+    queries.
+
+    Args:
+        state (FSMContext): state of user for FSM
+
+    Returns:
+        FSMContext: context with search destiny
+    """
+    return FSMContext(state.storage, replace(state.key, destiny=SEARCH_DESTINY))
+
+
+async def get_search_page(
+    async_session: AsyncSession,
+    user_id: int,
+    query: str,
+    query_id: str,
+    i18n: Translator,
+    before: Optional[tuple[date, int]] = None,
+) -> tuple[str, Optional[InlineKeyboardMarkup]]:
+    """Get text of search results page and keyboard to open the next one. One extra
+    transaction is read to know whether the next page exists.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_id (int): local user ID in db
+        query (str): normalized search query
+        query_id (str): ID of search query
+        i18n (Translator): lexicon depends on user language settings
+        before (Optional[tuple[date, int]]): keyset of the last shown transaction
+
+    Returns:
+        tuple[str, Optional[InlineKeyboardMarkup]]: text and keyboard of page
+    """
+    results = await db.search_transactions(
+        async_session, user_id, query, SEARCH_PAGE_SIZE + 1, before
+    )
+    if not results:
+        return i18n.format("search_not_found", query=html.escape(query)), None
+
+    reply_markup = None
+    if len(results) > SEARCH_PAGE_SIZE:
+        results = results[:SEARCH_PAGE_SIZE]
+        last = results[-1]
+        reply_markup = create_search_keyboard(
+            i18n["search_next_page_button"],
+            query_id,
+            (last.created_date - UNIX_EPOCH).days,
+            last.transaction_id,
+        )
+    return format_search_results(results, query, i18n), reply_markup
+
+
+@router.message(Command("search"), StateFilter(default_state))
+async def process_search_command(
+    message: Message,
+    i18n: Translator,
+    command: CommandObject,
+    state: FSMContext,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to search transactions by expense name and comment. Command format:
+    /search <text>. Query is kept in FSM storage by its ID for the next pages, so
+    buttons of each results message open pages of their own query.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        command (CommandObject): parsed command with arguments
+        state (FSMContext): state of user for FSM
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    query = normalize_query(command.args or "")
+    if query is None:
+        await message.answer(text=i18n["search_incorrect_format"])
+        return
+
+    logger.info("User %s sent /search command.", message.from_user.id)
+    query_id = get_query_id(query)
+    search_context = get_search_context(state)
+    queries = await search_context.get_data()
+    queries.pop(query_id, None)
+    queries[query_id] = query
+    for old_query_id in list(queries)[:-SEARCH_QUERIES_LIMIT]:
+        del queries[old_query_id]
+    await search_context.set_data(queries)
+
+    text, reply_markup = await get_search_page(
+        async_session, local_user_id, query, query_id, i18n
+    )
+    await message.answer(text=text, reply_markup=reply_markup)
+
+
+@router.callback_query(SearchCallbackFactory.filter())
+async def process_search_page(
+    callback: CallbackQuery,
+    callback_data: SearchCallbackFactory,
+    i18n: Translator,
+    state: FSMContext,
+    async_session: AsyncSession,
+    local_user_id: int,
+):
+    """Handler to show the next page of search results.
+
+    Args:
+        callback (CallbackQuery): update with keyset of the last shown transaction
+        callback_data (SearchCallbackFactory): ID of query and keyset of the last
+            shown transaction
+        i18n (Translator): lexicon depends on user language settings
+        state (FSMContext): state of user for FSM
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+    """
+    await callback.answer()
+    queries = await get_search_context(state).get_data()
+    query = queries.get(callback_data.query_id)
+    if query is None:
+        await callback.message.edit_text(text=i18n["search_expired"])
+        return
+
+    before = (
+        UNIX_EPOCH + timedelta(days=callback_data.day),
+        callback_data.transaction_id,
+    )
+    text, reply_markup = await get_search_page(
+        async_session, local_user_id, query, callback_data.query_id, i18n, before
+    )
+    logger.info("User %s opened next page of search results.", callback.from_user.id)
+    await callback.message.edit_text(text=text, reply_markup=reply_markup)
@@ -0,0 +1,195 @@
+import logging
+from datetime import date
+
+from aiogram import Router
+from aiogram.filters import Command, StateFilter
+from aiogram.fsm.state import default_state
+from aiogram.types import BufferedInputFile, CallbackQuery, Message
+from sqlalchemy.ext.asyncio import AsyncSession
+
+import bot.database.db_requests as db_requests
+import bot.database.db_statistic_requests as db
+from bot.database.db_models import User
+from bot.keyboards.cbdata import (
+    StatisticCallbackFactory,
+    StatisticChart,
+    StatisticPeriod,
+)
+from bot.keyboards.kb_users import create_statistic_keyboard
+from bot.lexicon.catalog import Translator
+from bot.services.charts import (
+    ChartKey,
+    ChartService,
+    render_bar_chart,
+    render_pie_chart,
+)
+from bot.services.insights import HISTORY_MONTHS, InsightsService, format_insights
+
+router = Router(name="statistic")
+logger = logging.getLogger(__name__)
+
+CHART_TITLES = {
+    StatisticChart.CATEGORIES: {
+        StatisticPeriod.MONTH: "statistic_categories_month_title",
+        StatisticPeriod.YEAR: "statistic_categories_year_title",
+    },
+    StatisticChart.MONTHS: {StatisticPeriod.YEAR: "statistic_months_year_title"},
+}
+
+
+def get_period_start(period: StatisticPeriod, today: date) -> date:
+    """Get first date of statistic period: current month or the last 12 months.
+
+    Args:
+        period (StatisticPeriod): period of statistic
+        today (date): current date
+
+    Returns:
+        date: first day of the first month of period
+    """
+    if period == StatisticPeriod.MONTH:
+        return today.replace(day=1)
+    return get_months_ago(today, 11)
+
+
+def get_months_ago(today: date, months: int) -> date:
+    """Get first day of the month which was required number of months ago.
+
+    Args:
+        today (date): current date
+        months (int): number of months
+
+    Returns:
+        date: first day of month
+    """
+    month_index = today.year * 12 + today.month - 1 - months
+    return date(month_index // 12, month_index % 12 + 1, 1)
+
+
+@router.message(Command("get_statistic"), StateFilter(default_state))
+async def process_get_statistic_command(message: Message, i18n: Translator):
+    """Handler to show available statistic charts.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+    """
+    logger.info("User %s sent /get_statistic command.", message.from_user.id)
+    await message.answer(
+        text=i18n["statistic_choose_chart"],
+        reply_markup=create_statistic_keyboard(
+            i18n["statistic_categories_month_button"],
+            i18n["statistic_categories_year_button"],
+            i18n["statistic_months_year_button"],
+        ),
+    )
+
+
+@router.callback_query(StatisticCallbackFactory.filter())
+async def process_statistic_chart(
+    callback: CallbackQuery,
+    callback_data: StatisticCallbackFactory,
+    i18n: Translator,
+    async_session: AsyncSession,
+    user_info: User,
+    chart_service: ChartService,
+):
+    """Handler to send chosen statistic chart. Chart of unchanged transactions is sent
+    by cached file_id, otherwise it is rendered in worker process and uploaded.
+
+    Args:
+        callback (CallbackQuery): update with chosen chart
+        callback_data (StatisticCallbackFactory): chart and its period
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_info (User): local user info
+        chart_service (ChartService): service of chart rendering and caching
+    """
+    await callback.answer()
+    title_key = CHART_TITLES[callback_data.chart].get(callback_data.period)
+    if title_key is None:
+        return
+
+    start_date = get_period_start(callback_data.period, date.today())
+    # Period start is a part of key: chart of the previous month isn't valid anymore
+    key = ChartKey(
+        user_info.user_id,
+        callback_data.chart.value,
+        f"{callback_data.period.value}:{start_date.isoformat()}",
+    )
+    data_version = user_info.data_version
+    file_id = chart_service.get_file_id(key, data_version)
+    if file_id is not None:
+        logger.info("Cached chart was sent to user %s.", callback.from_user.id)
+        await callback.message.answer_photo(photo=file_id)
+        return
+
+    title = i18n.format(title_key, start_date=start_date.strftime("%d.%m.%Y"))
+    if callback_data.chart == StatisticChart.CATEGORIES:
+        totals = await db.get_category_totals(
+            async_session, user_info.user_id, start_date
+        )
+        renderer_args = (
+            render_pie_chart,
+            title,
+            [category_name for category_name, _ in totals],
+            [total for _, total in totals],
+            i18n["statistic_other_categories"],
+        )
+    else:
+        totals = await db.get_monthly_totals(
+            async_session, user_info.user_id, start_date
+        )
+        renderer_args = (
+            render_bar_chart,
+            title,
+            [month.strftime("%m.%Y") for month, _ in totals],
+            [total for _, total in totals],
+        )
+    if not totals:
+        await callback.message.answer(text=i18n["statistic_no_data"])
+        return
+
+    image = await chart_service.render(key, data_version, *renderer_args)
+    message = await callback.message.answer_photo(
+        photo=BufferedInputFile(image, filename="statistic.png")
+    )
+    chart_service.set_file_id(key, data_version, message.photo[-1].file_id)
+    logger.info("Chart was sent to user %s.", callback.from_user.id)
+
+
+@router.message(Command("insights"), StateFilter(default_state))
+async def process_insights_command(
+    message: Message,
+    i18n: Translator,
+    async_session: AsyncSession,
+    user_info: User,
+    insights_service: InsightsService,
+):
+    """Handler to send analytics of user spending. Insights of unchanged transactions
+    are sent from cache, otherwise history is loaded and analysed in executor.
+
+    Args:
+        message (Message): update with command from user
+        i18n (Translator): lexicon depends on user language settings
+        async_session (AsyncSession): asynchronous session for connection with db
+        user_info (User): local user info
+        insights_service (InsightsService): service of insights computing and caching
+    """
+    logger.info("User %s sent /insights command.", message.from_user.id)
+    today = date.today()
+    user_id = user_info.user_id
+    data_version = user_info.data_version
+    insights = insights_service.get(user_id, data_version, today)
+    if insights is None:
+        history = await db.get_transaction_history(
+            async_session, user_id, get_months_ago(today, HISTORY_MONTHS)
+        )
+        if not history.totals:
+            await message.answer(text=i18n["insights_no_data"])
+            return
+        categories = await db_requests.get_user_categories(async_session, user_id)
+        insights = await insights_service.compute(
+            user_id, data_version, today, history, dict(categories)
+        )
+    await message.answer(text=format_insights(insights, i18n))
@@ -1,81 +1,260 @@
 import logging
 from datetime import date
+from typing import Optional
 
 from aiogram import Router
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
-from aiogram.types import CallbackQuery, Message, ReplyKeyboardRemove
+from aiogram.types import (
+    CallbackQuery,
+    InlineKeyboardMarkup,
+    Message,
+    ReplyKeyboardRemove,
+)
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
 
 import bot.database.db_requests as db
+from bot.database.db_models import ExpenseCategory, User
 from bot.filters.filters import IsCorrectCategoryName, IsCorrectTransaction
 from bot.handlers.change_transaction_handlers import FSMChangeTransaction
 from bot.handlers.command_handlers import FSMAddTransaction
-from bot.keyboards.cbdata import CategoriesCallbackFactory
+from bot.keyboards.cbdata import CategoriesCallbackFactory, CategoryAction
+from bot.keyboards.kb_cache import UserCategories, categories_keyboards
 from bot.keyboards.kb_users import (
-    create_categories_keyboard,
+    add_suggested_expense_button,
     create_confirm_transaction_keyboard,
     create_correct_transaction_keyboard,
 )
+from bot.lexicon.catalog import Translator
+from bot.services.autocomplete import prefix_indexes
+from bot.services.budgets import get_budget_alert
+from bot.services.expense_index import ExpenseIndex, expense_indexes
 
-router = Router()
+router = Router(name="transactions")
 logger = logging.getLogger(__name__)
 
 
+async def get_user_categories(
+    async_session: AsyncSession, local_user_id: int
+) -> UserCategories:
+    """Get user categories from cache or load them from db.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+
+    Returns:
+        UserCategories: user categories with pages of categories keyboard
+    """
+    user_categories = categories_keyboards.get(local_user_id)
+    if user_categories is None:
+        categories = await db.get_user_categories(async_session, local_user_id)
+        user_categories = categories_keyboards.set(local_user_id, categories)
+    return user_categories
+
+
+async def get_categories_keyboard(
+    async_session: AsyncSession,
+    local_user_id: int,
+    i18n: Translator,
+    page: int = 0,
+) -> InlineKeyboardMarkup:
+    """Get page of user categories keyboard from cache or build it from user categories
+    in db.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+        i18n (Translator): lexicon depends on user language settings
+        page (int): number of page with categories
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with user categories
+    """
+    user_categories = await get_user_categories(async_session, local_user_id)
+    return user_categories.keyboard(
+        page,
+        i18n["transaction_add_new_category_callback"],
+        i18n["categories_previous_page"],
+        i18n["categories_next_page"],
+    )
+
+
+async def get_expense_index(
+    async_session: AsyncSession, local_user_id: int
+) -> ExpenseIndex:
+    """Get trigram index of user expenses from cache or build it from db.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        local_user_id (int): local user ID in db
+
+    Returns:
+        ExpenseIndex: index of user expenses
+    """
+    index = expense_indexes.get(local_user_id)
+    if index is None:
+        expenses = await db.get_user_expenses(async_session, local_user_id)
+        index = expense_indexes.set(local_user_id, expenses)
+    return index
+
+
+async def get_budget_alert_text(
+    async_session: AsyncSession,
+    i18n: Translator,
+    expense_id: int,
+    created_date: date,
+    transaction_total: float,
+) -> Optional[str]:
+    """Get alert about category budget crossed by added transaction. It has to be
+    called before commit: running total of category is locked by added transaction,
+    so concurrent transactions of user can't cross the same threshold twice.
+
+    Args:
+        async_session (AsyncSession): asynchronous session for connection with db
+        i18n (Translator): lexicon depends on user language settings
+        expense_id (int): expense ID of added transaction
+        created_date (date): date of added transaction
+        transaction_total (float): cost multiplied by amount of added transaction
+
+    Returns:
+        Optional[str]: text of alert if 80% or 100% of budget was crossed
+    """
+    budget = await db.get_expense_budget(async_session, expense_id, created_date)
+    if budget is None:
+        return None
+    alert = get_budget_alert(budget, transaction_total)
+    if alert is None:
+        return None
+    return i18n.format(
+        alert.value,
+        category_name=budget.category_name,
+        total=round(budget.total, 2),
+        monthly_limit=round(budget.monthly_limit, 2),
+        percent=round(budget.total / budget.monthly_limit * 100),
+    )
+
+
 @router.message(StateFilter(FSMAddTransaction.fill_transaction), IsCorrectTransaction())
 async def process_correct_transaction(
     message: Message,
-    i18n: dict[str, str],
+    i18n: Translator,
     async_session: AsyncSession,
+    user_info: User,
     state: FSMContext,
     expense_name: str,
     cost: float,
+    amount: int,
+    created_date: date,
+    comment: Optional[str],
+    ambiguous_cost: bool,
 ):
     """Handler to handle correct transaction. Depends on expense existing in database
-    pass state to confirmation state or adding new expense state.
+    pass state to confirmation state or adding new expense state. Known expense is added
+    to database at once if user turned on auto confirmation and cost is unambiguous. For unknown expense the
+    most similar existing expense is suggested together with categories.
 
     Args:
         message (Message): update with message with correct transaction from user
-        i18n (dict[str, str]): dict with lexicon depends on user language settings
+        i18n (Translator): lexicon depends on user language settings
         async_session (AsyncSession): asynchronous session for connection with db
+        user_info (User): user information from db
         state (FSMContext): Finite State Machine for user with user state and
             transaction data
         expense_name (str): name of expense received from message handled by filter
         cost (float): cost of expense received from message handled by filter
+        amount (int): amount of expense received from message handled by filter
+        created_date (date): date of expense received from message handled by filter
+        comment (Optional[str]): comment received from message handled by filter
+        ambiguous_cost (bool): whether name ends with number which can be thousands
+            of cost
     """
-    user_info = await db.get_user_info(async_session, message.from_user.id)
     expense_category_info = await db.get_expense_category_info(
         async_session,
         expense_name,
         user_info.user_id,
     )
 
-    created_date = date.today()
+    comment = comment or "-"
     if not expense_category_info:
+        expense_index = await get_expense_index(async_session, user_info.user_id)
+        suggested_expense = expense_index.closest(expense_name)
         await state.update_data(
             local_user_id=user_info.user_id,
             expense_name=expense_name,
             cost=cost,
             created_date=created_date.isoformat(),
-            amount=1,
-            comment="-",
+            amount=amount,
+            comment=comment,
+            suggested_expense=suggested_expense
+            and [
+                suggested_expense.expense_name,
+                suggested_expense.expense_id,
+                suggested_expense.category_name,
+            ],
         )
 
         await state.set_state(FSMAddTransaction.add_new_expense)
         logger.info(
-            f"Expense {expense_name} for user #{user_info.user_id} wasn't found in db."
+            "Expense %s for user #%s wasn't found in db.",
+            expense_name,
+            user_info.user_id,
         )
-        user_categories = await db.get_all_user_categories(
+        text = i18n["transaction_no_expense"]
+        reply_markup = await get_categories_keyboard(
+            async_session, user_info.user_id, i18n
+        )
+        if suggested_expense is not None:
+            text += i18n.format(
+                "transaction_suggested_expense",
+                expense_name=suggested_expense.expense_name,
+                category_name=suggested_expense.category_name,
+            )
+            reply_markup = add_suggested_expense_button(
+                reply_markup,
+                i18n.format(
+                    "transaction_suggested_expense_button",
+                    expense_name=suggested_expense.expense_name,
+                ),
+            )
+        await message.answer(text=text, reply_markup=reply_markup)
+    elif user_info.auto_confirm and not ambiguous_cost:
+        await db.add_transaction(
+            async_session=async_session,
+            user_id=user_info.user_id,
+            expense_id=expense_category_info.expense_id,
+            cost=cost,
+            created_date=created_date,
+            amount=amount,
+            comment=comment,
+        )
+        budget_alert = await get_budget_alert_text(
             async_session,
+            i18n,
+            expense_category_info.expense_id,
+            created_date,
+            cost * amount,
+        )
+        await async_session.commit()
+        prefix_indexes.record(message.from_user.id, expense_name, cost)
+        logger.info(
+            "User #%s transaction was added to db without confirmation.",
             user_info.user_id,
         )
         await message.answer(
-            text=i18n["transaction_no_expense"],
-            reply_markup=create_categories_keyboard(
-                user_categories,
-                i18n["transaction_add_new_category_callback"],
-            ),
+            text=i18n.format(
+                "transaction_auto_added",
+                expense_name=expense_name,
+                category_name=expense_category_info.category_name,
+                cost=cost,
+                amount=amount,
+                created_date=created_date.strftime("%d.%m.%Y"),
+                comment=comment,
+            )
         )
+        if budget_alert:
+            await message.answer(text=budget_alert)
     else:
         await state.update_data(
             local_user_id=user_info.user_id,
@@ -84,22 +263,26 @@ async def process_correct_transaction(
             category_name=expense_category_info.category_name,
             cost=cost,
             created_date=created_date.isoformat(),
-            amount=1,
-            comment="-",
+            amount=amount,
+            comment=comment,
         )
         await state.set_state(FSMAddTransaction.confirm_transaction)
         logger.info(
-            f"Expense {expense_name} for user #{user_info.user_id} was found in db."
+            "Expense %s for user #%s was found in db.", expense_name, user_info.user_id
+        )
+        text = i18n.format(
+            "transaction_info",
+            expense_name=expense_name,
+            category_name=expense_category_info.category_name,
+            cost=cost,
+            amount=amount,
+            created_date=created_date.strftime("%d.%m.%Y"),
+            comment=comment,
         )
+        if ambiguous_cost:
+            text += i18n["transaction_ambiguous_cost"]
         await message.answer(
-            text=i18n["transaction_info"].format(
-                expense_name=expense_name,
-                category_name=expense_category_info.category_name,
-                cost=cost,
-                amount=1,
-                created_date=created_date.strftime("%d.%m.%Y"),
-                comment="-",
-            ),
+            text=text,
             reply_markup=create_confirm_transaction_keyboard(
                 i18n["transaction_confirm_button"],
                 i18n["transaction_correct_button"],
@@ -109,14 +292,14 @@ async def process_correct_transaction(
 
 
 @router.message(StateFilter(FSMAddTransaction.fill_transaction))
-async def process_incorrect_transaction(message: Message, i18n: dict[str, str]):
+async def process_incorrect_transaction(message: Message, i18n: Translator):
     """Handler to handle message with incorrect transaction format.
 
     Args:
         message (Message): update with message with incorrect transaction from user
-        i18n (dict[str, str]): dict with lexicon depends on user language settings
+        i18n (Translator): lexicon depends on user language settings
     """
-    logger.info(f"User {message.from_user.id} passed transaction in incorrect format.")
+    logger.info("User %s passed transaction in incorrect format.", message.from_user.id)
     await message.answer(
         text=i18n["transaction_incorrect_format"] + i18n["transaction_pattern"]
     )
@@ -127,17 +310,21 @@ async def process_incorrect_transaction(message: Message, i18n: dict[str, str]):
 )
 async def process_add_expense(
     callback: CallbackQuery,
-    i18n: dict[str, str],
+    callback_data: CategoriesCallbackFactory,
+    i18n: Translator,
     async_session: AsyncSession,
     state: FSMContext,
 ):
     """Handler to handle choice of category for new expense. If user chose existed
-    category add extense to this category and pass user to confirmation state, else user
-    chose add new category pass user to adding new category state.
+    category add extense to this category and pass user to confirmation state, if user
+    chose add new category pass user to adding new category state, if user chose
+    suggested expense replace expense and pass user to confirmation state, else show
+    required page of categories keyboard.
 
     Args:
-        callback (CallbackQuery): update with callback with category name
-        i18n (dict[str, str]): dict with lexicon depends on user language settings
+        callback (CallbackQuery): update with callback with category ID or page
+        callback_data (CategoriesCallbackFactory): unpacked callback data
+        i18n (Translator): lexicon depends on user language settings
         async_session (AsyncSession): asynchronous session for connection with db
         state (FSMContext): Finite State Machine for user with user state and
             transaction data
@@ -146,33 +333,86 @@ async def process_add_expense(
     local_user_id = transaction_data["local_user_id"]
     expense_name = transaction_data["expense_name"]
 
-    category_name = callback.data.split(":")[-1]
-    if category_name == i18n["transaction_add_new_category_callback"]:
+    if callback_data.action == CategoryAction.PAGE:
+        await callback.message.edit_reply_markup(
+            reply_markup=await get_categories_keyboard(
+                async_session, local_user_id, i18n, callback_data.page
+            )
+        )
+    elif callback_data.action == CategoryAction.NEW:
         await state.set_state(FSMAddTransaction.add_new_category)
         logger.info(
-            f"User {local_user_id} chose to add new category for {expense_name}."
+            "User %s chose to add new category for %s.", local_user_id, expense_name
         )
         await callback.message.answer(text=i18n["transaction_add_new_category"])
-    else:
-        category_info = await db.get_category_info(
-            async_session,
-            local_user_id,
-            category_name,
+    elif callback_data.action == CategoryAction.SUGGESTED:
+        suggested_expense = transaction_data.get("suggested_expense")
+        if suggested_expense is None:
+            await callback.answer()
+            return
+
+        expense_name, expense_id, category_name = suggested_expense
+        await state.update_data(
+            expense_name=expense_name,
+            expense_id=expense_id,
+            category_name=category_name,
+        )
+        await state.set_state(FSMAddTransaction.confirm_transaction)
+        logger.info("User %s chose suggested expense %s.", local_user_id, expense_name)
+        await callback.message.answer(
+            text=i18n.format(
+                "transaction_info",
+                expense_name=expense_name,
+                category_name=category_name,
+                cost=transaction_data["cost"],
+                amount=transaction_data["amount"],
+                created_date=date.fromisoformat(
+                    transaction_data["created_date"]
+                ).strftime("%d.%m.%Y"),
+                comment=transaction_data["comment"],
+            ),
+            reply_markup=create_confirm_transaction_keyboard(
+                i18n["transaction_confirm_button"],
+                i18n["transaction_correct_button"],
+                i18n["transaction_cancel_button"],
+            ),
         )
+    else:
+        category_id = callback_data.category_id
+        user_categories = await get_user_categories(async_session, local_user_id)
+        category_name = user_categories.names.get(category_id)
+        if category_name is None:
+            # Category is absent in cached categories if it was added by other
+            # replica. Cached category deleted by other replica is detected when
+            # transaction is confirmed
+            category_info = await db.get_user_category(
+                async_session, local_user_id, category_id
+            )
+            if category_info is None:
+                await callback.answer()
+                return
+            categories_keyboards.invalidate(local_user_id)
+            category_name = category_info.category_name
+
         await state.update_data(
             category_name=category_name,
-            category_id=category_info.category_id,
+            category_id=category_id,
         )
         await state.set_state(FSMAddTransaction.confirm_transaction)
         logger.info(
-            f"User {local_user_id} added {expense_name} to {category_name} category."
+            "User %s added %s to %s category.",
+            local_user_id,
+            expense_name,
+            category_name,
         )
         await callback.message.answer(
-            text=i18n["transaction_expense_added"].format(
+            text=i18n.format(
+                "transaction_expense_added",
                 expense_name=expense_name,
                 category_name=category_name,
             )
-            + i18n["transaction_info"].format(
+            + i18n.format(
+                "transaction_info",
                 expense_name=expense_name,
                 category_name=category_name,
                 cost=transaction_data["cost"],
@@ -194,18 +434,19 @@ async def process_add_expense(
 @router.message(StateFilter(FSMAddTransaction.confirm_transaction))
 async def process_confirm_transaction(
     message: Message,
-    i18n: dict[str, str],
+    i18n: Translator,
     async_session: AsyncSession,
     state: FSMContext,
 ):
     """Handler to confirm, change or cancel transaction. Depends on pressed button
     handler will confirm transaction (add to db) and pass user to fill new transaction
     state, pass user to correct transaction state or cancel transaction and pass user to
-    fill new transaction state.
+    fill new transaction state. If chosen category was deleted before confirmation,
+    user chooses category again.
 
     Args:
         message (Message): update with message with correct transaction from user
-        i18n (dict[str, str]): dict with lexicon depends on user language settings
+        i18n (Translator): lexicon depends on user language settings
         async_session (AsyncSession): asynchronous session for connection with db
         state (FSMContext): Finite State Machine for user with user state and
             transaction data
@@ -214,41 +455,95 @@ async def process_confirm_transaction(
     local_user_id = transaction_data["local_user_id"]
 
     if message.text == i18n["transaction_confirm_button"]:
-        expense_id = transaction_data.get("expense_id", None)
-        if not expense_id:
-            category_id = transaction_data.get("category_id", None)
-            if not category_id:
-                category_id = await db.add_category(
+        try:
+            category_added = False
+            expense_added = None
+            expense_id = transaction_data.get("expense_id", None)
+            if not expense_id:
+                category_id = transaction_data.get("category_id", None)
+                if not category_id:
+                    category_added = True
+                    category_id = await db.add_category(
+                        async_session,
+                        transaction_data["local_user_id"],
+                        transaction_data["category_name"],
+                    )
+                expense_id = await db.add_expense(
                     async_session,
-                    transaction_data["local_user_id"],
+                    transaction_data["expense_name"],
+                    category_id,
+                )
+                expense_added = ExpenseCategory(
+                    transaction_data["expense_name"],
+                    expense_id,
                     transaction_data["category_name"],
+                    category_id,
                 )
-            expense_id = await db.add_expense(
+
+            await db.add_transaction(
+                async_session=async_session,
+                user_id=local_user_id,
+                expense_id=expense_id,
+                cost=transaction_data["cost"],
+                created_date=date.fromisoformat(transaction_data["created_date"]),
+                amount=transaction_data["amount"],
+                comment=transaction_data["comment"],
+            )
+            budget_alert = await get_budget_alert_text(
                 async_session,
-                transaction_data["expense_name"],
-                category_id,
+                i18n,
+                expense_id,
+                date.fromisoformat(transaction_data["created_date"]),
+                transaction_data["cost"] * transaction_data["amount"],
             )
-
-        await db.add_transaction(
-            async_session=async_session,
-            user_id=local_user_id,
-            expense_id=expense_id,
-            cost=transaction_data["cost"],
-            created_date=date.fromisoformat(transaction_data["created_date"]),
-            amount=transaction_data["amount"],
-            comment=transaction_data["comment"],
+            await async_session.commit()
+        except IntegrityError:
+            # Chosen category or expense was deleted meanwhile, e.g. IDs were taken
+            # from caches of this replica after /del_categories was handled by other
+            # one. Stale caches are dropped and category is chosen again
+            await async_session.rollback()
+            categories_keyboards.invalidate(local_user_id)
+            expense_indexes.invalidate(local_user_id)
+            await state.update_data(
+                expense_id=None, category_id=None, suggested_expense=None
+            )
+            await state.set_state(FSMAddTransaction.add_new_expense)
+            logger.info(
+                "Category of user #%s transaction was deleted before confirmation.",
+                local_user_id,
+            )
+            await message.answer(
+                text=i18n["transaction_category_deleted"],
+                reply_markup=ReplyKeyboardRemove(),
+            )
+            await message.answer(
+                text=i18n["transaction_no_expense"],
+                reply_markup=await get_categories_keyboard(
+                    async_session, local_user_id, i18n
+                ),
+            )
+            return
+        if category_added:
+            categories_keyboards.invalidate(local_user_id)
+        if expense_added is not None:
+            expense_indexes.add(local_user_id, expense_added)
+        prefix_indexes.record(
+            message.from_user.id,
+            transaction_data["expense_name"],
+            transaction_data["cost"],
         )
-        await async_session.commit()
         await state.clear()
         await state.set_state(FSMAddTransaction.fill_transaction)
-        logger.info(f"User #{local_user_id} transaction was added to db.")
+        logger.info("User #%s transaction was added to db.", local_user_id)
         await message.answer(
             text=i18n["transaction_added"] + i18n["transaction_pattern"],
             reply_markup=ReplyKeyboardRemove(),
         )
+        if budget_alert:
+            await message.answer(text=budget_alert)
     elif message.text == i18n["transaction_correct_button"]:
         await state.set_state(FSMAddTransaction.correct_transaction)
-        logger.info(f"User #{local_user_id} sent request to change transaction.")
+        logger.info("User #%s sent request to change transaction.", local_user_id)
         await message.answer(
             text=i18n["transaction_correct"],
             reply_markup=create_correct_transaction_keyboard(
@@ -263,13 +558,13 @@ async def process_confirm_transaction(
     elif message.text == i18n["transaction_cancel_button"]:
         await state.clear()
         await state.set_state(FSMAddTransaction.fill_transaction)
-        logger.info(f"User #{local_user_id} canceled current transaction.")
+        logger.info("User #%s canceled current transaction.", local_user_id)
         await message.answer(
             text=i18n["transaction_canceled"] + i18n["transaction_pattern"],
             reply_markup=ReplyKeyboardRemove(),
         )
     else:
-        logger.info(f"User #{local_user_id} sent something else instead button reply.")
+        logger.info("User #%s sent something else instead button reply.", local_user_id)
         await message.answer(
             text=i18n["transaction_confirm_error"], reply_markup=ReplyKeyboardRemove()
         )
@@ -280,7 +575,7 @@ async def process_confirm_transaction(
 )
 async def process_correct_category_name_transaction(
     message: Message,
-    i18n: dict[str, str],
+    i18n: Translator,
     async_session: AsyncSession,
     state: FSMContext,
     category_name: str,
@@ -290,7 +585,7 @@ async def process_correct_category_name_transaction(
 
     Args:
         message (Message): update with message with correct transaction from user
-        i18n (dict[str, str]): dict with lexicon depends on user language settings
+        i18n (Translator): lexicon depends on user language settings
         async_session (AsyncSession): asynchronous session for connection with db
         state (FSMContext): Finite State Machine for user with user state and
             transaction data
@@ -300,10 +595,10 @@ async def process_correct_category_name_transaction(
     local_user_id = transaction_data["local_user_id"]
     expense_name = transaction_data["expense_name"]
 
-    user_categories = await db.get_all_user_categories(async_session, local_user_id)
-    if category_name in user_categories:
+    user_categories = await get_user_categories(async_session, local_user_id)
+    if category_name in user_categories.names.values():
         logger.info(
-            f"User #{local_user_id} tried to add existed category {category_name}."
+            "User #%s tried to add existed category %s.", local_user_id, category_name
         )
         await message.answer(
             text=i18n["transaction_existed_category"]
@@ -313,14 +608,16 @@ async def process_correct_category_name_transaction(
         await state.update_data(category_name=category_name)
         await state.set_state(FSMAddTransaction.confirm_transaction)
 
-        logger.info(f"User {local_user_id} added new category {category_name}.")
+        logger.info("User %s added new category %s.", local_user_id, category_name)
         await message.answer(
-            text=i18n["transaction_category_added"].format(category_name=category_name)
-            + i18n["transaction_expense_added"].format(
+            text=i18n.format("transaction_category_added", category_name=category_name)
+            + i18n.format(
+                "transaction_expense_added",
                 expense_name=expense_name,
                 category_name=category_name,
             )
-            + i18n["transaction_info"].format(
+            + i18n.format(
+                "transaction_info",
                 expense_name=expense_name,
                 category_name=category_name,
                 cost=transaction_data["cost"],
@@ -340,16 +637,16 @@ async def process_correct_category_name_transaction(
 
 @router.message(StateFilter(FSMAddTransaction.add_new_category))
 async def process_incorrect_category_name_transaction(
-    message: Message, i18n: dict[str, str], state: FSMContext
+    message: Message, i18n: Translator, state: FSMContext
 ):
     """Handler to handle message with incorrect category name format.
 
     Args:
         message (Message): update with message with incorrect category name from user
-        i18n (dict[str, str]): dict with lexicon depends on user language settings
+        i18n (Translator): lexicon depends on user language settings
     """
     logger.info(
-        f"User {message.from_user.id} passed category name in incorrect format."
+        "User %s passed category name in incorrect format.", message.from_user.id
     )
     await message.answer(
         text=i18n["transaction_incorrect_category_name"]
@@ -360,7 +657,7 @@ async def process_incorrect_category_name_transaction(
 @router.message(StateFilter(FSMAddTransaction.correct_transaction))
 async def process_change_transaction_info(
     message: Message,
-    i18n: dict[str, str],
+    i18n: Translator,
     async_session: AsyncSession,
     state: FSMContext,
 ):
@@ -369,7 +666,7 @@ async def process_change_transaction_info(
 
     Args:
         message (Message): update with message with correct transaction from user
-        i18n (dict[str, str]): dict with lexicon depends on user language settings
+        i18n (Translator): lexicon depends on user language settings
         async_session (AsyncSession): asynchronous session for connection with db
         state (FSMContext): Finite State Machine for user with user state and
             transaction data
@@ -379,44 +676,42 @@ async def process_change_transaction_info(
 
     if message.text == i18n["transaction_correct_expense_name_button"]:
         await state.set_state(FSMChangeTransaction.change_expense_name)
-        logger.info(f"User #{local_user_id} sent request to correct expense name.")
+        logger.info("User #%s sent request to correct expense name.", local_user_id)
         await message.answer(
             text=i18n["transaction_change_expense_name"],
             reply_markup=ReplyKeyboardRemove(),
         )
     elif message.text == i18n["transaction_correct_category_button"]:
         await state.set_state(FSMAddTransaction.add_new_expense)
-        logger.info(f"User #{local_user_id} sent request to correct category.")
-        user_categories = await db.get_all_user_categories(async_session, local_user_id)
+        logger.info("User #%s sent request to correct category.", local_user_id)
         await message.answer(
             text=i18n["transaction_change_category"],
-            reply_markup=create_categories_keyboard(
-                user_categories,
-                i18n["transaction_add_new_category_callback"],
+            reply_markup=await get_categories_keyboard(
+                async_session, local_user_id, i18n
             ),
         )
     elif message.text == i18n["transaction_correct_cost_button"]:
         await state.set_state(FSMChangeTransaction.change_cost)
-        logger.info(f"User #{local_user_id} sent request to correct cost.")
+        logger.info("User #%s sent request to correct cost.", local_user_id)
         await message.answer(
             text=i18n["transaction_change_cost"], reply_markup=ReplyKeyboardRemove()
         )
     elif message.text == i18n["transaction_correct_amount_button"]:
         await state.set_state(FSMChangeTransaction.change_amount)
-        logger.info(f"User #{local_user_id} sent request to correct amount.")
+        logger.info("User #%s sent request to correct amount.", local_user_id)
         await message.answer(
             text=i18n["transaction_change_amount"], reply_markup=ReplyKeyboardRemove()
         )
     elif message.text == i18n["transaction_correct_created_date_button"]:
         await state.set_state(FSMChangeTransaction.change_created_date)
-        logger.info(f"User #{local_user_id} sent request to correct created_date.")
+        logger.info("User #%s sent request to correct created_date.", local_user_id)
         await message.answer(
             text=i18n["transaction_change_created_date"],
             reply_markup=ReplyKeyboardRemove(),
         )
     elif message.text == i18n["transaction_correct_comment_button"]:
         await state.set_state(FSMChangeTransaction.change_comment)
-        logger.info(f"User #{local_user_id} sent request to correct comment.")
+        logger.info("User #%s sent request to correct comment.", local_user_id)
         await message.answer(
             text=i18n["transaction_change_comment"], reply_markup=ReplyKeyboardRemove()
         )
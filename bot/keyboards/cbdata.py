@@ -1,5 +1,82 @@
+from enum import Enum
+
 from aiogram.filters.callback_data import CallbackData
 
 
-class CategoriesCallbackFactory(CallbackData, prefix="add_category"):
-    category_name: str
+class CategoryAction(str, Enum):
+    CHOOSE = "c"
+    NEW = "n"
+    PAGE = "p"
+    SUGGESTED = "s"
+
+
+class CategoriesCallbackFactory(CallbackData, prefix="cat"):
+    """Callback data of categories keyboard. Only compact category ID is packed, so
+    callback data fits in 64 bytes limit for any category name."""
+
+    action: CategoryAction
+    category_id: int = 0
+    page: int = 0
+
+
+class DeleteAction(str, Enum):
+    CHOOSE = "c"
+    PAGE = "p"
+    CONFIRM = "y"
+    CANCEL = "n"
+    ACCOUNT = "a"
+
+
+class DeleteCallbackFactory(CallbackData, prefix="del"):
+    """Callback data of deletion keyboards: category to delete and confirmation of
+    deletion of category or account."""
+
+    action: DeleteAction
+    category_id: int = 0
+    page: int = 0
+
+
+class StatisticChart(str, Enum):
+    CATEGORIES = "c"
+    MONTHS = "m"
+
+
+class StatisticPeriod(str, Enum):
+    MONTH = "m"
+    YEAR = "y"
+
+
+class StatisticCallbackFactory(CallbackData, prefix="stat"):
+    """Callback data of statistic keyboard: chart and its period."""
+
+    chart: StatisticChart
+    period: StatisticPeriod
+
+
+class DigestPeriod(str, Enum):
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    OFF = "off"
+
+
+class DigestCallbackFactory(CallbackData, prefix="dig"):
+    """Callback data of digest keyboard: chosen period of digest."""
+
+    period: DigestPeriod
+
+
+class RecurringCallbackFactory(CallbackData, prefix="rec"):
+    """Callback data of recurring transactions keyboard: template to delete."""
+
+    recurring_id: int
+
+
+class SearchCallbackFactory(CallbackData, prefix="srch"):
+    """Callback data of the next page of search results: ID of query and keyset of
+    the last shown transaction, date is packed as number of days since 1970-01-01.
+    Query itself doesn't fit into callback data, it's kept in FSM storage by ID."""
+
+    query_id: str
+    day: int
+    transaction_id: int
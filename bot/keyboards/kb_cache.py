@@ -0,0 +1,110 @@
+from collections import OrderedDict
+from collections.abc import Mapping
+from typing import Optional
+
+from aiogram.types import InlineKeyboardMarkup
+
+from bot.keyboards.kb_users import (
+    copy_markup,
+    create_categories_keyboard,
+    create_confirm_transaction_keyboard,
+    create_correct_transaction_keyboard,
+    create_digest_keyboard,
+    create_statistic_keyboard,
+)
+
+
+class UserCategories:
+    """A class used to represent cached categories of one user with lazily built pages
+    of categories keyboard. Pages are shared between updates, copies are returned."""
+
+    __slots__ = ("categories", "names", "_keyboards")
+
+    def __init__(self, categories: list[tuple[int, str]]):
+        self.categories = categories
+        self.names = dict(categories)
+        self._keyboards: dict[tuple[int, str], InlineKeyboardMarkup] = {}
+
+    def keyboard(
+        self,
+        page: int,
+        add_new_category_text: str,
+        previous_page_text: str,
+        next_page_text: str,
+    ) -> InlineKeyboardMarkup:
+        key = (page, add_new_category_text)
+        keyboard = self._keyboards.get(key)
+        if keyboard is None:
+            keyboard = create_categories_keyboard(
+                self.categories,
+                add_new_category_text,
+                page,
+                previous_page_text,
+                next_page_text,
+            )
+            self._keyboards[key] = keyboard
+        return copy_markup(keyboard)
+
+
+class CategoriesKeyboardCache:
+    """A class used to represent LRU cache of users' categories with pages of their
+    categories keyboards. Cache of user has to be invalidated when user categories are
+    changed.
+    """
+
+    def __init__(self, max_users: int = 10000):
+        self.max_users = max_users
+        self._users: OrderedDict[int, UserCategories] = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[UserCategories]:
+        user_categories = self._users.get(user_id)
+        if user_categories is not None:
+            self._users.move_to_end(user_id)
+        return user_categories
+
+    def set(self, user_id: int, categories: list[tuple[int, str]]) -> UserCategories:
+        user_categories = UserCategories(categories)
+        self._users[user_id] = user_categories
+        self._users.move_to_end(user_id)
+        if len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return user_categories
+
+    def invalidate(self, user_id: int) -> None:
+        self._users.pop(user_id, None)
+
+
+categories_keyboards = CategoriesKeyboardCache()
+
+
+def warm_up_keyboards(i18n: Mapping[str, str]) -> None:
+    """Build static keyboards for locale once, builders are cached, so handlers get
+    ready markups. Keyboards of other locales are built on the first use.
+
+    Args:
+        i18n (Mapping[str, str]): lexicon of locale
+    """
+    create_confirm_transaction_keyboard(
+        i18n["transaction_confirm_button"],
+        i18n["transaction_correct_button"],
+        i18n["transaction_cancel_button"],
+    )
+    create_correct_transaction_keyboard(
+        i18n["transaction_correct_expense_name_button"],
+        i18n["transaction_correct_category_button"],
+        i18n["transaction_correct_cost_button"],
+        i18n["transaction_correct_amount_button"],
+        i18n["transaction_correct_created_date_button"],
+        i18n["transaction_correct_comment_button"],
+    )
+    create_statistic_keyboard(
+        i18n["statistic_categories_month_button"],
+        i18n["statistic_categories_year_button"],
+        i18n["statistic_months_year_button"],
+    )
+    create_digest_keyboard(
+        i18n["digest_day_button"],
+        i18n["digest_week_button"],
+        i18n["digest_month_button"],
+        i18n["digest_off_button"],
+    )
@@ -1,3 +1,6 @@
+from functools import lru_cache
+from typing import TypeVar
+
 from aiogram.types import (
     InlineKeyboardButton,
     InlineKeyboardMarkup,
@@ -6,47 +9,145 @@ from aiogram.types import (
 )
 from aiogram.utils.keyboard import InlineKeyboardBuilder, ReplyKeyboardBuilder
 
-from bot.keyboards.cbdata import CategoriesCallbackFactory
+from bot.keyboards.cbdata import (
+    CategoriesCallbackFactory,
+    CategoryAction,
+    DeleteAction,
+    DeleteCallbackFactory,
+    DigestCallbackFactory,
+    DigestPeriod,
+    RecurringCallbackFactory,
+    SearchCallbackFactory,
+    StatisticCallbackFactory,
+    StatisticChart,
+    StatisticPeriod,
+)
+
+CATEGORIES_PAGE_SIZE = 10
+
+KeyboardMarkup = TypeVar("KeyboardMarkup", InlineKeyboardMarkup, ReplyKeyboardMarkup)
+
+
+def copy_markup(markup: KeyboardMarkup) -> KeyboardMarkup:
+    """Copy markup together with its rows and buttons. Cached markups are shared
+    between updates, so callers get copies which they can change.
+
+    Args:
+        markup (KeyboardMarkup): cached markup of inline or reply keyboard
+
+    Returns:
+        KeyboardMarkup: markup with new rows of copied buttons
+    """
+    if isinstance(markup, InlineKeyboardMarkup):
+        return markup.model_copy(
+            update={
+                "inline_keyboard": [
+                    [button.model_copy() for button in row]
+                    for row in markup.inline_keyboard
+                ]
+            }
+        )
+    return markup.model_copy(
+        update={
+            "keyboard": [
+                [button.model_copy() for button in row] for row in markup.keyboard
+            ]
+        }
+    )
 
 
 def create_categories_keyboard(
-    user_categories: list[str], add_new_category_text: str
+    user_categories: list[tuple[int, str]],
+    add_new_category_text: str,
+    page: int = 0,
+    previous_page_text: str = "«",
+    next_page_text: str = "»",
 ) -> InlineKeyboardMarkup:
-    """Create inline keyboard with available categories for user.
+    """Create inline keyboard with one page of available categories for user.
 
     Args:
-        categories (list[str]): list with available categories
+        user_categories (list[tuple[int, str]]): list with IDs and names of all
+            available categories
         add_new_category_text (str): text for button to add new category
+        page (int): number of page with categories
+        previous_page_text (str): text for button to open previous page
+        next_page_text (str): text for button to open next page
 
     Returns:
-        InlineKeyboardMarkup: markup of inline keyboard with available categories and
-            button to add new category
+        InlineKeyboardMarkup: markup of inline keyboard with available categories,
+            buttons to switch page and button to add new category
     """
+    pages_number = max(1, -(-len(user_categories) // CATEGORIES_PAGE_SIZE))
+    page = min(max(page, 0), pages_number - 1)
+    page_start = page * CATEGORIES_PAGE_SIZE
+
     keyboard = InlineKeyboardBuilder()
-    for category in user_categories:
-        keyboard.row(
+    keyboard.add(
+        *(
+            InlineKeyboardButton(
+                text=category_name,
+                callback_data=CategoriesCallbackFactory(
+                    action=CategoryAction.CHOOSE, category_id=category_id
+                ).pack(),
+            )
+            for category_id, category_name in user_categories[
+                page_start : page_start + CATEGORIES_PAGE_SIZE
+            ]
+        )
+    )
+    keyboard.adjust(2)
+
+    navigation_buttons = []
+    if page > 0:
+        navigation_buttons.append(
             InlineKeyboardButton(
-                text=category,
-                callback_data=CategoriesCallbackFactory(category_name=category).pack(),
-            ),
-            width=4,
+                text=previous_page_text,
+                callback_data=CategoriesCallbackFactory(
+                    action=CategoryAction.PAGE, page=page - 1
+                ).pack(),
+            )
         )
+    if page < pages_number - 1:
+        navigation_buttons.append(
+            InlineKeyboardButton(
+                text=next_page_text,
+                callback_data=CategoriesCallbackFactory(
+                    action=CategoryAction.PAGE, page=page + 1
+                ).pack(),
+            )
+        )
+    if navigation_buttons:
+        keyboard.row(*navigation_buttons)
+
     keyboard.row(
         InlineKeyboardButton(
             text=add_new_category_text,
-            callback_data=CategoriesCallbackFactory(
-                category_name=add_new_category_text
-            ).pack(),
+            callback_data=CategoriesCallbackFactory(action=CategoryAction.NEW).pack(),
         ),
         width=1,
     )
     return keyboard.as_markup()
 
 
+@lru_cache(maxsize=32)
+def _build_confirm_transaction_keyboard(
+    confirm_text: str, correct_text: str, cancel_text: str
+) -> ReplyKeyboardMarkup:
+    confirm_keyboard = ReplyKeyboardBuilder()
+    confirm_keyboard.row(
+        KeyboardButton(text=confirm_text),
+        KeyboardButton(text=correct_text),
+        KeyboardButton(text=cancel_text),
+        width=1,
+    )
+    return confirm_keyboard.as_markup(resize_keyboard=True, one_time_keyboard=True)
+
+
 def create_confirm_transaction_keyboard(
     confirm_text: str, correct_text: str, cancel_text: str
 ) -> ReplyKeyboardMarkup:
-    """Create keyboard for transaction confirmation.
+    """Create keyboard for transaction confirmation. Keyboard is built once for each
+    set of texts (for each locale) and copies of it are returned after that.
 
     Args:
         confirm_text (str): text for button to confirm transaction
@@ -56,14 +157,31 @@ def create_confirm_transaction_keyboard(
     Returns:
         ReplyKeyboardMarkup: murkup of keyboard with buttons to manage transaction
     """
-    confirm_keyboard = ReplyKeyboardBuilder()
-    confirm_keyboard.row(
-        KeyboardButton(text=confirm_text),
-        KeyboardButton(text=correct_text),
-        KeyboardButton(text=cancel_text),
-        width=1,
+    return copy_markup(
+        _build_confirm_transaction_keyboard(confirm_text, correct_text, cancel_text)
     )
-    return confirm_keyboard.as_markup(resize_keyboard=True, one_time_keyboard=True)
+
+
+@lru_cache(maxsize=32)
+def _build_correct_transaction_keyboard(
+    change_expense_name_button_text: str,
+    change_category_button_text: str,
+    change_cost_button_text: str,
+    change_amount_button_text: str,
+    change_created_date_button_text: str,
+    change_comment_button_text: str,
+) -> ReplyKeyboardMarkup:
+    correct_keyboard = ReplyKeyboardBuilder()
+    correct_keyboard.row(
+        KeyboardButton(text=change_expense_name_button_text),
+        KeyboardButton(text=change_category_button_text),
+        KeyboardButton(text=change_cost_button_text),
+        KeyboardButton(text=change_amount_button_text),
+        KeyboardButton(text=change_created_date_button_text),
+        KeyboardButton(text=change_comment_button_text),
+        width=2,
+    )
+    return correct_keyboard.as_markup(resize_keyboard=True, one_time_keyboard=True)
 
 
 def create_correct_transaction_keyboard(
@@ -74,7 +192,8 @@ def create_correct_transaction_keyboard(
     change_created_date_button_text: str,
     change_comment_button_text: str,
 ) -> ReplyKeyboardMarkup:
-    """Create keyboard for correction transaction.
+    """Create keyboard for correction transaction. Keyboard is built once for each set
+    of texts (for each locale) and copies of it are returned after that.
 
     Args:
         change_expense_name_button_text (str): text for button to change expense name
@@ -87,14 +206,268 @@ def create_correct_transaction_keyboard(
     Returns:
         ReplyKeyboardMarkup: murkup of keyboard with button to correct transaction
     """
-    correct_keyboard = ReplyKeyboardBuilder()
-    correct_keyboard.row(
-        KeyboardButton(text=change_expense_name_button_text),
-        KeyboardButton(text=change_category_button_text),
-        KeyboardButton(text=change_cost_button_text),
-        KeyboardButton(text=change_amount_button_text),
-        KeyboardButton(text=change_created_date_button_text),
-        KeyboardButton(text=change_comment_button_text),
-        width=2,
+    return copy_markup(
+        _build_correct_transaction_keyboard(
+            change_expense_name_button_text,
+            change_category_button_text,
+            change_cost_button_text,
+            change_amount_button_text,
+            change_created_date_button_text,
+            change_comment_button_text,
+        )
     )
-    return correct_keyboard.as_markup(resize_keyboard=True, one_time_keyboard=True)
+
+
+@lru_cache(maxsize=32)
+def _build_statistic_keyboard(
+    categories_month_text: str, categories_year_text: str, months_year_text: str
+) -> InlineKeyboardMarkup:
+    buttons = (
+        (categories_month_text, StatisticChart.CATEGORIES, StatisticPeriod.MONTH),
+        (categories_year_text, StatisticChart.CATEGORIES, StatisticPeriod.YEAR),
+        (months_year_text, StatisticChart.MONTHS, StatisticPeriod.YEAR),
+    )
+    keyboard = InlineKeyboardBuilder()
+    keyboard.row(
+        *(
+            InlineKeyboardButton(
+                text=text,
+                callback_data=StatisticCallbackFactory(
+                    chart=chart, period=period
+                ).pack(),
+            )
+            for text, chart, period in buttons
+        ),
+        width=1,
+    )
+    return keyboard.as_markup()
+
+
+def create_statistic_keyboard(
+    categories_month_text: str, categories_year_text: str, months_year_text: str
+) -> InlineKeyboardMarkup:
+    """Create inline keyboard with available statistic charts. Keyboard is built once
+    for each set of texts (for each locale) and copies of it are returned.
+
+    Args:
+        categories_month_text (str): text for button of categories chart for month
+        categories_year_text (str): text for button of categories chart for year
+        months_year_text (str): text for button of chart by months for year
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with statistic charts
+    """
+    return copy_markup(
+        _build_statistic_keyboard(
+            categories_month_text, categories_year_text, months_year_text
+        )
+    )
+
+
+@lru_cache(maxsize=32)
+def _build_digest_keyboard(
+    day_text: str, week_text: str, month_text: str, off_text: str
+) -> InlineKeyboardMarkup:
+    buttons = (
+        (day_text, DigestPeriod.DAY),
+        (week_text, DigestPeriod.WEEK),
+        (month_text, DigestPeriod.MONTH),
+        (off_text, DigestPeriod.OFF),
+    )
+    keyboard = InlineKeyboardBuilder()
+    keyboard.row(
+        *(
+            InlineKeyboardButton(
+                text=text, callback_data=DigestCallbackFactory(period=period).pack()
+            )
+            for text, period in buttons
+        ),
+        width=1,
+    )
+    return keyboard.as_markup()
+
+
+def create_digest_keyboard(
+    day_text: str, week_text: str, month_text: str, off_text: str
+) -> InlineKeyboardMarkup:
+    """Create inline keyboard with periods of spending digest. Keyboard is built once
+    for each set of texts (for each locale) and copies of it are returned.
+
+    Args:
+        day_text (str): text for button of daily digest
+        week_text (str): text for button of weekly digest
+        month_text (str): text for button of monthly digest
+        off_text (str): text for button to turn digests off
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with digest periods
+    """
+    return copy_markup(
+        _build_digest_keyboard(day_text, week_text, month_text, off_text)
+    )
+
+
+def create_recurring_keyboard(
+    recurring: list[tuple[int, str]], delete_text: str
+) -> InlineKeyboardMarkup:
+    """Create inline keyboard with button to delete each recurring transaction.
+
+    Args:
+        recurring (list[tuple[int, str]]): IDs and expense names of templates
+        delete_text (str): format of button text with {expense_name} field
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with delete buttons
+    """
+    keyboard = InlineKeyboardBuilder()
+    keyboard.row(
+        *(
+            InlineKeyboardButton(
+                text=delete_text.format(expense_name=expense_name),
+                callback_data=RecurringCallbackFactory(
+                    recurring_id=recurring_id
+                ).pack(),
+            )
+            for recurring_id, expense_name in recurring
+        ),
+        width=1,
+    )
+    return keyboard.as_markup()
+
+
+def create_search_keyboard(
+    next_page_text: str, query_id: str, day: int, transaction_id: int
+) -> InlineKeyboardMarkup:
+    """Create inline keyboard with button to open the next page of search results.
+
+    Args:
+        next_page_text (str): text for button to open next page
+        query_id (str): ID of search query
+        day (int): date of the last shown transaction as days since 1970-01-01
+        transaction_id (int): ID of the last shown transaction
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with next page button
+    """
+    keyboard = InlineKeyboardBuilder()
+    keyboard.button(
+        text=next_page_text,
+        callback_data=SearchCallbackFactory(
+            query_id=query_id, day=day, transaction_id=transaction_id
+        ),
+    )
+    return keyboard.as_markup()
+
+
+def add_suggested_expense_button(
+    keyboard: InlineKeyboardMarkup, suggested_expense_text: str
+) -> InlineKeyboardMarkup:
+    """Add button to choose suggested expense above categories keyboard. Cached
+    keyboard isn't changed, rows are shared with new markup.
+
+    Args:
+        keyboard (InlineKeyboardMarkup): page of categories keyboard
+        suggested_expense_text (str): text for button of suggested expense
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with suggested expense
+    """
+    button = InlineKeyboardButton(
+        text=suggested_expense_text,
+        callback_data=CategoriesCallbackFactory(action=CategoryAction.SUGGESTED).pack(),
+    )
+    return InlineKeyboardMarkup(inline_keyboard=[[button], *keyboard.inline_keyboard])
+
+
+def create_delete_categories_keyboard(
+    user_categories: list[tuple[int, str]],
+    page: int = 0,
+    previous_page_text: str = "«",
+    next_page_text: str = "»",
+) -> InlineKeyboardMarkup:
+    """Create inline keyboard with one page of user categories to choose category to
+    delete.
+
+    Args:
+        user_categories (list[tuple[int, str]]): list with IDs and names of all
+            categories of user
+        page (int): number of page with categories
+        previous_page_text (str): text for button to open previous page
+        next_page_text (str): text for button to open next page
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with user categories and
+            buttons to switch page
+    """
+    pages_number = max(1, -(-len(user_categories) // CATEGORIES_PAGE_SIZE))
+    page = min(max(page, 0), pages_number - 1)
+    page_start = page * CATEGORIES_PAGE_SIZE
+
+    keyboard = InlineKeyboardBuilder()
+    keyboard.add(
+        *(
+            InlineKeyboardButton(
+                text=category_name,
+                callback_data=DeleteCallbackFactory(
+                    action=DeleteAction.CHOOSE, category_id=category_id, page=page
+                ).pack(),
+            )
+            for category_id, category_name in user_categories[
+                page_start : page_start + CATEGORIES_PAGE_SIZE
+            ]
+        )
+    )
+    keyboard.adjust(2)
+
+    navigation_buttons = []
+    if page > 0:
+        navigation_buttons.append(
+            InlineKeyboardButton(
+                text=previous_page_text,
+                callback_data=DeleteCallbackFactory(
+                    action=DeleteAction.PAGE, page=page - 1
+                ).pack(),
+            )
+        )
+    if page < pages_number - 1:
+        navigation_buttons.append(
+            InlineKeyboardButton(
+                text=next_page_text,
+                callback_data=DeleteCallbackFactory(
+                    action=DeleteAction.PAGE, page=page + 1
+                ).pack(),
+            )
+        )
+    if navigation_buttons:
+        keyboard.row(*navigation_buttons)
+    return keyboard.as_markup()
+
+
+def create_delete_confirm_keyboard(
+    confirm_text: str, cancel_text: str, category_id: int = 0
+) -> InlineKeyboardMarkup:
+    """Create inline keyboard to confirm deletion of category or account.
+
+    Args:
+        confirm_text (str): text for button to confirm deletion
+        cancel_text (str): text for button to cancel deletion
+        category_id (int): ID of category to delete, 0 means account
+
+    Returns:
+        InlineKeyboardMarkup: markup of inline keyboard with confirmation
+    """
+    action = DeleteAction.CONFIRM if category_id else DeleteAction.ACCOUNT
+    keyboard = InlineKeyboardBuilder()
+    keyboard.row(
+        InlineKeyboardButton(
+            text=confirm_text,
+            callback_data=DeleteCallbackFactory(
+                action=action, category_id=category_id
+            ).pack(),
+        ),
+        InlineKeyboardButton(
+            text=cancel_text,
+            callback_data=DeleteCallbackFactory(action=DeleteAction.CANCEL).pack(),
+        ),
+    )
+    return keyboard.as_markup()
@@ -1,13 +1,48 @@
+import hashlib
+import json
+import logging
+
 from aiogram import Bot
 from aiogram.types import BotCommand
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import bot.database.db_requests as db
+from bot.lexicon.lexicon import catalog
+
+logger = logging.getLogger(__name__)
 
-from bot.lexicon.lexicon_ru import LEXICON_COMMANDS_RU
 
+async def set_main_menu(
+    bot: Bot, sessions_pool: async_sessionmaker[AsyncSession], force: bool = False
+) -> bool:
+    """Set commands of bot menu only if they were changed since the last start. Hash of
+    commands is stored in db per bot.
 
-async def set_main_menu(bot: Bot):
+    Args:
+        bot (Bot): bot instance
+        sessions_pool (async_sessionmaker[AsyncSession]): pool of sessions to db
+        force (bool): set commands without hash check
+
+    Returns:
+        bool: True if commands were sent to Telegram
+    """
+    commands = catalog.get(None).commands
     main_menu_commands = [
         BotCommand(command=command, description=description)
-        for command, description in LEXICON_COMMANDS_RU.items()
+        for command, description in commands.items()
     ]
+    commands_hash = hashlib.sha256(
+        json.dumps(list(commands.items()), ensure_ascii=False).encode()
+    ).hexdigest()[:16]
+    key = f"commands_hash:{bot.id}"
+
+    async with sessions_pool() as async_session:
+        if not force and await db.get_meta(async_session, key) == commands_hash:
+            logger.info("Bot menu commands weren't changed.")
+            return False
 
-    await bot.set_my_commands(main_menu_commands)
+        await bot.set_my_commands(main_menu_commands)
+        await db.set_meta(async_session, key, commands_hash)
+        await async_session.commit()
+    logger.info("Bot menu commands were set.")
+    return True
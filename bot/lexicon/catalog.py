@@ -0,0 +1,88 @@
+import logging
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, Callable, Optional
+
+import yaml
+
+logger = logging.getLogger(__name__)
+
+YamlLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class Translator(Mapping[str, str]):
+    """A class used to represent lexicon of one locale. Raw message is got by key, so
+    it can be used as dict, templates are formatted by cached str.format methods.
+    """
+
+    def __init__(self, locale: str, messages: dict[str, str], commands: dict[str, str]):
+        self.locale = locale
+        self.commands = commands
+        self._messages = messages
+        self._formatters: dict[str, Callable[..., str]] = {}
+
+    def __getitem__(self, key: str) -> str:
+        return self._messages[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._messages)
+
+    def __len__(self) -> int:
+        return len(self._messages)
+
+    def format(self, key: str, **kwargs: Any) -> str:
+        formatter = self._formatters.get(key)
+        if formatter is None:
+            formatter = self._formatters[key] = self._messages[key].format
+        return formatter(**kwargs)
+
+
+class Catalog:
+    """A class used to represent catalog of locales. Locales are loaded from
+    "<locale>.yaml" files on the first request, resolution of user language code
+    (including region fallback like "ru-RU" -> "ru") is cached.
+    """
+
+    def __init__(self, locales_path: Path, default_locale: str):
+        self.locales_path = locales_path
+        self.default_locale = default_locale
+        self.available = frozenset(path.stem for path in locales_path.glob("*.yaml"))
+        if default_locale not in self.available:
+            raise ValueError(f"Default locale {default_locale} file is missing!")
+
+        self._translators: dict[str, Translator] = {}
+        self._resolved: dict[Optional[str], Translator] = {}
+
+    def get(self, language_code: Optional[str]) -> Translator:
+        """Get translator for user language code.
+
+        Args:
+            language_code (Optional[str]): IETF language code from Telegram user
+
+        Returns:
+            Translator: lexicon of the closest available locale or default locale
+        """
+        translator = self._resolved.get(language_code)
+        if translator is None:
+            translator = self._load(self.resolve(language_code))
+            self._resolved[language_code] = translator
+        return translator
+
+    def resolve(self, language_code: Optional[str]) -> str:
+        if language_code:
+            language_code = language_code.lower().replace("_", "-")
+            for locale in (language_code, language_code.split("-")[0]):
+                if locale in self.available:
+                    return locale
+        return self.default_locale
+
+    def _load(self, locale: str) -> Translator:
+        translator = self._translators.get(locale)
+        if translator is None:
+            locale_path = self.locales_path / f"{locale}.yaml"
+            with open(locale_path, "rt", encoding="utf-8") as f:
+                lexicon = yaml.load(f, Loader=YamlLoader)
+            translator = Translator(locale, lexicon["messages"], lexicon["commands"])
+            self._translators[locale] = translator
+            logger.info("Locale %s was loaded.", locale)
+        return translator
@@ -1,3 +1,5 @@
-from bot.lexicon.lexicon_ru import LEXICON_RU
+from pathlib import Path
 
-translations = {"default": "ru", "ru": LEXICON_RU}
+from bot.lexicon.catalog import Catalog
+
+catalog = Catalog(Path(__file__).parent / "locales", default_locale="ru")
@@ -1,23 +1,102 @@
+import logging
+from time import perf_counter
 from typing import Any, Awaitable, Callable
 
 from aiogram import BaseMiddleware
-from aiogram.types import CallbackQuery, Message, User
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import CallbackQuery, InlineQuery, Message, User
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from bot.database.db_requests import get_user_info
+from bot.lexicon.catalog import Catalog
 
+logger = logging.getLogger(__name__)
+
+SESSION_PARAMS = frozenset({"async_session", "user_info", "local_user_id"})
+USER_PARAMS = frozenset({"user_info", "local_user_id"})
+
+
+class ContextMiddleware(BaseMiddleware):
+    """Middleware to prepare context of update for handler in one pass: lexicon of user
+    locale, session to database and local user info. Session is created and user info
+    is got from database only if chosen handler requires them in its arguments.
+
+    Duration of each stage is stored in data["stage_timings"] (seconds).
+    """
+
+    def __init__(
+        self, catalog: Catalog, sessions_pool: async_sessionmaker[AsyncSession]
+    ):
+        super().__init__()
+        self.catalog = catalog
+        self.sessions_pool = sessions_pool
 
-class GetUserIDMiddleware(BaseMiddleware):
     async def __call__(
         self,
-        handler: Callable[[Message | CallbackQuery, dict[str, Any]], Awaitable[Any]],
-        event: Message | CallbackQuery,
+        handler: Callable[
+            [Message | CallbackQuery | InlineQuery, dict[str, Any]], Awaitable[Any]
+        ],
+        event: Message | CallbackQuery | InlineQuery,
         data: dict[str, Any],
     ) -> Any:
-        """Middleware to get local user ID from database."""
+        timings = data["stage_timings"] = {}
+        started = perf_counter()
+
         user: User = data.get("event_from_user")
-        user_info = await get_user_info(data["async_session"], user.id)
-        if not user_info:
-            await event.answer(text="Сначала необходимо отправить боту команду /start")
+        data["i18n"] = self.catalog.get(user.language_code if user else None)
+        stage_finished = perf_counter()
+        timings["locale"] = stage_finished - started
+
+        handler_object: HandlerObject = data["handler"]
+        if not user or SESSION_PARAMS.isdisjoint(handler_object.params):
+            return await self._call_handler(handler, event, data, stage_finished)
+
+        async with self.sessions_pool() as session:
+            data["async_session"] = session
+            stage_started, stage_finished = stage_finished, perf_counter()
+            timings["session"] = stage_finished - stage_started
+
+            if not USER_PARAMS.isdisjoint(handler_object.params):
+                user_info = await get_user_info(session, user.id)
+                stage_started, stage_finished = stage_finished, perf_counter()
+                timings["user"] = stage_finished - stage_started
+                if not user_info:
+                    await self._answer_not_registered(event, data)
+                    return None
+                data["user_info"] = user_info
+                data["local_user_id"] = user_info.user_id
+
+            return await self._call_handler(handler, event, data, stage_finished)
+
+    @staticmethod
+    async def _answer_not_registered(
+        event: Message | CallbackQuery | InlineQuery, data: dict[str, Any]
+    ) -> None:
+        if isinstance(event, InlineQuery):
+            # Inline query is answered only by results, unregistered user has none
+            await event.answer([], cache_time=0, is_personal=True)
         else:
-            data["local_user_id"] = user_info.user_id
+            await event.answer(text=data["i18n"]["user_not_registered"])
+
+    @staticmethod
+    async def _call_handler(
+        handler: Callable[
+            [Message | CallbackQuery | InlineQuery, dict[str, Any]], Awaitable[Any]
+        ],
+        event: Message | CallbackQuery | InlineQuery,
+        data: dict[str, Any],
+        started: float,
+    ) -> Any:
+        try:
             return await handler(event, data)
+        finally:
+            timings: dict[str, float] = data["stage_timings"]
+            timings["handler"] = perf_counter() - started
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(
+                    "Update stages: %s",
+                    ", ".join(
+                        f"{stage}={duration * 1e6:.0f}us"
+                        for stage, duration in timings.items()
+                    ),
+                )
@@ -0,0 +1,189 @@
+import asyncio
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogram import BaseMiddleware, Bot
+from aiogram.client.session.aiohttp import AiohttpSession
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, StorageKey
+from aiogram.methods import TelegramMethod
+from aiogram.methods.base import TelegramType
+from aiogram.types import TelegramObject
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.monitoring.metrics import (
+    BOT_API_LATENCY,
+    DB_POOL_CHECKED_OUT,
+    DB_POOL_OVERFLOW,
+    DB_POOL_SIZE,
+    EVENT_LOOP_LAG,
+    FSM_STORAGE_LATENCY,
+    HANDLER_LATENCY,
+    SQL_ERRORS,
+    SQL_LATENCY,
+    UPDATE_ERRORS,
+    UPDATE_STAGE_LATENCY,
+    UPDATES,
+)
+from bot.monitoring.tracing import SPAN_KIND_CLIENT, start_span
+
+SQL_STATEMENTS = frozenset({"SELECT", "INSERT", "UPDATE", "DELETE"})
+
+
+def _statement_type(statement: str) -> str:
+    keyword = statement.lstrip()[:6].upper()
+    return keyword if keyword in SQL_STATEMENTS else "OTHER"
+
+
+class MetricsMiddleware(BaseMiddleware):
+    """Inner middleware to count handled updates by router, handler and FSM state and
+    measure duration of handling. It has to be registered before ContextMiddleware to
+    collect its stage timings.
+    """
+
+    def __init__(self, event_type: str):
+        super().__init__()
+        self.event_type = event_type
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject = data["handler"]
+        handler_name = handler_object.callback.__name__
+        router_name = data["event_router"].name
+        UPDATES.inc(
+            self.event_type, router_name, handler_name, data.get("raw_state") or ""
+        )
+
+        started = perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception:
+            UPDATE_ERRORS.inc(self.event_type, router_name, handler_name)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(perf_counter() - started, handler_name)
+            for stage, duration in data.get("stage_timings", {}).items():
+                if stage != "handler":
+                    UPDATE_STAGE_LATENCY.observe(duration, stage)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Measure SQL statements through SQLAlchemy cursor events and export utilization of
+    engine connection pool.
+
+    Args:
+        engine (AsyncEngine): engine of bot database
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_started", []).append(perf_counter())
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        started = conn.info["query_started"].pop()
+        SQL_LATENCY.observe(perf_counter() - started, _statement_type(statement))
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("query_started"):
+            conn.info["query_started"].pop()
+        SQL_ERRORS.inc(_statement_type(exception_context.statement or ""))
+
+    pool = sync_engine.pool
+    # Pools without size (e.g. NullPool) report only checked out connections
+    DB_POOL_SIZE.set_function(getattr(pool, "size", lambda: 0))
+    DB_POOL_CHECKED_OUT.set_function(getattr(pool, "checkedout", lambda: 0))
+    DB_POOL_OVERFLOW.set_function(lambda: max(getattr(pool, "overflow", int)(), 0))
+
+
+class InstrumentedSession(AiohttpSession):
+    """Bot session which measures duration of each Telegram Bot API request."""
+
+    async def make_request(
+        self,
+        bot: Bot,
+        method: TelegramMethod[TelegramType],
+        timeout: Optional[int] = None,
+    ) -> TelegramType:
+        started = perf_counter()
+        result = "error"
+        try:
+            with start_span(
+                f"telegram.{method.__api_method__}",
+                SPAN_KIND_CLIENT,
+                {"telegram.method": method.__api_method__},
+            ):
+                response = await super().make_request(bot, method, timeout)
+            result = "ok"
+            return response
+        finally:
+            BOT_API_LATENCY.observe(
+                perf_counter() - started, method.__api_method__, result
+            )
+
+
+class InstrumentedStorage(BaseStorage):
+    """FSM storage wrapper which measures duration of operations of wrapped storage."""
+
+    def __init__(self, storage: BaseStorage):
+        self.storage = storage
+
+    async def set_state(
+        self, key: StorageKey, state: str | State | None = None
+    ) -> None:
+        started = perf_counter()
+        try:
+            with start_span("fsm.set_state"):
+                await self.storage.set_state(key, state)
+        finally:
+            FSM_STORAGE_LATENCY.observe(perf_counter() - started, "set_state")
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        started = perf_counter()
+        try:
+            with start_span("fsm.get_state"):
+                return await self.storage.get_state(key)
+        finally:
+            FSM_STORAGE_LATENCY.observe(perf_counter() - started, "get_state")
+
+    async def set_data(self, key: StorageKey, data: dict[str, Any]) -> None:
+        started = perf_counter()
+        try:
+            with start_span("fsm.set_data"):
+                await self.storage.set_data(key, data)
+        finally:
+            FSM_STORAGE_LATENCY.observe(perf_counter() - started, "set_data")
+
+    async def get_data(self, key: StorageKey) -> dict[str, Any]:
+        started = perf_counter()
+        try:
+            with start_span("fsm.get_data"):
+                return await self.storage.get_data(key)
+        finally:
+            FSM_STORAGE_LATENCY.observe(perf_counter() - started, "get_data")
+
+    async def close(self) -> None:
+        await self.storage.close()
+
+
+async def monitor_event_loop_lag(interval: float = 0.5) -> None:
+    """Measure how late event loop wakes up task after sleep. Lag grows when
+    handlers block event loop by synchronous code.
+
+    Args:
+        interval (float): interval between measurements in seconds
+    """
+    loop = asyncio.get_running_loop()
+    while True:
+        scheduled = loop.time() + interval
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(loop.time() - scheduled, 0))
@@ -0,0 +1,284 @@
+import math
+from bisect import bisect_left
+from typing import Callable, Iterator, Optional
+
+LabelValues = tuple[str, ...]
+
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_label_pairs(names: tuple[str, ...], values: LabelValues) -> str:
+    return ",".join(
+        '{}="{}"'.format(
+            name,
+            value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"'),
+        )
+        for name, value in zip(names, values)
+    )
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues) -> str:
+    return "{" + _format_label_pairs(names, values) + "}" if names else ""
+
+
+class Metric:
+    """Base class of metric with optional labels. Values of labeled metric are stored
+    per tuple of label values, tuple order matches order of label names.
+    """
+
+    type = "untyped"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.label_names = labels
+
+    def _check_labels(self, values: LabelValues) -> None:
+        if len(values) != len(self.label_names):
+            raise ValueError(
+                f"Metric {self.name} requires labels {self.label_names}, "
+                f"got {values}."
+            )
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} {self.type}",
+        ]
+        for name, labels, value in self.samples():
+            lines.append(f"{name}{labels} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing value, e.g. number of handled updates."""
+
+    type = "counter"
+
+    def __init__(self, name: str, documentation: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, *labels: str, value: float = 1) -> None:
+        values = self._values
+        if labels not in values:
+            self._check_labels(labels)
+            values[labels] = 0
+        values[labels] += value
+
+    def get(self, *labels: str) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for labels, value in self._values.items():
+            yield self.name, _format_labels(self.label_names, labels), value
+
+
+class Gauge(Metric):
+    """Value which can go up and down. Gauge without labels can be computed by
+    function on each scrape.
+    """
+
+    type = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        function: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, documentation, labels)
+        self._values: dict[LabelValues, float] = {}
+        self._function = function
+
+    def set(self, value: float, *labels: str) -> None:
+        if labels not in self._values:
+            self._check_labels(labels)
+        self._values[labels] = value
+
+    def set_function(self, function: Callable[[], float]) -> None:
+        self._function = function
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        if self._function is not None:
+            yield self.name, "", self._function()
+            return
+        for labels, value in self._values.items():
+            yield self.name, _format_labels(self.label_names, labels), value
+
+
+class Histogram(Metric):
+    """Distribution of observed values in cumulative buckets with sum and count."""
+
+    type = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, documentation, labels)
+        self.buckets = tuple(sorted(buckets))
+        self._bucket_labels = [
+            f'le="{_format_value(bound)}"' for bound in (*self.buckets, math.inf)
+        ]
+        # Per labels: counts of values in each bucket (last one is +Inf), sum
+        self._values: dict[LabelValues, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, *labels: str) -> None:
+        state = self._values.get(labels)
+        if state is None:
+            self._check_labels(labels)
+            state = self._values[labels] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = state
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def count(self, *labels: str) -> int:
+        state = self._values.get(labels)
+        return sum(state[0]) if state else 0
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        bucket_name = f"{self.name}_bucket"
+        for labels, (counts, total) in self._values.items():
+            pairs = _format_label_pairs(self.label_names, labels)
+            prefix = "{" + pairs + "," if pairs else "{"
+            cumulative = 0
+            for bucket_label, count in zip(self._bucket_labels, counts):
+                cumulative += count
+                yield bucket_name, prefix + bucket_label + "}", cumulative
+            formatted_labels = "{" + pairs + "}" if pairs else ""
+            yield f"{self.name}_sum", formatted_labels, total[0]
+            yield f"{self.name}_count", formatted_labels, cumulative
+
+
+class Registry:
+    """Collection of metrics rendered in Prometheus text exposition format."""
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+
+    def register(self, metric: Metric) -> Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric {metric.name} is already registered.")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labels=()) -> Counter:
+        return self.register(Counter(name, documentation, labels))
+
+    def gauge(self, name: str, documentation: str, labels=()) -> Gauge:
+        return self.register(Gauge(name, documentation, labels))
+
+    def histogram(
+        self, name: str, documentation: str, labels=(), buckets=DEFAULT_BUCKETS
+    ) -> Histogram:
+        return self.register(Histogram(name, documentation, labels, buckets))
+
+    def render(self) -> str:
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+registry = Registry()
+
+UPDATES = registry.counter(
+    "bot_updates_total",
+    "Handled updates by router, handler and FSM state.",
+    ("event_type", "router", "handler", "state"),
+)
+UPDATE_ERRORS = registry.counter(
+    "bot_update_errors_total",
+    "Updates which raised exception in handler.",
+    ("event_type", "router", "handler"),
+)
+HANDLER_LATENCY = registry.histogram(
+    "bot_handler_duration_seconds",
+    "Duration of update handling by handler including inner middlewares.",
+    ("handler",),
+)
+UPDATE_STAGE_LATENCY = registry.histogram(
+    "bot_update_stage_duration_seconds",
+    "Duration of update context preparation stages.",
+    ("stage",),
+)
+SQL_LATENCY = registry.histogram(
+    "bot_sql_query_duration_seconds",
+    "Duration of SQL statements execution by statement type.",
+    ("statement",),
+)
+SQL_ERRORS = registry.counter(
+    "bot_sql_query_errors_total", "Failed SQL statements.", ("statement",)
+)
+SQL_QUERIES_PER_UPDATE = registry.histogram(
+    "bot_sql_queries_per_update",
+    "Number of SQL statements executed during handling of one update.",
+    ("handler",),
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 50, 100),
+)
+SQL_TIME_PER_UPDATE = registry.histogram(
+    "bot_sql_time_per_update_seconds",
+    "Total duration of SQL statements executed during handling of one update.",
+    ("handler",),
+)
+SQL_SLOW_QUERIES = registry.counter(
+    "bot_sql_slow_queries_total", "SQL statements slower than threshold.", ("handler",)
+)
+SQL_N_PLUS_ONE = registry.counter(
+    "bot_sql_n_plus_one_total",
+    "Updates in which one statement was repeated as in N+1 pattern.",
+    ("handler",),
+)
+DB_POOL_SIZE = registry.gauge("bot_db_pool_size", "Size of database connection pool.")
+DB_POOL_CHECKED_OUT = registry.gauge(
+    "bot_db_pool_checked_out", "Database connections checked out from pool."
+)
+DB_POOL_OVERFLOW = registry.gauge(
+    "bot_db_pool_overflow", "Database connections opened above pool size."
+)
+BOT_API_LATENCY = registry.histogram(
+    "bot_telegram_api_duration_seconds",
+    "Duration of Telegram Bot API requests by method and result.",
+    ("method", "result"),
+    buckets=(*DEFAULT_BUCKETS, 10, 30, 60),
+)
+FSM_STORAGE_LATENCY = registry.histogram(
+    "bot_fsm_storage_duration_seconds",
+    "Duration of FSM storage operations.",
+    ("operation",),
+    buckets=(0.0001, 0.00025, 0.0005, *DEFAULT_BUCKETS),
+)
+EVENT_LOOP_LAG = registry.histogram(
+    "bot_event_loop_lag_seconds",
+    "Delay of event loop callbacks relative to schedule.",
+    buckets=(0.0005, *DEFAULT_BUCKETS),
+)
+CHART_RENDER_LATENCY = registry.histogram(
+    "bot_chart_render_duration_seconds",
+    "Duration of statistic chart rendering in worker process by chart.",
+    ("chart",),
+    buckets=(*DEFAULT_BUCKETS, 10),
+)
+CHART_CACHE_REQUESTS = registry.counter(
+    "bot_chart_cache_requests_total",
+    "Requests of cached Telegram file_id of statistic chart by result.",
+    ("result",),
+)
+DIGESTS_SENT = registry.counter(
+    "bot_digests_total",
+    "Processed spending digests by period and result (sent, empty, blocked, failed).",
+    ("period", "result"),
+)
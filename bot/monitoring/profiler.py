@@ -0,0 +1,172 @@
+import logging
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from datetime import datetime
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+logger = logging.getLogger(__name__)
+
+TOP_FUNCTIONS = 40
+DEFAULT_PROFILE_UPDATES = 100
+DEFAULT_PROFILE_SECONDS = 60
+
+
+class SamplingProfiler:
+    """Statistical profiler of event loop thread. Background thread takes stack of
+    event loop thread every interval until limit of updates or time is reached, then
+    it writes collapsed stacks (input of flamegraph.pl, speedscope, etc.) and table of
+    top functions to output directory. Sampling doesn't slow down handlers, so it can
+    be turned on in production.
+    """
+
+    def __init__(self, output_dir: Path, interval: float = 0.005):
+        self.output_dir = output_dir
+        self.interval = interval
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop_event = threading.Event()
+        self._max_updates = 0
+        self._updates = 0
+        self._labels: dict[CodeType, str] = {}
+        self._root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, max_updates: int = 0, max_seconds: float = 60) -> bool:
+        """Start profiling of thread which calls this method (event loop thread).
+
+        Args:
+            max_updates (int): stop after this number of updates, 0 means no limit
+            max_seconds (float): stop after this time in any case
+
+        Returns:
+            bool: False if profiler is already running
+        """
+        with self._lock:
+            if self.running:
+                return False
+            self._stop_event.clear()
+            self._max_updates = max_updates
+            self._updates = 0
+            self._thread = threading.Thread(
+                target=self._run,
+                args=(threading.get_ident(), max_seconds),
+                name="sampling-profiler",
+                daemon=True,
+            )
+            self._thread.start()
+        logger.info(
+            "Profiler was started for %s updates or %s seconds.",
+            max_updates or "unlimited",
+            max_seconds,
+        )
+        return True
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def on_update(self) -> None:
+        if not self._max_updates or self._stop_event.is_set():
+            return
+        self._updates += 1
+        if self._updates >= self._max_updates:
+            self._stop_event.set()
+
+    def _run(self, thread_id: int, max_seconds: float) -> None:
+        stacks: Counter[tuple[str, ...]] = Counter()
+        started = time.monotonic()
+        deadline = started + max_seconds
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            if frame is None:
+                break
+            stacks[self._collapse(frame)] += 1
+            if time.monotonic() >= deadline:
+                break
+        self._stop_event.set()
+
+        try:
+            collapsed_path, top_path = self._dump(stacks)
+        except OSError:
+            logger.exception("Profile wasn't saved.")
+            return
+        logger.info(
+            "Profiler collected %s samples in %.1f seconds (%s updates): %s, %s.",
+            sum(stacks.values()),
+            time.monotonic() - started,
+            self._updates,
+            collapsed_path,
+            top_path,
+        )
+
+    def _collapse(self, frame: Optional[FrameType]) -> tuple[str, ...]:
+        stack = []
+        while frame is not None:
+            code = frame.f_code
+            label = self._labels.get(code)
+            if label is None:
+                filename = code.co_filename
+                if filename.startswith(self._root):
+                    filename = os.path.relpath(filename, self._root)
+                label = f"{code.co_name} ({filename}:{code.co_firstlineno})"
+                self._labels[code] = label
+            stack.append(label)
+            frame = frame.f_back
+        stack.reverse()
+        return tuple(stack)
+
+    def _dump(self, stacks: Counter[tuple[str, ...]]) -> tuple[Path, Path]:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        name = f"profile-{datetime.now():%Y-%m-%d_%H-%M-%S}"
+        collapsed_path = self.output_dir / f"{name}.collapsed"
+        top_path = self.output_dir / f"{name}-top.txt"
+
+        with open(collapsed_path, "w", encoding="utf-8") as f:
+            for stack, count in stacks.most_common():
+                f.write(f"{';'.join(stack)} {count}\n")
+
+        own: Counter[str] = Counter()
+        total: Counter[str] = Counter()
+        for stack, count in stacks.items():
+            own[stack[-1]] += count
+            # Recursive function is counted once per stack
+            for label in set(stack):
+                total[label] += count
+
+        samples = sum(stacks.values()) or 1
+        with open(top_path, "w", encoding="utf-8") as f:
+            f.write(f"{'own %':>7} {'total %':>8}  function\n")
+            for label, count in own.most_common(TOP_FUNCTIONS):
+                f.write(
+                    f"{count / samples:>7.1%} {total[label] / samples:>8.1%}  {label}\n"
+                )
+        return collapsed_path, top_path
+
+
+class ProfilerMiddleware(BaseMiddleware):
+    """Outer update middleware to count updates handled while profiler is running."""
+
+    def __init__(self, profiler: SamplingProfiler):
+        super().__init__()
+        self.profiler = profiler
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        try:
+            return await handler(event, data)
+        finally:
+            self.profiler.on_update()
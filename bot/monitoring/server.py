@@ -0,0 +1,38 @@
+import logging
+
+from aiohttp import web
+
+from bot.monitoring.metrics import Registry, registry
+
+logger = logging.getLogger(__name__)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def create_metrics_app(metrics_registry: Registry = registry) -> web.Application:
+    async def metrics(request: web.Request) -> web.Response:
+        return web.Response(
+            body=metrics_registry.render().encode(),
+            headers={"Content-Type": CONTENT_TYPE},
+        )
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    return app
+
+
+async def start_metrics_server(host: str, port: int) -> web.AppRunner:
+    """Start HTTP server with metrics in Prometheus text format on /metrics.
+
+    Args:
+        host (str): interface to listen, use local one to keep metrics private
+        port (int): port to listen
+
+    Returns:
+        web.AppRunner: runner of server, it has to be cleaned up on shutdown
+    """
+    runner = web.AppRunner(create_metrics_app(), access_log=None)
+    await runner.setup()
+    await web.TCPSite(runner, host, port).start()
+    logger.info("Metrics server was started on http://%s:%s/metrics.", host, port)
+    return runner
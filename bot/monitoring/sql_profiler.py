@@ -0,0 +1,163 @@
+import logging
+import re
+from collections import Counter
+from contextvars import ContextVar
+from functools import lru_cache
+from time import perf_counter
+from typing import Any, Awaitable, Callable, Optional
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.monitoring.metrics import (
+    SQL_N_PLUS_ONE,
+    SQL_QUERIES_PER_UPDATE,
+    SQL_SLOW_QUERIES,
+    SQL_TIME_PER_UPDATE,
+)
+
+logger = logging.getLogger(__name__)
+
+_STRING_RE = re.compile(r"'(?:[^']|'')*'")
+_PARAMETER_RE = re.compile(r"\$\d+|%\(\w+\)s|%s|(?<!:):\w+|\?")
+_NUMBER_RE = re.compile(r"\b\d+(?:\.\d+)?\b")
+_VALUES_LIST_RE = re.compile(r"\((?:\s*\?\s*,)+\s*\?\s*\)")
+_WHITESPACE_RE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize_sql(statement: str) -> str:
+    """Replace literals and bound parameters of SQL statement with placeholders, so
+    statements which differ only by values are grouped together.
+
+    Args:
+        statement (str): SQL statement sent to database
+
+    Returns:
+        str: one line statement with "?" instead of values
+    """
+    statement = _STRING_RE.sub("?", statement)
+    statement = _PARAMETER_RE.sub("?", statement)
+    statement = _NUMBER_RE.sub("?", statement)
+    statement = _VALUES_LIST_RE.sub("(...)", statement)
+    return _WHITESPACE_RE.sub(" ", statement).strip()
+
+
+class UpdateQueries:
+    """A class used to represent SQL queries executed during handling of one update."""
+
+    __slots__ = ("handler", "count", "duration", "statements")
+
+    def __init__(self, handler: str):
+        self.handler = handler
+        self.count = 0
+        self.duration = 0.0
+        self.statements: Counter[str] = Counter()
+
+
+current_update_queries: ContextVar[Optional[UpdateQueries]] = ContextVar(
+    "current_update_queries", default=None
+)
+
+
+class SQLProfiler:
+    """Profiler of SQL queries based on SQLAlchemy cursor events. Queries slower than
+    threshold are logged with normalized SQL. Queries of update are correlated through
+    context variable set by QueryProfilerMiddleware: number and time of queries per
+    update are exported to metrics, statement repeated in one update at least
+    n_plus_one_threshold times is reported as possible N+1 pattern.
+    """
+
+    def __init__(self, slow_query_threshold: float, n_plus_one_threshold: int):
+        self.slow_query_threshold = slow_query_threshold
+        self.n_plus_one_threshold = n_plus_one_threshold
+        self._reported_n_plus_one: set[tuple[str, str]] = set()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        sync_engine = engine.sync_engine
+        event.listen(sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(sync_engine, "after_cursor_execute", self._after_cursor_execute)
+        event.listen(sync_engine, "handle_error", self._handle_error)
+
+    def _before_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        conn.info.setdefault("profiler_started", []).append(perf_counter())
+
+    def _after_cursor_execute(
+        self, conn, cursor, statement, parameters, context, executemany
+    ) -> None:
+        duration = perf_counter() - conn.info["profiler_started"].pop()
+        update_queries = current_update_queries.get()
+        if update_queries is not None:
+            update_queries.count += 1
+            update_queries.duration += duration
+            update_queries.statements[statement] += 1
+
+        if duration >= self.slow_query_threshold:
+            handler = update_queries.handler if update_queries else "-"
+            SQL_SLOW_QUERIES.inc(handler)
+            logger.warning(
+                "Slow query (%.1f ms) in %s: %s",
+                duration * 1000,
+                handler,
+                normalize_sql(statement),
+            )
+
+    def _handle_error(self, exception_context) -> None:
+        # Failed statement has no after_cursor_execute, its start time is dropped so
+        # the next statements of pooled connection aren't matched with wrong times
+        conn = exception_context.connection
+        if conn is not None and conn.info.get("profiler_started"):
+            conn.info["profiler_started"].pop()
+
+    def finish_update(self, update_queries: UpdateQueries) -> None:
+        """Export queries of handled update to metrics and report repeated statements.
+
+        Args:
+            update_queries (UpdateQueries): queries executed during update handling
+        """
+        handler = update_queries.handler
+        SQL_QUERIES_PER_UPDATE.observe(update_queries.count, handler)
+        SQL_TIME_PER_UPDATE.observe(update_queries.duration, handler)
+
+        for statement, repeats in update_queries.statements.items():
+            if repeats < self.n_plus_one_threshold:
+                continue
+            SQL_N_PLUS_ONE.inc(handler)
+            key = (handler, statement)
+            if key not in self._reported_n_plus_one:
+                self._reported_n_plus_one.add(key)
+                logger.warning(
+                    "Possible N+1 queries in %s: statement was executed %s times in "
+                    "one update: %s",
+                    handler,
+                    repeats,
+                    normalize_sql(statement),
+                )
+
+
+class QueryProfilerMiddleware(BaseMiddleware):
+    """Inner middleware to collect SQL queries executed by handler of update."""
+
+    def __init__(self, profiler: SQLProfiler):
+        super().__init__()
+        self.profiler = profiler
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        handler_object: HandlerObject = data["handler"]
+        update_queries = UpdateQueries(handler_object.callback.__name__)
+        token = current_update_queries.set(update_queries)
+        try:
+            return await handler(event, data)
+        finally:
+            current_update_queries.reset(token)
+            self.profiler.finish_update(update_queries)
@@ -0,0 +1,308 @@
+import functools
+import json
+import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Awaitable, Callable, Iterator, Optional, TypeVar
+
+from aiogram import BaseMiddleware
+from aiogram.dispatcher.event.handler import HandlerObject
+from aiogram.types import TelegramObject, Update, User
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+from bot.monitoring.sql_profiler import normalize_sql
+
+logger = logging.getLogger(__name__)
+# Finished traces are written by handlers of this logger (see logging_config.yaml)
+spans_logger = logging.getLogger("bot.monitoring.tracing.spans")
+
+# OpenTelemetry span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_CODE_ERROR = 2
+
+SERVICE_NAME = "finance_bot"
+
+T = TypeVar("T")
+
+
+class Trace:
+    """A class used to represent trace of one update: finished spans are collected
+    until root span is ended, then they are exported together."""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self):
+        self.trace_id = f"{random.getrandbits(128):032x}"
+        self.spans: list[Span] = []
+
+
+class Span:
+    """A class used to represent timed step of update handling."""
+
+    __slots__ = (
+        "trace",
+        "span_id",
+        "parent_span_id",
+        "name",
+        "kind",
+        "attributes",
+        "start_ns",
+        "end_ns",
+        "error",
+    )
+
+    def __init__(
+        self,
+        trace: Trace,
+        name: str,
+        parent_span_id: str = "",
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+    ):
+        self.trace = trace
+        self.span_id = f"{random.getrandbits(64):016x}"
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = attributes or {}
+        self.start_ns = time.time_ns()
+        self.end_ns = 0
+        self.error: Optional[str] = None
+
+    def child(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+    ) -> "Span":
+        return Span(self.trace, name, self.span_id, kind, attributes)
+
+    def end(self) -> None:
+        self.end_ns = time.time_ns()
+        self.trace.spans.append(self)
+
+    def to_otlp(self) -> dict[str, Any]:
+        span = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        if self.error:
+            span["status"] = {"code": STATUS_CODE_ERROR, "message": self.error}
+        return span
+
+
+current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: dict[str, Any]) -> list[dict[str, Any]]:
+    return [
+        {"key": key, "value": _otlp_value(value)}
+        for key, value in attributes.items()
+        if value is not None
+    ]
+
+
+def export_trace(trace: Trace) -> None:
+    """Write spans of trace as one line of OTLP JSON (format of OpenTelemetry
+    Collector file exporter)."""
+    resource_spans = {
+        "resourceSpans": [
+            {
+                "resource": {
+                    "attributes": _otlp_attributes({"service.name": SERVICE_NAME})
+                },
+                "scopeSpans": [
+                    {
+                        "scope": {"name": __name__},
+                        "spans": [span.to_otlp() for span in trace.spans],
+                    }
+                ],
+            }
+        ]
+    }
+    spans_logger.info(json.dumps(resource_spans, ensure_ascii=False))
+
+
+@contextmanager
+def start_span(
+    name: str,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: Optional[dict[str, Any]] = None,
+) -> Iterator[Optional[Span]]:
+    """Start child span of current span. Nothing is recorded outside of update trace.
+
+    Args:
+        name (str): name of span
+        kind (int): OpenTelemetry span kind
+        attributes (Optional[dict[str, Any]]): attributes of span
+
+    Yields:
+        Optional[Span]: started span or None if trace isn't active
+    """
+    parent = current_span.get()
+    if parent is None:
+        yield None
+        return
+
+    span = parent.child(name, kind, attributes)
+    token = current_span.set(span)
+    try:
+        yield span
+    except BaseException as e:
+        span.error = repr(e)
+        raise
+    finally:
+        current_span.reset(token)
+        span.end()
+
+
+def traced(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+    """Decorator to record call of coroutine function as span of current trace."""
+    name = f"{func.__module__.rsplit('.', 1)[-1]}.{func.__name__}"
+
+    @functools.wraps(func)
+    async def wrapper(*args: Any, **kwargs: Any) -> T:
+        if current_span.get() is None:
+            return await func(*args, **kwargs)
+        with start_span(name):
+            return await func(*args, **kwargs)
+
+    return wrapper
+
+
+def trace_engine(engine: AsyncEngine) -> None:
+    """Record SQL statements as spans of current trace through SQLAlchemy cursor
+    events.
+
+    Args:
+        engine (AsyncEngine): engine of bot database
+    """
+    sync_engine = engine.sync_engine
+
+    @event.listens_for(sync_engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        parent = current_span.get()
+        span = None
+        if parent is not None:
+            span = parent.child(
+                "sql",
+                SPAN_KIND_CLIENT,
+                {"db.system": "postgresql", "db.statement": normalize_sql(statement)},
+            )
+        conn.info.setdefault("trace_spans", []).append(span)
+
+    @event.listens_for(sync_engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        span = conn.info["trace_spans"].pop()
+        if span is not None:
+            span.end()
+
+    @event.listens_for(sync_engine, "handle_error")
+    def handle_error(exception_context):
+        conn = exception_context.connection
+        if conn is None or not conn.info.get("trace_spans"):
+            return
+        span = conn.info["trace_spans"].pop()
+        if span is not None:
+            span.error = repr(exception_context.original_exception)
+            span.end()
+
+
+class TracingMiddleware(BaseMiddleware):
+    """Outer update middleware to start trace of update. Trace ID is available for
+    handlers in data["trace_id"] and is added to log records made during update
+    handling. Only sample_rate part of updates is traced.
+    """
+
+    def __init__(self, sample_rate: float = 1.0):
+        super().__init__()
+        self.sample_rate = sample_rate
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: Update,
+        data: dict[str, Any],
+    ) -> Any:
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            return await handler(event, data)
+
+        user: Optional[User] = data.get("event_from_user")
+        span = Span(
+            Trace(),
+            "update",
+            kind=SPAN_KIND_SERVER,
+            attributes={
+                "telegram.update_id": event.update_id,
+                "telegram.update_type": event.event_type,
+                "telegram.user_id": user.id if user else None,
+            },
+        )
+        data["trace_id"] = span.trace.trace_id
+        token = current_span.set(span)
+        try:
+            return await handler(event, data)
+        except BaseException as e:
+            span.error = repr(e)
+            raise
+        finally:
+            current_span.reset(token)
+            span.end()
+            export_trace(span.trace)
+
+
+class HandlerTracingMiddleware(BaseMiddleware):
+    """Inner middleware to record handling of update by chosen handler as span."""
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: dict[str, Any],
+    ) -> Any:
+        if current_span.get() is None:
+            return await handler(event, data)
+
+        handler_object: HandlerObject = data["handler"]
+        attributes = {
+            "aiogram.router": data["event_router"].name,
+            "aiogram.state": data.get("raw_state"),
+        }
+        with start_span(handler_object.callback.__name__, attributes=attributes):
+            return await handler(event, data)
+
+
+def install_log_record_factory() -> None:
+    """Add trace_id attribute to log records made inside of trace."""
+    record_factory = logging.getLogRecordFactory()
+
+    def factory(*args: Any, **kwargs: Any) -> logging.LogRecord:
+        record = record_factory(*args, **kwargs)
+        span = current_span.get()
+        if span is not None:
+            record.trace_id = span.trace.trace_id
+        return record
+
+    logging.setLogRecordFactory(factory)
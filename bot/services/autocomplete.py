@@ -0,0 +1,135 @@
+import heapq
+from bisect import bisect_left, insort
+from collections import OrderedDict
+from typing import Optional
+
+from bot.database.db_models import ExpenseUsage
+
+MAX_SUGGESTIONS = 10
+
+
+class PrefixIndex:
+    """A class used to represent prefix index of expenses of one user. Every word of
+    expense name starts a key (name from this word to the end), keys are kept in
+    sorted array: keys with required prefix are found by binary search, matched
+    expenses are ranked by number of transactions.
+    """
+
+    __slots__ = ("expenses", "_positions", "_keys", "_key_positions")
+
+    def __init__(self, expenses: list[ExpenseUsage]):
+        self.expenses: list[ExpenseUsage] = []
+        self._positions: dict[str, int] = {}
+        keys = []
+        for expense in expenses:
+            keys.extend(self._add_expense(expense))
+        keys.sort()
+        self._keys = [key for key, _ in keys]
+        self._key_positions = [position for _, position in keys]
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def _add_expense(self, expense: ExpenseUsage) -> list[tuple[str, int]]:
+        position = len(self.expenses)
+        self.expenses.append(expense)
+        name = expense.expense_name.casefold()
+        self._positions[name] = position
+        words = name.split()
+        return [(" ".join(words[i:]), position) for i in range(len(words))]
+
+    def record(self, expense_name: str, cost: float) -> None:
+        """Count new transaction of expense, unknown expense is added to index.
+
+        Args:
+            expense_name (str): name of expense
+            cost (float): cost of transaction
+        """
+        position = self._positions.get(expense_name.casefold())
+        if position is None:
+            keys = self._add_expense(ExpenseUsage(expense_name, 1, cost))
+            for key, key_position in keys:
+                index = bisect_left(self._keys, key)
+                self._keys.insert(index, key)
+                self._key_positions.insert(index, key_position)
+            return
+        expense = self.expenses[position]
+        expense.transactions_number += 1
+        expense.last_cost = cost
+
+    def search(self, prefix: str, limit: int = MAX_SUGGESTIONS) -> list[ExpenseUsage]:
+        """Find the most used expenses with a word starting with prefix.
+
+        Args:
+            prefix (str): text typed by user
+            limit (int): maximum number of expenses
+
+        Returns:
+            list[ExpenseUsage]: expenses ordered by number of transactions descending
+        """
+        prefix = " ".join(prefix.casefold().split())
+        if not prefix:
+            positions = range(len(self.expenses))
+        else:
+            start = bisect_left(self._keys, prefix)
+            # Keys with prefix are before the first key greater than all of them
+            end = bisect_left(self._keys, prefix + "\U0010ffff", start)
+            positions = set(self._key_positions[start:end])
+        return [
+            self.expenses[position]
+            for position in heapq.nlargest(
+                limit,
+                positions,
+                key=lambda position: self.expenses[position].transactions_number,
+            )
+        ]
+
+
+class PrefixIndexCache:
+    """A class used to represent cache of users' prefix indexes by Telegram ID, so
+    warm index is used without query of local user. Cache is bounded by total number
+    of keys of all indexes: least recently used indexes are evicted when limit is
+    exceeded.
+    """
+
+    def __init__(self, max_keys: int = 1_000_000):
+        self.max_keys = max_keys
+        self.keys_number = 0
+        self._users: OrderedDict[int, PrefixIndex] = OrderedDict()
+
+    def get(self, telegram_id: int) -> Optional[PrefixIndex]:
+        index = self._users.get(telegram_id)
+        if index is not None:
+            self._users.move_to_end(telegram_id)
+        return index
+
+    def set(self, telegram_id: int, expenses: list[ExpenseUsage]) -> PrefixIndex:
+        self.invalidate(telegram_id)
+        index = PrefixIndex(expenses)
+        self._users[telegram_id] = index
+        self.keys_number += len(index)
+        self._evict()
+        return index
+
+    def record(self, telegram_id: int, expense_name: str, cost: float) -> None:
+        """Count new transaction in index of user if index was built."""
+        index = self._users.get(telegram_id)
+        if index is not None:
+            keys_number = len(index)
+            index.record(expense_name, cost)
+            self.keys_number += len(index) - keys_number
+            self._evict()
+
+    def invalidate(self, telegram_id: int) -> None:
+        index = self._users.pop(telegram_id, None)
+        if index is not None:
+            self.keys_number -= len(index)
+
+    def _evict(self) -> None:
+        # The most recent index is kept even if it exceeds limit alone
+        while self.keys_number > self.max_keys and len(self._users) > 1:
+            _, index = self._users.popitem(last=False)
+            self.keys_number -= len(index)
+
+
+prefix_indexes = PrefixIndexCache()
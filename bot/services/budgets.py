@@ -0,0 +1,36 @@
+from enum import Enum
+from typing import Optional
+
+from bot.database.db_models import CategoryBudget
+
+BUDGET_WARNING_SHARE = 0.8
+
+
+class BudgetAlert(str, Enum):
+    """Alert about category budget, value is key of message in lexicon."""
+
+    WARNING = "budget_warning"
+    EXCEEDED = "budget_exceeded"
+
+
+def get_budget_alert(
+    budget: CategoryBudget, transaction_total: float
+) -> Optional[BudgetAlert]:
+    """Check if transaction made month total of category cross 80% or 100% of budget.
+    Alert is given only once: for transaction which crossed threshold.
+
+    Args:
+        budget (CategoryBudget): budget of category with month total including
+            transaction
+        transaction_total (float): total of added transaction
+
+    Returns:
+        Optional[BudgetAlert]: alert of the highest crossed threshold
+    """
+    previous_total = budget.total - transaction_total
+    if previous_total < budget.monthly_limit <= budget.total:
+        return BudgetAlert.EXCEEDED
+    warning_total = budget.monthly_limit * BUDGET_WARNING_SHARE
+    if previous_total < warning_total <= budget.total:
+        return BudgetAlert.WARNING
+    return None
@@ -0,0 +1,196 @@
+import asyncio
+import io
+import logging
+import multiprocessing
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Callable, Optional
+
+from bot.monitoring.metrics import CHART_CACHE_REQUESTS, CHART_RENDER_LATENCY
+
+logger = logging.getLogger(__name__)
+
+PIE_MAX_SLICES = 8
+CHART_SIZE = (8, 6)
+CHART_DPI = 100
+
+
+@dataclass(slots=True, frozen=True)
+class ChartKey:
+    """Chart of user statistic without data version: one cached chart per key."""
+
+    user_id: int
+    chart: str
+    period: str
+
+
+def _init_worker() -> None:
+    """Import matplotlib once per worker process, not on the first chart."""
+    import matplotlib
+
+    matplotlib.use("Agg")
+    import matplotlib.figure  # noqa: F401
+
+
+def _save_figure(figure) -> bytes:
+    buffer = io.BytesIO()
+    figure.savefig(buffer, format="png")
+    return buffer.getvalue()
+
+
+def render_pie_chart(
+    title: str, labels: list[str], values: list[float], other_label: str
+) -> bytes:
+    """Render pie chart to PNG. Slices after PIE_MAX_SLICES largest ones are joined to
+    one slice. Function is called in worker process.
+
+    Args:
+        title (str): title of chart
+        labels (list[str]): labels of slices ordered by value descending
+        values (list[float]): values of slices
+        other_label (str): label of slice with joined small values
+
+    Returns:
+        bytes: PNG image
+    """
+    from matplotlib.figure import Figure
+
+    if len(values) > PIE_MAX_SLICES:
+        labels = [*labels[: PIE_MAX_SLICES - 1], other_label]
+        values = [*values[: PIE_MAX_SLICES - 1], sum(values[PIE_MAX_SLICES - 1 :])]
+
+    figure = Figure(figsize=CHART_SIZE, dpi=CHART_DPI, layout="tight")
+    axes = figure.add_subplot()
+    axes.pie(
+        values, labels=labels, autopct="%1.0f%%", startangle=90, counterclock=False
+    )
+    axes.set_title(title)
+    axes.axis("equal")
+    return _save_figure(figure)
+
+
+def render_bar_chart(title: str, labels: list[str], values: list[float]) -> bytes:
+    """Render bar chart to PNG with value above each bar. Function is called in worker
+    process.
+
+    Args:
+        title (str): title of chart
+        labels (list[str]): labels of bars
+        values (list[float]): heights of bars
+
+    Returns:
+        bytes: PNG image
+    """
+    from matplotlib.figure import Figure
+
+    figure = Figure(figsize=CHART_SIZE, dpi=CHART_DPI, layout="tight")
+    axes = figure.add_subplot()
+    bars = axes.bar(labels, values)
+    axes.bar_label(bars, fmt="%.0f")
+    axes.set_title(title)
+    axes.tick_params(axis="x", labelrotation=45)
+    return _save_figure(figure)
+
+
+class ChartService:
+    """Service to render statistic charts in process pool, so event loop isn't blocked
+    by matplotlib. Telegram file_id of sent chart is cached with data version of user:
+    chart of unchanged data is neither rendered nor uploaded again. Concurrent requests
+    of the same chart wait for one rendering.
+    """
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 4096):
+        self.max_workers = max_workers
+        self.cache_size = cache_size
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._file_ids: OrderedDict[ChartKey, tuple[int, str]] = OrderedDict()
+        self._rendering: dict[tuple[ChartKey, int], asyncio.Future[bytes]] = {}
+
+    def get_file_id(self, key: ChartKey, data_version: int) -> Optional[str]:
+        """Get Telegram file_id of chart sent earlier for the same data.
+
+        Args:
+            key (ChartKey): user, chart and period
+            data_version (int): current data version of user
+
+        Returns:
+            Optional[str]: file_id if chart of this data version was sent
+        """
+        cached = self._file_ids.get(key)
+        if cached is None or cached[0] != data_version:
+            CHART_CACHE_REQUESTS.inc("miss")
+            return None
+        self._file_ids.move_to_end(key)
+        CHART_CACHE_REQUESTS.inc("hit")
+        return cached[1]
+
+    def set_file_id(self, key: ChartKey, data_version: int, file_id: str) -> None:
+        """Remember Telegram file_id of sent chart, chart of older data is replaced.
+
+        Args:
+            key (ChartKey): user, chart and period
+            data_version (int): data version of user used for chart
+            file_id (str): file_id of uploaded photo
+        """
+        self._file_ids[key] = (data_version, file_id)
+        self._file_ids.move_to_end(key)
+        if len(self._file_ids) > self.cache_size:
+            self._file_ids.popitem(last=False)
+
+    async def render(
+        self,
+        key: ChartKey,
+        data_version: int,
+        renderer: Callable[..., bytes],
+        *args,
+    ) -> bytes:
+        """Render chart in worker process.
+
+        Args:
+            key (ChartKey): user, chart and period
+            data_version (int): data version of user used for chart
+            renderer (Callable[..., bytes]): module level function which returns PNG
+            *args: picklable arguments of renderer
+
+        Returns:
+            bytes: PNG image
+        """
+        rendering_key = (key, data_version)
+        future = self._rendering.get(rendering_key)
+        if future is None:
+            future = asyncio.ensure_future(self._render(key, renderer, *args))
+            self._rendering[rendering_key] = future
+            future.add_done_callback(lambda _: self._rendering.pop(rendering_key, None))
+        return await asyncio.shield(future)
+
+    async def _render(
+        self, key: ChartKey, renderer: Callable[..., bytes], *args
+    ) -> bytes:
+        if self._executor is None:
+            # Workers are spawned: forked copy of event loop process with running
+            # threads can deadlock
+            self._executor = ProcessPoolExecutor(
+                self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+            )
+        started = perf_counter()
+        image = await asyncio.get_running_loop().run_in_executor(
+            self._executor, renderer, *args
+        )
+        duration = perf_counter() - started
+        CHART_RENDER_LATENCY.observe(duration, key.chart)
+        logger.info(
+            "Chart %s for user #%s was rendered in %.0f ms.",
+            key.chart,
+            key.user_id,
+            duration * 1000,
+        )
+        return image
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
@@ -0,0 +1,227 @@
+import asyncio
+import logging
+from datetime import date, datetime, timedelta
+from enum import Enum
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError,
+    TelegramBadRequest,
+    TelegramForbiddenError,
+    TelegramRetryAfter,
+)
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import bot.database.db_digest_requests as db
+from bot.database.db_models import Digest
+from bot.lexicon.catalog import Translator
+from bot.monitoring.metrics import DIGESTS_SENT
+
+logger = logging.getLogger(__name__)
+
+TOP_CATEGORIES = 5
+# Bad request of deleted or never started chat, other bad requests are retried
+CHAT_NOT_FOUND = "chat not found"
+
+
+class DigestResult(str, Enum):
+    SENT = "sent"
+    EMPTY = "empty"
+    BLOCKED = "blocked"
+    FAILED = "failed"
+
+
+def next_digest_date(period: str, today: date) -> date:
+    """Get the first day of the next digest period: tomorrow, the next Monday or the
+    first day of the next month.
+
+    Args:
+        period (str): period of digest (day, week, month)
+        today (date): current date
+
+    Returns:
+        date: day since which digest for the current period is due
+    """
+    if period == "day":
+        return today + timedelta(days=1)
+    if period == "week":
+        return today + timedelta(days=7 - today.weekday())
+    return (today.replace(day=1) + timedelta(days=32)).replace(day=1)
+
+
+def format_digest(digest: Digest, i18n: Translator) -> str:
+    """Format text of digest.
+
+    Args:
+        digest (Digest): digest with totals of period
+        i18n (Translator): lexicon of user locale
+
+    Returns:
+        str: text of message
+    """
+    last_date = digest.period_end - timedelta(days=1)
+    lines = [
+        i18n.format(
+            f"digest_{digest.period}_title",
+            start_date=digest.period_start.strftime("%d.%m.%Y"),
+            end_date=last_date.strftime("%d.%m.%Y"),
+        ),
+        i18n.format(
+            "digest_total",
+            total=round(digest.total, 2),
+            transactions_number=digest.transactions_number,
+        ),
+    ]
+    lines.extend(
+        i18n.format("digest_category", category_name=name, total=round(total, 2))
+        for name, total in digest.categories
+    )
+    return "\n".join(lines)
+
+
+class RateLimiter:
+    """Pacing of requests: calls of acquire are spread evenly at rate per second.
+    Telegram limits bots to about 30 messages per second to different users."""
+
+    def __init__(self, rate: float):
+        self.interval = 1 / rate
+        self._next_time = 0.0
+
+    async def acquire(self) -> None:
+        now = asyncio.get_running_loop().time()
+        wait = self._next_time - now
+        self._next_time = max(self._next_time, now) + self.interval
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def pause(self, seconds: float) -> None:
+        """Delay all next requests, e.g. when Telegram asked to retry later."""
+        now = asyncio.get_running_loop().time()
+        self._next_time = max(self._next_time, now + seconds)
+
+
+class DigestScheduler:
+    """Scheduler of spending digests. Every check_interval seconds (after digest_hour)
+    due digests are moved to outbox in batches by one statement per batch, then
+    digests from outbox are computed by one grouped query per batch and sent with rate
+    limit and bounded concurrency. Sent digests are deleted from outbox in the same
+    transaction which locked them, so unsent digests survive restart of bot.
+    """
+
+    def __init__(
+        self,
+        bot: Bot,
+        sessions_pool: async_sessionmaker[AsyncSession],
+        i18n: Translator,
+        digest_hour: int = 9,
+        rate: float = 25,
+        batch_size: int = 1000,
+        check_interval: float = 60,
+        max_concurrency: int = 8,
+    ):
+        self.bot = bot
+        self.sessions_pool = sessions_pool
+        self.i18n = i18n
+        self.digest_hour = digest_hour
+        self.batch_size = batch_size
+        self.check_interval = check_interval
+        self.rate_limiter = RateLimiter(rate)
+        # Send batch is locked while it's sent, it shouldn't be sent too long
+        self.send_batch_size = max(1, min(batch_size, int(rate * 5)))
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run(self) -> None:
+        """Check digests until task is cancelled."""
+        while True:
+            try:
+                await self.run_once(datetime.now())
+            except Exception:
+                logger.exception("Digests weren't processed.")
+            await asyncio.sleep(self.check_interval)
+
+    async def run_once(self, now: datetime) -> int:
+        """Claim due digests and send all digests from outbox.
+
+        Args:
+            now (datetime): current time
+
+        Returns:
+            int: number of processed digests
+        """
+        if now.hour >= self.digest_hour:
+            while True:
+                async with self.sessions_pool() as session:
+                    claimed = await db.claim_due_digests(
+                        session, now.date(), self.batch_size
+                    )
+                    await session.commit()
+                if claimed < self.batch_size:
+                    break
+
+        processed = 0
+        while True:
+            async with self.sessions_pool() as session:
+                digests = await db.get_pending_digests(
+                    session, self.send_batch_size, TOP_CATEGORIES
+                )
+                if not digests:
+                    break
+                results = await asyncio.gather(
+                    *(self._send_digest(digest) for digest in digests)
+                )
+
+                done_ids = []
+                blocked_user_ids = []
+                for digest, result in zip(digests, results):
+                    DIGESTS_SENT.inc(digest.period, result.value)
+                    if result != DigestResult.FAILED:
+                        done_ids.append(digest.digest_id)
+                    if result == DigestResult.BLOCKED:
+                        blocked_user_ids.append(digest.user_id)
+                if blocked_user_ids:
+                    await db.unsubscribe_users(session, blocked_user_ids)
+                if done_ids:
+                    await db.delete_digests(session, done_ids)
+                await session.commit()
+
+            processed += len(digests)
+            if len(done_ids) < len(digests):
+                # Failed digests stay in outbox until the next check
+                break
+        if processed:
+            logger.info("%s digests were processed.", processed)
+        return processed
+
+    async def _send_digest(self, digest: Digest) -> DigestResult:
+        if not digest.transactions_number:
+            return DigestResult.EMPTY
+
+        text = format_digest(digest, self.i18n)
+        async with self._semaphore:
+            for _ in range(2):
+                await self.rate_limiter.acquire()
+                try:
+                    await self.bot.send_message(digest.telegram_id, text)
+                    return DigestResult.SENT
+                except TelegramRetryAfter as e:
+                    self.rate_limiter.pause(e.retry_after)
+                except TelegramForbiddenError:
+                    logger.info("Digest #%s can't be delivered.", digest.digest_id)
+                    return DigestResult.BLOCKED
+                except TelegramBadRequest as e:
+                    if CHAT_NOT_FOUND in e.message.lower():
+                        logger.info(
+                            "Chat of digest #%s wasn't found.", digest.digest_id
+                        )
+                        return DigestResult.BLOCKED
+                    # Error of the message itself mustn't unsubscribe user
+                    logger.warning(
+                        "Digest #%s wasn't sent.", digest.digest_id, exc_info=True
+                    )
+                    return DigestResult.FAILED
+                except TelegramAPIError:
+                    logger.warning(
+                        "Digest #%s wasn't sent.", digest.digest_id, exc_info=True
+                    )
+                    return DigestResult.FAILED
+        return DigestResult.FAILED
@@ -0,0 +1,124 @@
+from collections import OrderedDict, defaultdict
+from typing import Optional
+
+from bot.database.db_models import ExpenseCategory
+
+# Minimal trigram similarity of suggested expense, "Коффе" is similar to "Кофе" by
+# 0.57, "Кофемашина" by 0.33
+SIMILARITY_THRESHOLD = 0.4
+
+
+def get_trigrams(name: str) -> frozenset[str]:
+    """Get trigrams of name padded like in pg_trgm: two spaces before and one after.
+
+    Args:
+        name (str): name of expense
+
+    Returns:
+        frozenset[str]: unique trigrams of case-folded name
+    """
+    padded = f"  {name.casefold()} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+class ExpenseIndex:
+    """A class used to represent trigram index of expenses of one user. Each trigram
+    refers to positions of expenses which contain it, so search of similar name
+    counts common trigrams only of expenses which share at least one trigram.
+    """
+
+    __slots__ = ("expenses", "_names", "_trigrams", "_postings")
+
+    def __init__(self, expenses: list[ExpenseCategory]):
+        self.expenses: list[ExpenseCategory] = []
+        self._names: set[str] = set()
+        self._trigrams: list[frozenset[str]] = []
+        self._postings: defaultdict[str, list[int]] = defaultdict(list)
+        for expense in expenses:
+            self.add(expense)
+
+    def add(self, expense: ExpenseCategory) -> None:
+        """Add expense to index, expense with already indexed name is ignored.
+
+        Args:
+            expense (ExpenseCategory): expense with its category
+        """
+        name = expense.expense_name.casefold()
+        if name in self._names:
+            return
+        self._names.add(name)
+        position = len(self.expenses)
+        trigrams = get_trigrams(expense.expense_name)
+        self.expenses.append(expense)
+        self._trigrams.append(trigrams)
+        postings = self._postings
+        for trigram in trigrams:
+            postings[trigram].append(position)
+
+    def closest(self, expense_name: str) -> Optional[ExpenseCategory]:
+        """Find expense with the most similar name: the largest share of common
+        trigrams among all trigrams of both names.
+
+        Args:
+            expense_name (str): name of expense which wasn't found
+
+        Returns:
+            Optional[ExpenseCategory]: the most similar expense if its similarity
+                isn't less than SIMILARITY_THRESHOLD else None
+        """
+        trigrams = get_trigrams(expense_name)
+        common: dict[int, int] = {}
+        for trigram in trigrams:
+            for position in self._postings.get(trigram, ()):
+                common[position] = common.get(position, 0) + 1
+
+        best_position = None
+        best_similarity = SIMILARITY_THRESHOLD
+        for position, common_number in common.items():
+            similarity = common_number / (
+                len(trigrams) + len(self._trigrams[position]) - common_number
+            )
+            if similarity >= best_similarity:
+                if similarity == best_similarity and best_position is not None:
+                    continue
+                best_position = position
+                best_similarity = similarity
+        if best_position is None:
+            return None
+        return self.expenses[best_position]
+
+
+class ExpenseIndexCache:
+    """A class used to represent LRU cache of users' expense indexes. Index is built
+    on the first search and updated when user adds expense.
+    """
+
+    def __init__(self, max_users: int = 10000):
+        self.max_users = max_users
+        self._users: OrderedDict[int, ExpenseIndex] = OrderedDict()
+
+    def get(self, user_id: int) -> Optional[ExpenseIndex]:
+        index = self._users.get(user_id)
+        if index is not None:
+            self._users.move_to_end(user_id)
+        return index
+
+    def set(self, user_id: int, expenses: list[ExpenseCategory]) -> ExpenseIndex:
+        index = ExpenseIndex(expenses)
+        self._users[user_id] = index
+        self._users.move_to_end(user_id)
+        if len(self._users) > self.max_users:
+            self._users.popitem(last=False)
+        return index
+
+    def add(self, user_id: int, expense: ExpenseCategory) -> None:
+        """Add new expense to index of user if index was built."""
+        index = self._users.get(user_id)
+        if index is not None:
+            index.add(expense)
+
+    def invalidate(self, user_id: int) -> None:
+        self._users.pop(user_id, None)
+
+
+expense_indexes = ExpenseIndexCache()
@@ -0,0 +1,327 @@
+import asyncio
+import calendar
+import logging
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date
+from time import perf_counter
+from typing import Optional
+
+import numpy as np
+
+from bot.database.db_models import TransactionHistory
+from bot.lexicon.catalog import Translator
+
+logger = logging.getLogger(__name__)
+
+HISTORY_MONTHS = 12
+MOVING_AVERAGE_MONTHS = 3
+# Modified z-score of outlier (Iglewicz and Hoaglin), MAD based score is robust to
+# the outliers themselves
+OUTLIER_SCORE = 3.5
+OUTLIER_MIN_TRANSACTIONS = 5
+TOP_CATEGORIES = 5
+TOP_OUTLIERS = 5
+UNIX_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+
+@dataclass(slots=True, frozen=True)
+class CategoryTrend:
+    category_name: str
+    month_total: float
+    moving_average: float
+
+
+@dataclass(slots=True, frozen=True)
+class Outlier:
+    created_date: date
+    expense_name: str
+    total: float
+    score: float
+
+
+@dataclass(slots=True, frozen=True)
+class Insights:
+    month_total: float
+    forecast: float
+    previous_month_total: float
+    # Change of the previous month relative to the month before it, None if there
+    # were no expenses in the month before
+    month_over_month: Optional[float]
+    categories: list[CategoryTrend]
+    outliers: list[Outlier]
+
+
+def _month_index(dates: np.ndarray) -> np.ndarray:
+    return dates.astype("datetime64[M]").astype(np.int64)
+
+
+def compute_insights(
+    history: TransactionHistory, category_names: dict[int, str], today: date
+) -> Insights:
+    """Compute spending analytics from transaction history with vectorized NumPy
+    operations: totals by category and month, moving averages, month-over-month
+    change, outliers by modified z-score within category and forecast of the current
+    month. Function doesn't touch event loop and is called in executor.
+
+    Args:
+        history (TransactionHistory): transactions of the last HISTORY_MONTHS months
+            and the current month
+        category_names (dict[int, str]): names of user categories by ID
+        today (date): current date
+
+    Returns:
+        Insights: analytics of user spending
+    """
+    dates = np.array(history.days, dtype=np.int64).astype("datetime64[D]")
+    totals = np.array(history.totals, dtype=np.float64)
+    category_ids, category_index = np.unique(
+        np.array(history.category_ids, dtype=np.int64), return_inverse=True
+    )
+    categories_number = len(category_ids)
+
+    # Matrix of totals: row is category, column is month, the last column is current
+    current_month = _month_index(np.array([today], dtype="datetime64[D]"))[0]
+    months_number = HISTORY_MONTHS + 1
+    month_column = _month_index(dates) - (current_month - HISTORY_MONTHS)
+    in_period = (month_column >= 0) & (month_column < months_number)
+    matrix = np.bincount(
+        category_index[in_period] * months_number + month_column[in_period],
+        weights=totals[in_period],
+        minlength=categories_number * months_number,
+    ).reshape(categories_number, months_number)
+    monthly_totals = matrix.sum(axis=0)
+
+    # Moving averages of complete months by cumulative sums
+    complete = np.cumsum(matrix[:, :-1], axis=1)
+    window_sums = complete[:, MOVING_AVERAGE_MONTHS - 1 :] - np.pad(
+        complete[:, :-MOVING_AVERAGE_MONTHS], ((0, 0), (1, 0))
+    )
+    moving_averages = window_sums / MOVING_AVERAGE_MONTHS
+    last_moving_average = moving_averages[:, -1]
+
+    previous_month_total = float(monthly_totals[-2])
+    before_previous_total = float(monthly_totals[-3])
+    month_over_month = None
+    if before_previous_total > 0:
+        month_over_month = previous_month_total / before_previous_total - 1
+
+    # Forecast: daily rate of the current month is blended with historical daily
+    # rate, weight of current rate grows with elapsed part of month
+    month_total = float(monthly_totals[-1])
+    days_in_month = calendar.monthrange(today.year, today.month)[1]
+    elapsed_share = today.day / days_in_month
+    historical_daily = last_moving_average.sum() / (365.25 / 12)
+    current_daily = month_total / today.day
+    daily_rate = elapsed_share * current_daily + (1 - elapsed_share) * historical_daily
+    forecast = month_total + daily_rate * (days_in_month - today.day)
+
+    order = np.argsort(-(matrix[:, -1] + last_moving_average))[:TOP_CATEGORIES]
+    categories = [
+        CategoryTrend(
+            category_names.get(int(category_ids[i]), "-"),
+            float(matrix[i, -1]),
+            float(last_moving_average[i]),
+        )
+        for i in order
+        if matrix[i, -1] or last_moving_average[i]
+    ]
+
+    outliers = [
+        Outlier(
+            date.fromordinal(UNIX_EPOCH_ORDINAL + history.days[i]),
+            history.expense_names[i],
+            float(totals[i]),
+            float(score),
+        )
+        for i, score in _find_outliers(
+            totals, category_index, categories_number, dates, current_month
+        )
+    ]
+    return Insights(
+        month_total,
+        float(forecast),
+        previous_month_total,
+        month_over_month,
+        categories,
+        outliers,
+    )
+
+
+def _group_medians(
+    values: np.ndarray, groups: np.ndarray, groups_number: int
+) -> tuple[np.ndarray, np.ndarray]:
+    """Medians of values by group without Python loop: values are sorted by group and
+    value, middle elements are taken by group offsets."""
+    order = np.lexsort((values, groups))
+    sorted_values = values[order]
+    counts = np.bincount(groups, minlength=groups_number)
+    starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    safe_counts = np.maximum(counts, 1)
+    last = len(values) - 1
+    lower = sorted_values[np.minimum(starts + (safe_counts - 1) // 2, last)]
+    upper = sorted_values[np.minimum(starts + safe_counts // 2, last)]
+    return (lower + upper) / 2, counts
+
+
+def _find_outliers(
+    totals: np.ndarray,
+    category_index: np.ndarray,
+    categories_number: int,
+    dates: np.ndarray,
+    current_month: int,
+) -> list[tuple[int, float]]:
+    """Transactions of the current month which are outliers within their category."""
+    if not len(totals):
+        return []
+    medians, counts = _group_medians(totals, category_index, categories_number)
+    deviations = np.abs(totals - medians[category_index])
+    mads, _ = _group_medians(deviations, category_index, categories_number)
+
+    # Category where at least half of transactions have the same price has zero MAD,
+    # its score is computed by mean absolute deviation (Iglewicz and Hoaglin)
+    mean_deviations = np.bincount(
+        category_index, weights=deviations, minlength=categories_number
+    ) / np.maximum(counts, 1)
+    scales = np.where(mads > 0, mads / 0.6745, mean_deviations * 1.253314)
+    transaction_scales = scales[category_index]
+    scores = np.zeros_like(totals)
+    valid = (transaction_scales > 0) & (
+        counts[category_index] >= OUTLIER_MIN_TRANSACTIONS
+    )
+    scores[valid] = (
+        totals[valid] - medians[category_index][valid]
+    ) / transaction_scales[valid]
+    candidates = np.flatnonzero(
+        (scores > OUTLIER_SCORE) & (_month_index(dates) == current_month)
+    )
+    candidates = candidates[np.argsort(-scores[candidates])][:TOP_OUTLIERS]
+    return [(int(i), float(scores[i])) for i in candidates]
+
+
+def format_insights(insights: Insights, i18n: Translator) -> str:
+    """Format text of insights message.
+
+    Args:
+        insights (Insights): analytics of user spending
+        i18n (Translator): lexicon of user locale
+
+    Returns:
+        str: text of message
+    """
+    lines = [
+        i18n.format(
+            "insights_month",
+            month_total=round(insights.month_total, 2),
+            forecast=round(insights.forecast, 2),
+        )
+    ]
+    if insights.month_over_month is None:
+        lines.append(
+            i18n.format(
+                "insights_previous_month", total=round(insights.previous_month_total, 2)
+            )
+        )
+    else:
+        lines.append(
+            i18n.format(
+                "insights_previous_month_change",
+                total=round(insights.previous_month_total, 2),
+                change=f"{insights.month_over_month * 100:+.0f}",
+            )
+        )
+    if insights.categories:
+        lines.append("")
+        lines.append(i18n["insights_categories_header"])
+        lines.extend(
+            i18n.format(
+                "insights_category",
+                category_name=trend.category_name,
+                month_total=round(trend.month_total, 2),
+                moving_average=round(trend.moving_average, 2),
+            )
+            for trend in insights.categories
+        )
+    if insights.outliers:
+        lines.append("")
+        lines.append(i18n["insights_outliers_header"])
+        lines.extend(
+            i18n.format(
+                "insights_outlier",
+                created_date=outlier.created_date.strftime("%d.%m.%Y"),
+                expense_name=outlier.expense_name,
+                total=round(outlier.total, 2),
+            )
+            for outlier in insights.outliers
+        )
+    return "\n".join(lines)
+
+
+class InsightsService:
+    """Service to compute spending analytics in thread pool, NumPy releases GIL in
+    heavy operations, so event loop isn't blocked. Results are cached by user with
+    data version and date: they are computed again only after user transactions
+    were changed or day was changed.
+    """
+
+    def __init__(self, max_workers: int = 2, cache_size: int = 4096):
+        self.cache_size = cache_size
+        self._executor = ThreadPoolExecutor(max_workers, thread_name_prefix="insights")
+        self._cache: OrderedDict[int, tuple[int, date, Insights]] = OrderedDict()
+
+    def get(self, user_id: int, data_version: int, today: date) -> Optional[Insights]:
+        """Get cached insights computed for the same data version and date.
+
+        Args:
+            user_id (int): local user ID in db
+            data_version (int): current data version of user
+            today (date): current date
+
+        Returns:
+            Optional[Insights]: insights if they were computed for this data
+        """
+        cached = self._cache.get(user_id)
+        if cached is None or cached[:2] != (data_version, today):
+            return None
+        self._cache.move_to_end(user_id)
+        return cached[2]
+
+    async def compute(
+        self,
+        user_id: int,
+        data_version: int,
+        today: date,
+        history: TransactionHistory,
+        category_names: dict[int, str],
+    ) -> Insights:
+        """Compute insights in executor and cache them.
+
+        Args:
+            user_id (int): local user ID in db
+            data_version (int): data version of user used for history
+            today (date): current date
+            history (TransactionHistory): transactions of user
+            category_names (dict[int, str]): names of user categories by ID
+
+        Returns:
+            Insights: analytics of user spending
+        """
+        started = perf_counter()
+        insights = await asyncio.get_running_loop().run_in_executor(
+            self._executor, compute_insights, history, category_names, today
+        )
+        logger.info(
+            "Insights for user #%s were computed from %s transactions in %.1f ms.",
+            user_id,
+            len(history.totals),
+            (perf_counter() - started) * 1000,
+        )
+        self._cache[user_id] = (data_version, today, insights)
+        self._cache.move_to_end(user_id)
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return insights
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,185 @@
+import asyncio
+import calendar
+import heapq
+import logging
+from datetime import date, datetime, timedelta
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+import bot.database.db_recurring_requests as db
+from bot.database.db_models import RecurringTransaction
+from bot.services.autocomplete import prefix_indexes
+
+logger = logging.getLogger(__name__)
+
+RECURRING_PERIODS = ("day", "week", "month")
+# Postings before today are caught up at once, first date is limited to keep it small
+MAX_FIRST_DATE_AGE_DAYS = 31
+
+
+def next_recurring_date(period: str, current: date, anchor_day: int) -> date:
+    """Get date of posting after the current one. Monthly posting keeps day of month
+    of the first posting, in shorter months it is moved to the last day.
+
+    Args:
+        period (str): period of posting (day, week, month)
+        current (date): date of the current posting
+        anchor_day (int): day of month of the first posting
+
+    Returns:
+        date: date of the next posting
+    """
+    if period == "day":
+        return current + timedelta(days=1)
+    if period == "week":
+        return current + timedelta(days=7)
+    year, month = divmod(current.year * 12 + current.month, 12)
+    month += 1
+    return date(year, month, min(anchor_day, calendar.monthrange(year, month)[1]))
+
+
+def get_postings(
+    template: RecurringTransaction, today: date
+) -> tuple[list[dict], date]:
+    """Get all postings of template which are due till today, postings missed while
+    bot was stopped are included with their own dates.
+
+    Args:
+        template (RecurringTransaction): due template
+        today (date): current date
+
+    Returns:
+        tuple[list[dict], date]: values of transactions and the next date of template
+    """
+    transactions = []
+    posting_date = template.next_date
+    while posting_date <= today:
+        transactions.append(
+            {
+                "expense_id": template.expense_id,
+                "cost": template.cost,
+                "amount": template.amount,
+                "comment": template.comment,
+                "created_date": posting_date,
+            }
+        )
+        posting_date = next_recurring_date(
+            template.period, posting_date, template.anchor_day
+        )
+    return transactions, posting_date
+
+
+class RecurringScheduler:
+    """Scheduler of recurring transactions. Dates of the next postings are kept in
+    heap: scheduler sleeps until the earliest date or until a new template is
+    scheduled, it doesn't poll database. Due templates are posted in batches by bulk
+    insert of transactions, missed postings are caught up after downtime. Persistent
+    order of templates is the index of next_date, heap is refilled from it after
+    every run. Due templates locked by another replica are retried after
+    retry_interval seconds.
+    """
+
+    def __init__(
+        self,
+        sessions_pool: async_sessionmaker[AsyncSession],
+        batch_size: int = 1000,
+        retry_interval: float = 60,
+    ):
+        self.sessions_pool = sessions_pool
+        self.batch_size = batch_size
+        self.retry_interval = retry_interval
+        self._heap: list[date] = []
+        self._wakeup = asyncio.Event()
+
+    def schedule(self, next_date: date) -> None:
+        """Wake scheduler on the date, e.g. after a template was added.
+
+        Args:
+            next_date (date): date of posting
+        """
+        if not self._heap or next_date < self._heap[0]:
+            self._wakeup.set()
+        heapq.heappush(self._heap, next_date)
+
+    async def run(self) -> None:
+        """Post due templates until task is cancelled. Templates due while bot was
+        stopped are posted right after start."""
+        await self._schedule_next()
+        while True:
+            delay = self._seconds_until_due(datetime.now())
+            if delay is None or delay > 0:
+                self._wakeup.clear()
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+
+            today = date.today()
+            while self._heap and self._heap[0] <= today:
+                heapq.heappop(self._heap)
+            try:
+                posted = await self.run_once(today)
+                await self._schedule_next()
+            except Exception:
+                logger.exception("Recurring transactions weren't posted.")
+                # Retry of failed run isn't lost, but database isn't hammered
+                self.schedule(today)
+                await asyncio.sleep(self.retry_interval)
+                continue
+            if not posted and self._heap and self._heap[0] <= today:
+                # Due templates are locked and being posted by another replica
+                logger.debug("Due recurring transactions are locked, retry later.")
+                await asyncio.sleep(self.retry_interval)
+
+    def _seconds_until_due(self, now: datetime) -> Optional[float]:
+        if not self._heap:
+            return None
+        due_time = datetime.combine(self._heap[0], datetime.min.time())
+        return max((due_time - now).total_seconds(), 0)
+
+    async def _schedule_next(self) -> None:
+        async with self.sessions_pool() as session:
+            next_date = await db.get_next_recurring_date(session)
+        if next_date is not None:
+            self.schedule(next_date)
+
+    async def run_once(self, today: date) -> int:
+        """Post all due templates by batches.
+
+        Args:
+            today (date): current date
+
+        Returns:
+            int: number of posted transactions
+        """
+        posted = 0
+        while True:
+            async with self.sessions_pool() as session:
+                templates = await db.lock_due_recurring(session, today, self.batch_size)
+                transactions = []
+                next_dates = []
+                for template in templates:
+                    template_transactions, next_date = get_postings(template, today)
+                    transactions.extend(template_transactions)
+                    next_dates.append(
+                        {"recurring_id": template.recurring_id, "next_date": next_date}
+                    )
+                if templates:
+                    telegram_ids = await db.post_recurring(
+                        session,
+                        transactions,
+                        next_dates,
+                        {template.user_id for template in templates},
+                    )
+                    await session.commit()
+                    # Last costs and counts of autocomplete are rebuilt on demand
+                    for telegram_id in telegram_ids:
+                        prefix_indexes.invalidate(telegram_id)
+            posted += len(transactions)
+            if len(templates) < self.batch_size:
+                break
+        if posted:
+            logger.info("%s recurring transactions were posted.", posted)
+        return posted
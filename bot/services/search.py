@@ -0,0 +1,102 @@
+import html
+import re
+from typing import Optional
+
+from bot.database.db_models import SearchResult
+from bot.database.db_search_requests import HIGHLIGHT_START, HIGHLIGHT_STOP
+from bot.lexicon.catalog import Translator
+
+# Trigram index can't serve patterns shorter than one trigram
+MIN_QUERY_LENGTH = 3
+MAX_QUERY_LENGTH = 50
+
+_HIGHLIGHT_MARKS_RE = re.compile(f"[{HIGHLIGHT_START}{HIGHLIGHT_STOP}]")
+
+
+def normalize_query(text: str) -> Optional[str]:
+    """Normalize search query: whitespaces are collapsed.
+
+    Args:
+        text (str): text from user
+
+    Returns:
+        Optional[str]: query if its length is correct else None
+    """
+    query = " ".join(text.split())
+    if not MIN_QUERY_LENGTH <= len(query) <= MAX_QUERY_LENGTH:
+        return None
+    return query
+
+
+def compile_highlight(query: str) -> re.Pattern:
+    """Compile pattern of query words, longer words are matched first. Pattern finds
+    substring matches, words in other forms are marked by database.
+
+    Args:
+        query (str): normalized search query
+
+    Returns:
+        re.Pattern: case-insensitive pattern of any query word
+    """
+    words = sorted(set(query.split()), key=len, reverse=True)
+    return re.compile("|".join(map(re.escape, words)), re.IGNORECASE)
+
+
+def _highlight_words(text: str, pattern: re.Pattern) -> str:
+    parts = []
+    position = 0
+    for match in pattern.finditer(text):
+        parts.append(html.escape(text[position : match.start()]))
+        parts.append(f"<b>{html.escape(match.group())}</b>")
+        position = match.end()
+    parts.append(html.escape(text[position:]))
+    return "".join(parts)
+
+
+def highlight(text: str, pattern: re.Pattern) -> str:
+    """Escape text for HTML message and make matches bold: words marked by database
+    headline and substrings matched by pattern of query words.
+
+    Args:
+        text (str): name or comment of transaction with headline marks
+        pattern (re.Pattern): pattern of query words
+
+    Returns:
+        str: HTML text
+    """
+    # Marks alternate, so odd parts are words marked by database
+    parts = _HIGHLIGHT_MARKS_RE.split(text)
+    return "".join(
+        f"<b>{html.escape(part)}</b>" if i % 2 else _highlight_words(part, pattern)
+        for i, part in enumerate(parts)
+    )
+
+
+def format_search_results(
+    results: list[SearchResult], query: str, i18n: Translator
+) -> str:
+    """Format page of search results with highlighted matches.
+
+    Args:
+        results (list[SearchResult]): found transactions
+        query (str): normalized search query
+        i18n (Translator): lexicon of user locale
+
+    Returns:
+        str: text of message
+    """
+    pattern = compile_highlight(query)
+    lines = [i18n.format("search_header", query=html.escape(query))]
+    for result in results:
+        line = i18n.format(
+            "search_item",
+            created_date=result.created_date.strftime("%d.%m.%Y"),
+            expense_name=highlight(result.expense_name, pattern),
+            total=round(result.cost * result.amount, 2),
+        )
+        if result.comment and result.comment != "-":
+            line += i18n.format(
+                "search_item_comment", comment=highlight(result.comment, pattern)
+            )
+        lines.append(line)
+    return "\n".join(lines)
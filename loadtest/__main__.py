@@ -0,0 +1,141 @@
+"""End-to-end load test of the bot against local stand-in for Telegram Bot API.
+
+The bot is started as a separate process (``python -m bot``) with ``BOT_API_SERVER``
+pointed to the fake server, thousands of simulated users walk real FSM flows and the
+report contains throughput, handler latency and DB queries per update.
+
+Usage:
+    python -m loadtest --users 2000 --transactions 5
+"""
+
+import argparse
+import asyncio
+import os
+import signal
+import sys
+import time
+from typing import Optional
+
+import asyncpg
+
+from bot.config_data.configreader import config
+from loadtest.fake_api import FakeBotAPI
+from loadtest.users import SimulatedUser, run_users
+
+FAKE_BOT_TOKEN = "100000001:LOAD-TEST-TOKEN"
+
+PG_STAT_STATEMENTS_QUERY = (
+    "SELECT coalesce(sum(calls), 0) FROM pg_stat_statements s "
+    "JOIN pg_database d ON d.oid = s.dbid WHERE d.datname = current_database()"
+)
+PG_STAT_DATABASE_QUERY = (
+    "SELECT xact_commit + xact_rollback FROM pg_stat_database "
+    "WHERE datname = current_database()"
+)
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--transactions", type=int, default=3)
+    parser.add_argument("--correct-probability", type=float, default=0.2)
+    parser.add_argument("--reply-timeout", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument(
+        "--user-id-base",
+        type=int,
+        default=int(time.time()) * 1000,
+        help="first simulated Telegram ID, by default new users are used every run",
+    )
+    parser.add_argument("--postgres-dsn", default=config.postgres_dsn)
+    parser.add_argument("--fsm-storage", default="memory", choices=["memory", "redis"])
+    return parser.parse_args()
+
+
+async def count_db_queries(dsn: str) -> tuple[Optional[int], str]:
+    """Get counter of executed statements from Postgres statistics.
+
+    Args:
+        dsn (str): PostgreSQL connection string
+
+    Returns:
+        tuple[Optional[int], str]: counter value and name of counted unit
+    """
+    conn = await asyncpg.connect(dsn.replace("+asyncpg", ""))
+    try:
+        try:
+            return await conn.fetchval(PG_STAT_STATEMENTS_QUERY), "queries"
+        except asyncpg.PostgresError:
+            # pg_stat_statements isn't installed, fall back to transactions counter
+            return await conn.fetchval(PG_STAT_DATABASE_QUERY), "transactions"
+    finally:
+        await conn.close()
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return float("nan")
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+async def start_bot(api: FakeBotAPI, args: argparse.Namespace):
+    env = {
+        **os.environ,
+        "BOT_TOKEN": FAKE_BOT_TOKEN,
+        "BOT_API_SERVER": api.base_url,
+        "BOT_FSM_STORAGE": args.fsm_storage,
+        "POSTGRES_DSN": args.postgres_dsn,
+    }
+    return await asyncio.create_subprocess_exec(
+        sys.executable, "-m", "bot", env=env, stdout=asyncio.subprocess.DEVNULL
+    )
+
+
+async def main() -> None:
+    args = parse_args()
+    api = FakeBotAPI(port=args.port)
+    await api.start()
+    bot_process = await start_bot(api, args)
+
+    try:
+        await asyncio.wait_for(api.bot_ready.wait(), timeout=60)
+        queries_before, unit = await count_db_queries(args.postgres_dsn)
+
+        users = [
+            SimulatedUser(
+                api,
+                args.user_id_base + i,
+                args.transactions,
+                args.correct_probability,
+                args.reply_timeout,
+            )
+            for i in range(args.users)
+        ]
+        started = time.perf_counter()
+        failed, error = await run_users(users)
+        elapsed = time.perf_counter() - started
+
+        queries_after, _ = await count_db_queries(args.postgres_dsn)
+    finally:
+        bot_process.send_signal(signal.SIGINT)
+        await bot_process.wait()
+        await api.stop()
+
+    answered = api.updates_answered
+    print(f"Simulated users:     {args.users} ({failed} failed)")
+    if error:
+        print(f"First error:         {error!r}")
+    print(
+        f"Updates answered:    {answered} of {api.updates_delivered} in {elapsed:.1f}s"
+    )
+    print(f"Throughput:          {answered / elapsed:.1f} updates/sec")
+    print(f"Handler latency p50: {percentile(api.latencies, 0.50) * 1000:.1f} ms")
+    print(f"Handler latency p99: {percentile(api.latencies, 0.99) * 1000:.1f} ms")
+    if answered:
+        per_update = (queries_after - queries_before) / answered
+        print(f"DB {unit} per update: {per_update:.2f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
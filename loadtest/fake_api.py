@@ -0,0 +1,166 @@
+import asyncio
+import json
+import time
+from collections import defaultdict
+from typing import Any, Optional
+
+from aiohttp import web
+
+BOT_USER = {
+    "id": 100000001,
+    "is_bot": True,
+    "first_name": "LoadTestBot",
+    "username": "load_test_bot",
+}
+
+
+class FakeBotAPI:
+    """A class used to represent local stand-in for Telegram Bot API server.
+
+    Simulated users put updates into the queue, the bot takes them with getUpdates
+    long polling and its answers (sendMessage, answerCallbackQuery) are routed back to
+    the inbox of the simulated user. Time between delivering an update to the bot and
+    the first answer for this update is recorded as handler latency.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8081):
+        self.host = host
+        self.port = port
+        self.bot_ready = asyncio.Event()
+        self.latencies: list[float] = []
+        self.updates_delivered = 0
+        self.updates_answered = 0
+
+        self._updates: asyncio.Queue[tuple[int, dict]] = asyncio.Queue()
+        self._inboxes: dict[int, asyncio.Queue[dict[str, Any]]] = defaultdict(
+            asyncio.Queue
+        )
+        self._delivered_at: dict[int, float] = {}
+        self._callback_chats: dict[str, int] = {}
+        self._update_id = 0
+        self._message_id = 0
+        self._runner: Optional[web.AppRunner] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        app = web.Application()
+        app.router.add_post("/bot{token}/{method}", self._handle_method)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+
+    async def stop(self) -> None:
+        if self._runner:
+            await self._runner.cleanup()
+
+    def inbox(self, chat_id: int) -> asyncio.Queue[dict[str, Any]]:
+        return self._inboxes[chat_id]
+
+    def next_message_id(self) -> int:
+        self._message_id += 1
+        return self._message_id
+
+    def push_message(self, user: dict[str, Any], text: str) -> None:
+        """Put update with text message from simulated user into the queue."""
+        message = {
+            "message_id": self.next_message_id(),
+            "date": int(time.time()),
+            "chat": {"id": user["id"], "type": "private"},
+            "from": user,
+            "text": text,
+        }
+        if text.startswith("/"):
+            message["entities"] = [
+                {"type": "bot_command", "offset": 0, "length": len(text.split()[0])}
+            ]
+        self._push_update(user["id"], {"message": message})
+
+    def push_callback(
+        self, user: dict[str, Any], message: dict[str, Any], data: str
+    ) -> None:
+        """Put update with callback query (inline button press) into the queue."""
+        callback_id = str(self._update_id + 1)
+        self._callback_chats[callback_id] = user["id"]
+        message = {
+            key: value
+            for key, value in message.items()
+            if key != "reply_markup" or "inline_keyboard" in value
+        }
+        callback = {
+            "id": callback_id,
+            "from": user,
+            "chat_instance": str(user["id"]),
+            "message": message,
+            "data": data,
+        }
+        self._push_update(user["id"], {"callback_query": callback})
+
+    def _push_update(self, chat_id: int, payload: dict[str, Any]) -> None:
+        self._update_id += 1
+        payload["update_id"] = self._update_id
+        self._updates.put_nowait((chat_id, payload))
+
+    def _record_answer(self, chat_id: Optional[int]) -> None:
+        delivered_at = self._delivered_at.pop(chat_id, None)
+        if delivered_at is not None:
+            self.latencies.append(time.perf_counter() - delivered_at)
+            self.updates_answered += 1
+
+    async def _handle_method(self, request: web.Request) -> web.Response:
+        method = request.match_info["method"].lower()
+        params = dict(await request.post())
+
+        handler = getattr(self, f"_method_{method}", None)
+        result = await handler(params) if handler else True
+        return web.json_response({"ok": True, "result": result})
+
+    async def _method_getme(self, params: dict[str, Any]) -> dict[str, Any]:
+        return BOT_USER
+
+    async def _method_getupdates(self, params: dict[str, Any]) -> list[dict]:
+        self.bot_ready.set()
+        timeout = int(params.get("timeout", 0) or 0)
+        limit = int(params.get("limit", 100) or 100)
+
+        updates = []
+        try:
+            chat_id, update = await asyncio.wait_for(
+                self._updates.get(), timeout=timeout or None
+            )
+            updates.append((chat_id, update))
+        except asyncio.TimeoutError:
+            return []
+        while len(updates) < limit and not self._updates.empty():
+            updates.append(self._updates.get_nowait())
+
+        now = time.perf_counter()
+        for chat_id, _ in updates:
+            self._delivered_at[chat_id] = now
+        self.updates_delivered += len(updates)
+        return [update for _, update in updates]
+
+    async def _method_sendmessage(self, params: dict[str, Any]) -> dict[str, Any]:
+        chat_id = int(params["chat_id"])
+        self._record_answer(chat_id)
+
+        message = {
+            "message_id": self.next_message_id(),
+            "date": int(time.time()),
+            "chat": {"id": chat_id, "type": "private"},
+            "from": BOT_USER,
+            "text": params.get("text", ""),
+        }
+        reply_markup = json.loads(params.get("reply_markup") or "{}")
+        self._inboxes[chat_id].put_nowait({**message, "reply_markup": reply_markup})
+
+        # Only inline keyboards are a part of Message object in Bot API answer
+        if "inline_keyboard" in reply_markup:
+            message["reply_markup"] = reply_markup
+        return message
+
+    async def _method_answercallbackquery(self, params: dict[str, Any]) -> bool:
+        self._record_answer(self._callback_chats.pop(params["callback_query_id"], None))
+        return True
@@ -0,0 +1,121 @@
+import asyncio
+import random
+from typing import Any, Optional
+
+from bot.lexicon.lexicon import catalog
+from loadtest.fake_api import FakeBotAPI
+
+EXPENSE_NAMES = [
+    "Молоко",
+    "Кофе",
+    "Хлеб",
+    "Такси",
+    "Бензин",
+    "Кино",
+    "Обед",
+    "Книга",
+    "Лекарства",
+    "Сыр",
+]
+CATEGORY_NAMES = ["Продукты", "Кафе", "Дорога", "Машина", "Досуг", "Здоровье"]
+I18N = catalog.get("ru")
+
+
+class ReplyTimeout(Exception):
+    """Raised when the bot didn't answer to simulated user in time."""
+
+
+class SimulatedUser:
+    """A class used to represent simulated Telegram user who walks real FSM flows of
+    the bot: /start, /add_transactions, transaction entry, new category choice via
+    inline keyboard, confirmation and correction of transaction.
+    """
+
+    def __init__(
+        self,
+        api: FakeBotAPI,
+        telegram_id: int,
+        transactions: int,
+        correct_probability: float,
+        reply_timeout: float,
+    ):
+        self.api = api
+        self.user = {
+            "id": telegram_id,
+            "is_bot": False,
+            "first_name": f"User{telegram_id}",
+            "language_code": "ru",
+        }
+        self.transactions = transactions
+        self.correct_probability = correct_probability
+        self.reply_timeout = reply_timeout
+        self.inbox = api.inbox(telegram_id)
+        self.categories: list[str] = []
+
+    async def run(self) -> None:
+        await self._send("/start")
+        await self._send("/add_transactions")
+        for _ in range(self.transactions):
+            await self._add_transaction()
+
+    async def _send(self, text: str) -> dict[str, Any]:
+        self.api.push_message(self.user, text)
+        return await self._wait_reply()
+
+    async def _press(self, message: dict[str, Any], button_text: str) -> dict:
+        for row in message["reply_markup"]["inline_keyboard"]:
+            for button in row:
+                if button["text"] == button_text:
+                    self.api.push_callback(self.user, message, button["callback_data"])
+                    return await self._wait_reply()
+        raise LookupError(f"Button {button_text!r} wasn't found in inline keyboard.")
+
+    async def _wait_reply(self) -> dict[str, Any]:
+        try:
+            return await asyncio.wait_for(self.inbox.get(), self.reply_timeout)
+        except asyncio.TimeoutError:
+            raise ReplyTimeout(f"User {self.user['id']} didn't get reply in time.")
+
+    async def _add_transaction(self) -> None:
+        expense_name = random.choice(EXPENSE_NAMES)
+        reply = await self._send(f"{expense_name} {random.randint(10, 5000)}")
+
+        if "inline_keyboard" in reply["reply_markup"]:
+            reply = await self._choose_category(reply)
+
+        if random.random() < self.correct_probability:
+            await self._send(I18N["transaction_correct_button"])
+            await self._send(I18N["transaction_correct_cost_button"])
+            await self._send(str(random.randint(10, 5000)))
+
+        await self._send(I18N["transaction_confirm_button"])
+
+    async def _choose_category(self, reply: dict[str, Any]) -> dict[str, Any]:
+        new_category_text = I18N["transaction_add_new_category_callback"]
+        unused = [name for name in CATEGORY_NAMES if name not in self.categories]
+        if self.categories and (not unused or random.random() < 0.5):
+            return await self._press(reply, random.choice(self.categories))
+
+        await self._press(reply, new_category_text)
+        for category_name in random.sample(unused, len(unused)):
+            reply = await self._send(category_name)
+            if I18N["transaction_existed_category"] not in reply["text"]:
+                self.categories.append(category_name)
+                return reply
+        raise RuntimeError(f"User {self.user['id']} has no unused category names.")
+
+
+async def run_users(users: list[SimulatedUser]) -> tuple[int, Optional[Exception]]:
+    """Run all simulated users concurrently.
+
+    Args:
+        users (list[SimulatedUser]): simulated users
+
+    Returns:
+        tuple[int, Optional[Exception]]: number of failed users and first error
+    """
+    results = await asyncio.gather(
+        *(user.run() for user in users), return_exceptions=True
+    )
+    errors = [result for result in results if isinstance(result, Exception)]
+    return len(errors), errors[0] if errors else None